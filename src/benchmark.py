@@ -0,0 +1,276 @@
+"""
+Benchmarks de la física, el optimizador y el coste por frame de la animación
+
+Se ejecuta sin interfaz (backend Agg). Los resultados se escriben en JSON y se
+comparan con una base guardada en la misma máquina (las cifras absolutas no
+son comparables entre equipos): cualquier métrica que empeore más que el
+umbral se informa como regresión y el proceso termina con código 1.
+
+Uso:
+    python benchmark.py --guardar-base
+    python benchmark.py --secciones fisica optimizador --umbral 0.3
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import datetime
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from config import (MIN_ALTURA, MAX_ALTURA, MIN_DISTANCIA, MAX_DISTANCIA, MIN_DELAY, MAX_DELAY,
+                    MIN_VELOCIDAD, MAX_VELOCIDAD, UMBRAL_INTERCEPCION, INCREMENTO_TIEMPO,
+                    RUTA_BASE_BENCHMARK, UMBRAL_REGRESION_BENCHMARK)
+from physics import (calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo, calcular_posicion_misil,
+                     calcular_distancia, calcular_posicion_enemigo_lote, calcular_posicion_misil_lote)
+from optimizer import encontrar_parametros_optimos
+from simulation_engine import MotorSimulacion
+from renderer import RenderizadorTrayectorias
+
+# Vuelos de la animación: (altura, distancia, delay)
+ESCENARIOS_ANIMACION = {
+    "corto": (5.0, 5.0, 0.0),
+    "largo": (20.0, 100.0, 0.0)
+}
+
+def resolver_ruta(ruta):
+    """Las rutas relativas se interpretan respecto al directorio del simulador"""
+    if os.path.isabs(ruta):
+        return ruta
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), ruta)
+
+def metrica(valor, unidad, mayor_es_mejor=False):
+    """Entrada de resultados con el sentido en que la métrica mejora"""
+    return {"valor": float(valor), "unidad": unidad, "mayor_es_mejor": mayor_es_mejor}
+
+def medir_llamada(funcion, repeticiones=5, numero=None):
+    """
+    Microsegundos por llamada (el mejor de varias repeticiones). Si no se
+    indica numero, se ajusta para que cada repetición dure ~0.1 s.
+    """
+    temporizador = timeit.Timer(funcion)
+    if numero is None:
+        numero, duracion = temporizador.autorange()
+        numero = max(1, int(numero * 0.1 / max(duracion, 1e-9)))
+    return min(temporizador.repeat(repeticiones, numero)) / numero * 1e6
+
+def medir_fisica_escalar():
+    """
+    Coste por llamada de las funciones de física con argumentos float: el
+    camino escalar (math) que eligen con floats y, como referencia, los
+    mismos argumentos por el camino de arrays de NumPy
+    """
+    return {
+        "fisica.calcular_tiempo_vuelo_enemigo": metrica(
+            medir_llamada(lambda: calcular_tiempo_vuelo_enemigo(10.0)), "us"),
+        "fisica.calcular_posicion_enemigo": metrica(
+            medir_llamada(lambda: calcular_posicion_enemigo(10.0, 12.5)), "us"),
+        "fisica.calcular_posicion_misil": metrica(
+            medir_llamada(lambda: calcular_posicion_misil(45.0, 1.5, 12.5, 2.0)), "us"),
+        "fisica.calcular_distancia": metrica(
+            medir_llamada(lambda: calcular_distancia(1.0, 2.0, 4.0, 6.0)), "us"),
+        "fisica.calcular_posicion_enemigo.ruta_numpy": metrica(
+            medir_llamada(lambda: calcular_posicion_enemigo_lote(10.0, 12.5)), "us"),
+        "fisica.calcular_posicion_misil.ruta_numpy": metrica(
+            medir_llamada(lambda: calcular_posicion_misil_lote(45.0, 1.5, 12.5, 2.0)), "us"),
+        # np.float32 no hereda de float, así que fuerza el camino de NumPy
+        "fisica.calcular_distancia.ruta_numpy": metrica(
+            medir_llamada(lambda: calcular_distancia(np.float32(1.0), 2.0, 4.0, 6.0)), "us"),
+    }
+
+def construir_matriz_escenarios(n_alturas=4, n_distancias=5, n_delays=3):
+    """Matriz fija de escenarios (altura, distancia, delay) sobre los rangos de config.py"""
+    return [
+        (float(altura), float(distancia), float(delay))
+        for altura in np.linspace(MIN_ALTURA, MAX_ALTURA, n_alturas)
+        for distancia in np.linspace(MIN_DISTANCIA, MAX_DISTANCIA, n_distancias)
+        for delay in np.linspace(MIN_DELAY, MAX_DELAY, n_delays)
+    ]
+
+def medir_optimizador():
+    """
+    Latencia de encontrar_parametros_optimos sobre la matriz de escenarios
+    con cada método, junto con la tasa de éxito y las evaluaciones del objetivo
+    """
+    escenarios = construir_matriz_escenarios()
+    variantes = {
+        "analitico": {"metodo": "analitico"},
+        "slsqp": {"metodo": "slsqp"},
+        "multiarranque": {"metodo": "multiarranque"},
+        "arrastre": {"metodo": "analitico", "fisica": "arrastre"}
+    }
+
+    resultados = {}
+    for nombre, opciones in variantes.items():
+        latencias = []
+        exitos = 0
+        evaluaciones = []
+        for altura, distancia, delay in escenarios:
+            inicio = time.perf_counter()
+            resultado = encontrar_parametros_optimos(
+                altura, distancia, MIN_VELOCIDAD, MAX_VELOCIDAD, delay, **opciones
+            )
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            exitos += bool(resultado.success and resultado.fun < UMBRAL_INTERCEPCION)
+            evaluaciones.append(resultado.get("nfev", 0))
+
+        prefijo = f"optimizador.{nombre}"
+        resultados[f"{prefijo}.latencia_mediana"] = metrica(np.median(latencias), "ms")
+        resultados[f"{prefijo}.latencia_p95"] = metrica(np.percentile(latencias, 95), "ms")
+        resultados[f"{prefijo}.tasa_exito"] = metrica(exitos / len(escenarios), "fraccion", mayor_es_mejor=True)
+        resultados[f"{prefijo}.nfev_medio"] = metrica(np.mean(evaluaciones), "evaluaciones")
+    return resultados
+
+def crear_figura_animacion():
+    """Figura Agg con los mismos artistas que crear_plot"""
+    figura = Figure(figsize=(10, 6))
+    lienzo = FigureCanvasAgg(figura)
+    ejes = figura.add_subplot(111)
+    ejes.grid(True)
+    ejes.set_xlim(-5, MAX_DISTANCIA + 5)
+    ejes.set_ylim(-0.5, MAX_ALTURA + 2)
+
+    linea_enemigo, = ejes.plot([], [], 'ro-', lw=2, label='Misil Enemigo')
+    linea_misil, = ejes.plot([], [], 'bo-', lw=2, label='Misil Antiaéreo')
+    punto_enemigo, = ejes.plot([], [], 'ro', markersize=10)
+    punto_misil, = ejes.plot([], [], 'bo', markersize=10)
+    ejes.legend(loc='upper left')
+
+    renderizador = RenderizadorTrayectorias(linea_enemigo, linea_misil, punto_enemigo, punto_misil)
+    return figura, lienzo, ejes, renderizador
+
+def medir_animacion(fotogramas_completos=10):
+    """
+    Coste por frame del camino de actualización de animar (vistas del buffer
+    y blitting de los artistas animados) para un vuelo corto y uno largo, y
+    como referencia el coste de redibujar la figura completa
+    """
+    resultados = {}
+    for nombre, (altura, distancia, delay) in ESCENARIOS_ANIMACION.items():
+        optimo = encontrar_parametros_optimos(altura, distancia, MIN_VELOCIDAD, MAX_VELOCIDAD, delay)
+        angulo, velocidad, _ = optimo.x
+        simulacion = MotorSimulacion(altura, distancia, velocidad, angulo, delay).ejecutar()
+
+        figura, lienzo, ejes, renderizador = crear_figura_animacion()
+        renderizador.preparar(calcular_tiempo_vuelo_enemigo(altura), INCREMENTO_TIEMPO)
+        renderizador.cargar(simulacion)
+
+        for artista in renderizador.artistas:
+            artista.set_animated(True)
+        lienzo.draw()
+        fondo = lienzo.copy_from_bbox(ejes.bbox)
+
+        duraciones = []
+        for indice in range(len(simulacion.tiempos)):
+            inicio = time.perf_counter()
+            lienzo.restore_region(fondo)
+            for artista in renderizador.actualizar(indice + 1):
+                ejes.draw_artist(artista)
+            lienzo.blit(ejes.bbox)
+            duraciones.append((time.perf_counter() - inicio) * 1000)
+
+        for artista in renderizador.artistas:
+            artista.set_animated(False)
+        completos = []
+        for indice in np.linspace(1, len(simulacion.tiempos), fotogramas_completos, dtype=int):
+            inicio = time.perf_counter()
+            renderizador.actualizar(indice)
+            lienzo.draw()
+            completos.append((time.perf_counter() - inicio) * 1000)
+
+        prefijo = f"animacion.{nombre}"
+        resultados[f"{prefijo}.frame_medio"] = metrica(np.mean(duraciones), "ms")
+        resultados[f"{prefijo}.frame_p95"] = metrica(np.percentile(duraciones, 95), "ms")
+        resultados[f"{prefijo}.redibujado_completo"] = metrica(np.median(completos), "ms")
+    return resultados
+
+SECCIONES = {
+    "fisica": medir_fisica_escalar,
+    "optimizador": medir_optimizador,
+    "animacion": medir_animacion
+}
+
+def ejecutar_benchmarks(secciones=tuple(SECCIONES)):
+    """Ejecuta las secciones indicadas y devuelve el documento de resultados"""
+    resultados = {}
+    for seccion in secciones:
+        inicio = time.perf_counter()
+        resultados.update(SECCIONES[seccion]())
+        print(f"{seccion}: {time.perf_counter() - inicio:.1f} s")
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "plataforma": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "resultados": resultados
+    }
+
+def comparar_con_base(resultados, base, umbral=UMBRAL_REGRESION_BENCHMARK):
+    """
+    Compara cada métrica presente en ambos documentos. Devuelve una lista de
+    (nombre, actual, base, cambio relativo, regresion), donde el cambio es
+    positivo cuando la métrica empeora.
+    """
+    comparacion = []
+    for nombre, actual in resultados["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None:
+            continue
+
+        if anterior["valor"] == 0:
+            cambio = 0.0 if actual["valor"] == 0 else float("inf")
+        else:
+            cambio = (actual["valor"] - anterior["valor"]) / abs(anterior["valor"])
+        if actual["mayor_es_mejor"]:
+            cambio = -cambio
+        comparacion.append((nombre, actual["valor"], anterior["valor"], cambio, cambio > umbral))
+    return comparacion
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del simulador")
+    parser.add_argument("--secciones", nargs="+", choices=list(SECCIONES), default=list(SECCIONES))
+    parser.add_argument("--salida", default="benchmark_resultados.json", help="Archivo JSON de resultados")
+    parser.add_argument("--base", default=RUTA_BASE_BENCHMARK, help="Archivo JSON de la base de comparación")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION_BENCHMARK,
+                        help="Empeoramiento relativo tolerado antes de marcar una regresión")
+    parser.add_argument("--guardar-base", action="store_true", help="Guardar estos resultados como nueva base")
+    args = parser.parse_args()
+
+    resultados = ejecutar_benchmarks(args.secciones)
+    for nombre, entrada in resultados["resultados"].items():
+        print(f"  {nombre:<45} {entrada['valor']:>12.4f} {entrada['unidad']}")
+
+    with open(resolver_ruta(args.salida), "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2)
+
+    ruta_base = resolver_ruta(args.base)
+    if args.guardar_base:
+        with open(ruta_base, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"Base guardada en {ruta_base}")
+        return 0
+
+    if not os.path.exists(ruta_base):
+        print(f"No hay base en {ruta_base}; ejecuta con --guardar-base para crearla")
+        return 0
+
+    with open(ruta_base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+
+    regresiones = 0
+    print(f"Comparación con {ruta_base} (umbral {args.umbral:.0%}):")
+    for nombre, actual, anterior, cambio, regresion in comparar_con_base(resultados, base, args.umbral):
+        marca = "REGRESIÓN" if regresion else ""
+        print(f"  {nombre:<45} {anterior:>12.4f} -> {actual:>12.4f} ({cambio:+.1%}) {marca}")
+        regresiones += regresion
+
+    print(f"{regresiones} regresiones")
+    return 1 if regresiones else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
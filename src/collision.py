@@ -0,0 +1,166 @@
+"""
+Detección continua de intercepción entre pasos de tiempo
+
+Ambos misiles están sometidos a la misma gravedad, así que una vez lanzado el
+antiaéreo su posición relativa respecto al enemigo es lineal en el tiempo:
+
+    r(t) = (vx·τ - D,  (vy + g·delay)·τ + g·delay²/2 - h),   τ = t - delay
+
+La separación mínima dentro de cualquier intervalo se obtiene entonces de
+forma exacta proyectando sobre esa recta, sin depender del tamaño del paso.
+
+Para muchas pistas simultáneas, DetectorColisiones busca en cada paso los
+pares dentro del umbral con un índice espacial en lugar de comparar todos.
+"""
+
+import time
+import numpy as np
+from config import GRAVEDAD, UMBRAL_INTERCEPCION
+from physics import calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo_lote
+
+def calcular_acercamiento_minimo(altura_enemigo, distancia_enemigo, angulo, velocidad, delay, t_inicio, t_fin):
+    """
+    Separación mínima entre ambos misiles dentro de [t_inicio, t_fin] y el
+    instante en que ocurre. Todos los argumentos admiten broadcasting.
+
+    Solo se consideran los instantes con el enemigo en el aire y el misil
+    antiaéreo en tierra esperando el delay o en vuelo; si el intervalo no
+    contiene ninguno, la distancia es inf y el tiempo NaN.
+    """
+    angulo_rad = np.radians(np.asarray(angulo, dtype=float))
+    vx = velocidad * np.cos(angulo_rad)
+    vy = velocidad * np.sin(angulo_rad)
+    tiempo_vuelo_enemigo = calcular_tiempo_vuelo_enemigo(altura_enemigo)
+    t_inicio, t_fin = np.broadcast_arrays(
+        np.asarray(t_inicio, dtype=float), np.minimum(t_fin, tiempo_vuelo_enemigo)
+    )
+
+    # Antes del lanzamiento el misil está en el origen y el enemigo solo se acerca
+    fin_espera = np.minimum(t_fin, delay)
+    altura_espera = calcular_posicion_enemigo_lote(altura_enemigo, fin_espera)
+    distancia_espera = np.where(
+        t_inicio <= fin_espera, np.hypot(distancia_enemigo, altura_espera), np.inf
+    )
+
+    # En vuelo la posición relativa es r0 + w·τ hasta que el misil toca el suelo
+    rx0 = -distancia_enemigo
+    ry0 = 0.5 * GRAVEDAD * delay**2 - altura_enemigo
+    wx = vx
+    wy = vy + GRAVEDAD * delay
+    tau_inicio = np.maximum(t_inicio - delay, 0)
+    tau_fin = np.minimum(t_fin - delay, 2 * np.maximum(vy, 0) / GRAVEDAD)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        norma = wx**2 + wy**2
+        tau_minimo = np.where(norma > 0, -(rx0 * wx + ry0 * wy) / norma, 0)
+    tau_minimo = np.clip(tau_minimo, tau_inicio, np.maximum(tau_fin, tau_inicio))
+    distancia_vuelo = np.where(
+        tau_inicio <= tau_fin, np.hypot(rx0 + wx * tau_minimo, ry0 + wy * tau_minimo), np.inf
+    )
+
+    en_vuelo = distancia_vuelo <= distancia_espera
+    distancia_minima = np.where(en_vuelo, distancia_vuelo, distancia_espera)
+    tiempo_minimo = np.where(en_vuelo, tau_minimo + delay, fin_espera)
+    tiempo_minimo = np.where(np.isinf(distancia_minima), np.nan, tiempo_minimo)
+
+    return distancia_minima, tiempo_minimo
+
+class DetectorColisiones:
+    def __init__(self, umbral=UMBRAL_INTERCEPCION, metodo='kdtree'):
+        """
+        Constructor de la clase DetectorColisiones
+
+        Busca en cada paso los pares (a, b) a menos del umbral entre dos
+        conjuntos de posiciones. metodo='kdtree' reconstruye un cKDTree por paso,
+        'rejilla' usa un hash de celdas del tamaño del umbral y 'fuerza_bruta'
+        compara todos los pares (solo como referencia). Cada llamada queda
+        registrada con su tiempo para seguir la escala del coste.
+        """
+        if metodo not in ('kdtree', 'rejilla', 'fuerza_bruta'):
+            raise ValueError(f"Método de detección desconocido: {metodo}")
+
+        self.umbral = umbral
+        self.metodo = metodo
+        self.registro = []
+
+    def detectar(self, posiciones_a, posiciones_b):
+        """
+        Devuelve un array [pares, 2] con los índices (a, b) de los pares a
+        menos del umbral, ordenados por (a, b) para que el resultado no
+        dependa del método. Las posiciones son arrays [n, 2].
+        """
+        inicio = time.perf_counter()
+
+        if len(posiciones_a) == 0 or len(posiciones_b) == 0:
+            pares = np.empty((0, 2), dtype=int)
+        elif self.metodo == 'kdtree':
+            pares = self._detectar_kdtree(posiciones_a, posiciones_b)
+        elif self.metodo == 'rejilla':
+            pares = self._detectar_rejilla(posiciones_a, posiciones_b)
+        else:
+            pares = self._detectar_fuerza_bruta(posiciones_a, posiciones_b)
+        pares = pares[np.lexsort((pares[:, 1], pares[:, 0]))]
+
+        self.registro.append((len(posiciones_a) + len(posiciones_b), len(pares), time.perf_counter() - inicio))
+        return pares
+
+    def _detectar_kdtree(self, posiciones_a, posiciones_b):
+        from scipy.spatial import cKDTree
+        arbol_a = cKDTree(posiciones_a)
+        arbol_b = cKDTree(posiciones_b)
+        cercanos = arbol_a.sparse_distance_matrix(arbol_b, self.umbral, output_type='ndarray')
+        cercanos = cercanos[cercanos['v'] < self.umbral]
+        return np.column_stack([cercanos['i'], cercanos['j']]).astype(int)
+
+    def _detectar_rejilla(self, posiciones_a, posiciones_b):
+        # Celdas del tamaño del umbral: los vecinos de un punto están en las 3×3 celdas contiguas
+        celdas_a = np.floor(posiciones_a / self.umbral).astype(np.int64)
+        celdas_b = np.floor(posiciones_b / self.umbral).astype(np.int64)
+        base = int(max(celdas_a[:, 1].max(), celdas_b[:, 1].max())) + 2
+        minimo = int(min(celdas_a[:, 1].min(), celdas_b[:, 1].min())) - 1
+
+        claves_b = celdas_b[:, 0] * (base - minimo) + (celdas_b[:, 1] - minimo)
+        orden = np.argsort(claves_b, kind='stable')
+        claves_ordenadas = claves_b[orden]
+
+        candidatos_a = []
+        candidatos_b = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                claves = (celdas_a[:, 0] + dx) * (base - minimo) + (celdas_a[:, 1] + dy - minimo)
+                desde = np.searchsorted(claves_ordenadas, claves, side='left')
+                hasta = np.searchsorted(claves_ordenadas, claves, side='right')
+                cuentas = hasta - desde
+                if not cuentas.any():
+                    continue
+                # Expandir los rangos [desde, hasta) de cada punto de a
+                indices_a = np.repeat(np.arange(len(posiciones_a)), cuentas)
+                desplazamientos = np.arange(cuentas.sum()) - np.repeat(np.cumsum(cuentas) - cuentas, cuentas)
+                candidatos_a.append(indices_a)
+                candidatos_b.append(orden[np.repeat(desde, cuentas) + desplazamientos])
+
+        if not candidatos_a:
+            return np.empty((0, 2), dtype=int)
+
+        indices_a = np.concatenate(candidatos_a)
+        indices_b = np.concatenate(candidatos_b)
+        distancias = np.hypot(*(posiciones_a[indices_a] - posiciones_b[indices_b]).T)
+        cercanos = distancias < self.umbral
+        return np.column_stack([indices_a[cercanos], indices_b[cercanos]])
+
+    def _detectar_fuerza_bruta(self, posiciones_a, posiciones_b):
+        diferencias = posiciones_a[:, None, :] - posiciones_b[None, :, :]
+        return np.argwhere(np.hypot(diferencias[..., 0], diferencias[..., 1]) < self.umbral)
+
+    def estadisticas(self):
+        """Resumen del registro: pasos, objetos medios y tiempo medio/máximo por paso"""
+        if not self.registro:
+            return {'pasos': 0, 'objetos_medios': 0.0, 'tiempo_medio': 0.0, 'tiempo_maximo': 0.0}
+
+        objetos, _, tiempos = (np.array(columna) for columna in zip(*self.registro))
+        return {
+            'pasos': len(self.registro),
+            'objetos_medios': float(objetos.mean()),
+            'tiempo_medio': float(tiempos.mean()),
+            'tiempo_maximo': float(tiempos.max())
+        }
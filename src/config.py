@@ -9,7 +9,13 @@ GRAVEDAD = 9.8 / 1000  # km/s²
 # Parámetros de simulación
 INCREMENTO_TIEMPO = 0.1  # segundos
 INTERVALO_ANIMACION = 50  # milisegundos
+FACTORES_REPRODUCCION = (1.0, 2.0, 5.0, 50.0, float("inf"))  # segundos simulados por segundo real
+FACTOR_REPRODUCCION = 2.0  # un INCREMENTO_TIEMPO por INTERVALO_ANIMACION, como al avanzar por frames
+USAR_BLIT = True  # redibujar solo las trayectorias sobre un fondo cacheado
 UMBRAL_INTERCEPCION = 0.1  # km
+DETECCION_CONTINUA = True  # buscar la intercepción entre pasos, no solo en las muestras
+INTERVALO_SONDEO_OPTIMIZACION = 50  # milisegundos
+ALTURA_MINIMA_INTERCEPCION = 0.1  # km
 
 # Límites de los controles
 MIN_ALTURA = 5  # km
@@ -23,8 +29,85 @@ MAX_ANGULO = 90  # grados
 MIN_DELAY = 0.0  # segundos
 MAX_DELAY = 10.0  # segundos
 
+# Dispersión del disparo para el análisis de Monte Carlo
+SIGMA_VELOCIDAD = 0.02  # km/s
+SIGMA_ANGULO = 0.5  # grados
+SIGMA_DELAY = 0.1  # segundos
+SIGMA_ALTURA = 0.05  # km
+MUESTRAS_MONTE_CARLO = 1000000
+TAMANO_BLOQUE_MONTE_CARLO = 250000  # muestras evaluadas a la vez
+
+# Modo salva
+SALVA_AMENAZAS = 100
+SALVA_BATERIAS = 120
+SALVA_MAX_PISTAS = 1000  # máximo de amenazas y de baterías
+
+# Tabla de tiro precalculada (se genera con firing_table.py)
+RUTA_TABLA_TIRO = "tabla_tiro.npy"
+
+# Caché de resultados del optimizador
+TAMANO_CACHE_OPTIMIZACION = 256  # entradas en memoria
+PASO_CUANTIZACION_CACHE = 0.001  # resolución de las claves
+RUTA_CACHE_OPTIMIZACION = "cache_optimizacion"  # None para desactivar el volcado a disco
+
+# Método del botón de interceptación óptima: "analitico", "slsqp" o "multiarranque"
+METODO_OPTIMIZACION = "analitico"
+
+# Optimización multiarranque (multistart.py)
+ARRANQUES_MULTIARRANQUE = 6  # arranques del barrido grueso (más el de la memoria)
+MALLA_MULTIARRANQUE = (18, 10)  # ángulos × velocidades del barrido grueso
+TAMANO_MEMORIA_ARRANQUES = 1024  # soluciones guardadas para arrancar en caliente
+TOLERANCIA_TIEMPO_MINIMO = 1e-4  # km de distancia admitidos al buscar la intercepción más temprana
+
+# Planificación del lanzamiento con el delay como incógnita (scheduling.py)
+OBJETIVO_PLANIFICACION = "min_tiempo"  # "min_tiempo", "max_altura" o "max_delay"
+MUESTRAS_PLANIFICACION = 64  # delays evaluados para acotar las raíces
+TOLERANCIA_PLANIFICACION = 1e-9  # segundos
+
+# Física con arrastre atmosférico (a = -k·exp(-y/escala)·|v|·v - g)
+COEF_ARRASTRE_ENEMIGO = 0.002  # 1/km a nivel del mar
+COEF_ARRASTRE_MISIL = 0.004  # 1/km a nivel del mar
+ESCALA_ATMOSFERA = 8.5  # km
+METODO_INTEGRACION = "DOP853"  # o "RK45"
+TOLERANCIA_RELATIVA_ARRASTRE = 1e-8
+TOLERANCIA_ABSOLUTA_ARRASTRE = 1e-9  # km y km/s
+
+# Benchmarks (benchmark.py)
+RUTA_BASE_BENCHMARK = "benchmark_base.json"
+UMBRAL_REGRESION_BENCHMARK = 0.25  # empeoramiento relativo tolerado
+
+# Instrumentación (instrumentation.py)
+INSTRUMENTACION_ACTIVA = False  # también se activa desde el panel de información
+MAX_MUESTRAS_METRICAS = 500  # muestras recientes por métrica
+RUTA_REGISTRO_METRICAS = "metricas.csv"  # None para no volcar a disco
+TAMANO_REGISTRO_METRICAS = 1000000  # bytes antes de rotar el registro
+INTERVALO_OVERLAY_METRICAS = 500  # milisegundos
+
+# Vista previa de las trayectorias (preview.py)
+VISTA_PREVIA_ACTIVA = True
+RETARDO_VISTA_PREVIA = 150  # milisegundos sin teclear antes de redibujar
+PUNTOS_VISTA_PREVIA = 400  # muestras por trayectoria
+TAMANO_CACHE_VISTA_PREVIA = 64  # juegos de parámetros
+
+# Mapa de viabilidad ángulo × velocidad (feasibility.py)
+RESOLUCIONES_MAPA_VIABILIDAD = (48, 160, 480)  # celdas por eje, de grueso a fino
+TAMANO_CACHE_MAPA_VIABILIDAD = 8  # combinaciones de altura, distancia y delay
+DISTANCIA_MAXIMA_MAPA = 5.0  # km, tope de la escala de colores
+
+# Grabaciones de simulaciones (recording.py)
+GRABAR_SIMULACIONES = True  # guardar cada simulación terminada para reproducirla
+DIRECTORIO_GRABACIONES = "grabaciones"
+MAX_GRABACIONES = 50  # grabaciones conservadas (None para no limitar)
+
+# Arranque (startup.py)
+PRECARGAR_MODULOS = True  # importar scipy en segundo plano tras mostrar la ventana
+MODULOS_PRECARGA = ("scipy.optimize", "scipy.integrate", "scipy.spatial")
+
 # Configuración del historial de simulaciones
-MAX_HISTORIAL_SIMULACIONES = 50
+MAX_HISTORIAL_SIMULACIONES = 50  # lanzamientos conservados (None para no limitar)
+RUTA_HISTORIAL = "historial.sqlite3"
+TAMANO_LOTE_HISTORIAL = 20  # lanzamientos pendientes antes de forzar la escritura
+INTERVALO_CONFIRMACION_HISTORIAL = 1000  # milisegundos
 COLUMNAS_HISTORIAL = [
     "Tiempo (s)", "Altura (km)", "Distancia (km)", 
     "Velocidad (km/s)", "Ángulo (°)", "Delay (s)", "Resultado"
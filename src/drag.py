@@ -0,0 +1,303 @@
+"""
+Física con arrastre atmosférico
+
+Ambos misiles sufren un arrastre cuadrático cuya densidad decae
+exponencialmente con la altura:
+
+    a = -k·exp(-y/escala)·|v|·v - g·ŷ
+
+Sin solución cerrada, las trayectorias se integran con un método adaptativo
+de scipy.integrate.solve_ivp (DOP853 o RK45). La simulación de un disparo usa
+eventos terminales para el impacto en el suelo y para el máximo acercamiento
+(cuando la velocidad relativa deja de acercar a los misiles), y
+integrar_arrastre_lote integra muchos escenarios a la vez apilando sus estados.
+
+El estado se guarda por cuerpos como un array [4, cuerpos] aplanado con las
+filas x, y, vx, vy, de modo que las derivadas de todos los cuerpos se evalúan
+con las mismas operaciones NumPy. Los cuerpos no interactúan entre sí, así que
+en el lote cada misil se integra en su propio reloj desde el lanzamiento y el
+delay se aplica después como un desplazamiento en el tiempo; de lo contrario
+el lanzamiento de cada escenario sería una discontinuidad que obligaría a
+reducir el paso de todos.
+"""
+
+from dataclasses import dataclass
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.optimize import minimize_scalar
+from config import (GRAVEDAD, INCREMENTO_TIEMPO, UMBRAL_INTERCEPCION, ALTURA_MINIMA_INTERCEPCION,
+                    COEF_ARRASTRE_ENEMIGO, COEF_ARRASTRE_MISIL, ESCALA_ATMOSFERA, METODO_INTEGRACION,
+                    TOLERANCIA_RELATIVA_ARRASTRE, TOLERANCIA_ABSOLUTA_ARRASTRE)
+from physics import calcular_tiempo_vuelo_enemigo
+from simulation_engine import RESULTADO_INTERCEPCION, RESULTADO_IMPACTO, RESULTADO_ALTURA_INSUFICIENTE
+
+# Eventos que pueden terminar la integración de un disparo
+EVENTO_IMPACTO_ENEMIGO = "impacto_enemigo"
+EVENTO_IMPACTO_MISIL = "impacto_misil"
+EVENTO_ACERCAMIENTO = "acercamiento"
+
+# Margen sobre el tiempo de caída en vacío (el arrastre solo puede alargarlo)
+FACTOR_TIEMPO_MAXIMO = 10
+
+@dataclass
+class ResultadoArrastre:
+    """
+    Disparo integrado con arrastre. Las trayectorias se muestrean cada
+    incremento_tiempo y terminan en el instante del evento que detuvo la
+    integración.
+    """
+    evento: str
+    tiempos: np.ndarray
+    enemigo_x: np.ndarray
+    enemigo_y: np.ndarray
+    misil_x: np.ndarray
+    misil_y: np.ndarray
+    tiempo_final: float
+    distancia_minima: float
+    tiempo_acercamiento: float
+    altura_acercamiento: float
+    nfev: int
+
+    @property
+    def intercepcion(self):
+        return (self.distancia_minima < UMBRAL_INTERCEPCION
+                and self.altura_acercamiento >= ALTURA_MINIMA_INTERCEPCION)
+
+    @property
+    def resultado(self):
+        """Desenlace con los mismos valores que ResultadoSimulacion.resultado"""
+        if self.distancia_minima >= UMBRAL_INTERCEPCION:
+            return RESULTADO_IMPACTO
+        if self.altura_acercamiento < ALTURA_MINIMA_INTERCEPCION:
+            return RESULTADO_ALTURA_INSUFICIENTE
+        return RESULTADO_INTERCEPCION
+
+def calcular_aceleracion_arrastre(y, vx, vy, coeficiente):
+    """Aceleración (ax, ay) con arrastre cuadrático y gravedad. Admite arrays."""
+    k = coeficiente * np.exp(-y / ESCALA_ATMOSFERA)
+    rapidez = np.hypot(vx, vy)
+    return -k * rapidez * vx, -k * rapidez * vy - GRAVEDAD
+
+def calcular_derivadas(t, estado, coeficientes, activos=True):
+    """
+    Derivadas del estado aplanado [4, cuerpos]. coeficientes y activos son
+    escalares o arrays [cuerpos]; un cuerpo inactivo permanece en reposo.
+    """
+    x, y, vx, vy = estado.reshape(4, -1)
+    ax, ay = calcular_aceleracion_arrastre(y, vx, vy, coeficientes)
+    return (np.array([vx, vy, ax, ay]) * activos).ravel()
+
+def estado_inicial(x, y, vx, vy):
+    """Estado aplanado de varios cuerpos a partir de sus componentes (con broadcasting)"""
+    return np.array(np.broadcast_arrays(*(np.atleast_1d(np.asarray(valor, dtype=float))
+                                          for valor in (x, y, vx, vy)))).ravel()
+
+# Eventos de un disparo: cuerpo 0 el enemigo, cuerpo 1 el misil
+def _evento_impacto_enemigo(t, estado, *args):
+    return estado.reshape(4, 2)[1, 0]
+
+def _evento_impacto_misil(t, estado, *args):
+    return estado.reshape(4, 2)[1, 1]
+
+def _evento_acercamiento(t, estado, *args):
+    # Derivada de |r|²/2: pasa de negativa a positiva en el máximo acercamiento
+    x, y, vx, vy = estado.reshape(4, 2)
+    return (x[0] - x[1]) * (vx[0] - vx[1]) + (y[0] - y[1]) * (vy[0] - vy[1])
+
+for _evento in (_evento_impacto_enemigo, _evento_impacto_misil, _evento_acercamiento):
+    _evento.terminal = True
+_evento_impacto_enemigo.direction = -1
+_evento_impacto_misil.direction = -1
+_evento_acercamiento.direction = 1
+
+def _integrar_disparo(altura_enemigo, distancia_enemigo, angulo, velocidad, delay,
+                      metodo=METODO_INTEGRACION, dense_output=False):
+    """
+    Integra un disparo hasta el primer evento terminal.
+
+    La espera del delay (solo cae el enemigo) y el vuelo se integran por
+    separado para que el paso adaptativo no atraviese el lanzamiento.
+    Devuelve (tramos, evento, t_final, estado_final, nfev).
+    """
+    angulo_rad = np.radians(angulo)
+    estado = estado_inicial(
+        [distancia_enemigo, 0.0], [altura_enemigo, 0.0],
+        [0.0, velocidad * np.cos(angulo_rad)], [0.0, velocidad * np.sin(angulo_rad)]
+    )
+    coeficientes = np.array([COEF_ARRASTRE_ENEMIGO, COEF_ARRASTRE_MISIL])
+    tiempo_maximo = FACTOR_TIEMPO_MAXIMO * float(calcular_tiempo_vuelo_enemigo(altura_enemigo))
+
+    fases = [
+        ((0.0, delay), np.array([True, False]), [_evento_impacto_enemigo]),
+        ((delay, tiempo_maximo), True, [_evento_impacto_enemigo, _evento_impacto_misil, _evento_acercamiento])
+    ]
+    nombres = [EVENTO_IMPACTO_ENEMIGO, EVENTO_IMPACTO_MISIL, EVENTO_ACERCAMIENTO]
+
+    tramos = []
+    nfev = 0
+    for intervalo, activos, eventos in fases:
+        if intervalo[1] <= intervalo[0]:
+            continue
+
+        solucion = solve_ivp(
+            calcular_derivadas, intervalo, estado, method=metodo, args=(coeficientes, activos),
+            events=eventos, dense_output=dense_output,
+            rtol=TOLERANCIA_RELATIVA_ARRASTRE, atol=TOLERANCIA_ABSOLUTA_ARRASTRE
+        )
+        tramos.append(solucion)
+        nfev += solucion.nfev
+        estado = solucion.y[:, -1]
+
+        if solucion.status == 1:
+            indice = next(i for i, tiempos in enumerate(solucion.t_events) if len(tiempos))
+            return tramos, nombres[indice], float(solucion.t[-1]), estado, nfev
+
+    return tramos, EVENTO_IMPACTO_ENEMIGO, float(tramos[-1].t[-1]), estado, nfev
+
+def _separacion_final(estado):
+    """Distancia entre ambos cuerpos y altura del enemigo en un estado de disparo"""
+    x, y, _, _ = estado.reshape(4, 2)
+    return float(np.hypot(x[0] - x[1], y[0] - y[1])), float(max(y[0], 0))
+
+def simular_arrastre(altura_enemigo, distancia_enemigo, angulo, velocidad, delay,
+                     incremento_tiempo=INCREMENTO_TIEMPO, metodo=METODO_INTEGRACION):
+    """
+    Integra un disparo con arrastre y muestrea las trayectorias cada
+    incremento_tiempo a partir de la salida densa del integrador.
+
+    Mientras la distancia decrece ningún evento se dispara, así que el estado
+    final es también el de máximo acercamiento.
+    """
+    tramos, evento, tiempo_final, estado, nfev = _integrar_disparo(
+        altura_enemigo, distancia_enemigo, angulo, velocidad, delay, metodo, dense_output=True
+    )
+
+    tiempos = np.append(np.arange(0, tiempo_final, incremento_tiempo), tiempo_final)
+    muestras = np.empty((8, len(tiempos)))
+    for tramo in tramos:
+        en_tramo = (tiempos >= tramo.t[0]) & (tiempos <= tramo.t[-1])
+        muestras[:, en_tramo] = tramo.sol(tiempos[en_tramo])
+    x, y, _, _ = muestras.reshape(4, 2, len(tiempos))
+
+    distancia, altura = _separacion_final(estado)
+    return ResultadoArrastre(
+        evento=evento,
+        tiempos=tiempos,
+        enemigo_x=x[0],
+        enemigo_y=np.maximum(y[0], 0),
+        misil_x=x[1],
+        misil_y=np.maximum(y[1], 0),
+        tiempo_final=tiempo_final,
+        distancia_minima=distancia,
+        tiempo_acercamiento=tiempo_final,
+        altura_acercamiento=altura,
+        nfev=nfev
+    )
+
+def integrar_arrastre_lote(altura_enemigo, distancia_enemigo, angulo, velocidad, delay, tiempos,
+                           metodo=METODO_INTEGRACION):
+    """
+    Integra muchos escenarios en una sola llamada a solve_ivp con los estados
+    de todos los enemigos y misiles apilados. Los parámetros admiten
+    broadcasting y se aplanan a [escenarios].
+
+    Los misiles se integran en su propio reloj τ = t - delay sobre la misma
+    malla y se llevan a `tiempos` con interpolación de Hermite (posición y
+    velocidad). El máximo acercamiento de cada escenario se toma de las
+    muestras con el enemigo en el aire y el misil sin haber vuelto al suelo,
+    y se refina con el vértice de la parábola por los tres puntos vecinos de
+    la distancia al cuadrado.
+
+    Devuelve (enemigo_x, enemigo_y, misil_x, misil_y, distancia_minima,
+    tiempo_minimo); las trayectorias tienen forma [escenarios, pasos].
+    """
+    altura, distancia, angulo, velocidad, delays = (
+        np.ravel(valor) for valor in np.broadcast_arrays(
+            *(np.asarray(valor, dtype=float)
+              for valor in (altura_enemigo, distancia_enemigo, angulo, velocidad, delay))
+        )
+    )
+    escenarios = altura.size
+    tiempos = np.asarray(tiempos, dtype=float)
+    malla = np.union1d(0.0, tiempos)
+
+    angulo_rad = np.radians(angulo)
+    cero = np.zeros(escenarios)
+    estado = estado_inicial(
+        np.concatenate([distancia, cero]), np.concatenate([altura, cero]),
+        np.concatenate([cero, velocidad * np.cos(angulo_rad)]),
+        np.concatenate([cero, velocidad * np.sin(angulo_rad)])
+    )
+    coeficientes = np.repeat([COEF_ARRASTRE_ENEMIGO, COEF_ARRASTRE_MISIL], escenarios)
+
+    solucion = solve_ivp(
+        calcular_derivadas, (0.0, malla[-1]), estado, method=metodo, t_eval=malla, args=(coeficientes,),
+        rtol=TOLERANCIA_RELATIVA_ARRASTRE, atol=TOLERANCIA_ABSOLUTA_ARRASTRE
+    )
+    x, y, vx, vy = solucion.y.reshape(4, 2 * escenarios, len(malla))
+
+    # Enemigos: directamente sobre la malla
+    en_tiempos = np.searchsorted(malla, tiempos)
+    ex, ey = x[:escenarios, en_tiempos], y[:escenarios, en_tiempos]
+
+    # Misiles: interpolar en τ = t - delay; antes del lanzamiento siguen en el origen
+    tau = tiempos[None, :] - delays[:, None]
+    k = np.clip(np.searchsorted(malla, tau, side='right') - 1, 0, len(malla) - 2)
+    h = malla[k + 1] - malla[k]
+    s = np.clip((tau - malla[k]) / h, 0, 1)
+    filas = np.arange(escenarios)[:, None] + escenarios
+    h00, h10, h01, h11 = 2*s**3 - 3*s**2 + 1, s**3 - 2*s**2 + s, -2*s**3 + 3*s**2, s**3 - s**2
+    mx = h00 * x[filas, k] + h10 * h * vx[filas, k] + h01 * x[filas, k + 1] + h11 * h * vx[filas, k + 1]
+    my = h00 * y[filas, k] + h10 * h * vy[filas, k] + h01 * y[filas, k + 1] + h11 * h * vy[filas, k + 1]
+    mx = np.where(tau > 0, mx, 0.0)
+    my = np.where(tau > 0, my, 0.0)
+
+    distancias = np.where((ey > 0) & (my >= 0), (ex - mx)**2 + (ey - my)**2, np.inf)
+    indice = np.clip(np.argmin(distancias, axis=1), 1, len(tiempos) - 2)
+    filas = np.arange(escenarios)
+    f0, f1, f2 = (distancias[filas, indice + desplazamiento] for desplazamiento in (-1, 0, 1))
+    minimo = distancias[filas, np.argmin(distancias, axis=1)]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        curvatura = f0 - 2 * f1 + f2
+        refinable = np.isfinite(curvatura) & (curvatura > 0) & (f1 == minimo)
+        desplazamiento = np.where(refinable, np.clip(0.5 * (f0 - f2) / curvatura, -1, 1), 0)
+        minimo = np.where(refinable, f1 - 0.25 * (f0 - f2) * desplazamiento, minimo)
+    paso = np.where(desplazamiento >= 0, tiempos[indice + 1] - tiempos[indice], tiempos[indice] - tiempos[indice - 1])
+
+    distancia_minima = np.sqrt(np.maximum(minimo, 0))
+    tiempo_minimo = np.where(
+        np.isfinite(minimo), np.where(refinable, tiempos[indice] + desplazamiento * paso,
+                                      tiempos[np.argmin(distancias, axis=1)]), np.nan
+    )
+
+    return ex, np.maximum(ey, 0), mx, np.maximum(my, 0), distancia_minima, tiempo_minimo
+
+def refinar_intercepcion_arrastre(altura_enemigo, distancia_enemigo, velocidad, delay, angulo_inicial,
+                                  margen_angulo=10.0, metodo=METODO_INTEGRACION):
+    """
+    Busca el ángulo que minimiza la distancia de máximo acercamiento con
+    arrastre, partiendo de la solución en vacío.
+
+    minimize_scalar acota la búsqueda a ±margen_angulo alrededor del ángulo
+    inicial. Devuelve (angulo, tiempo, distancia, altura, nfev, nit), donde nfev
+    cuenta las evaluaciones de las derivadas en todas las integraciones.
+    """
+    evaluaciones = []
+
+    def distancia_acercamiento(angulo):
+        _, _, _, estado, nfev = _integrar_disparo(
+            altura_enemigo, distancia_enemigo, angulo, velocidad, delay, metodo
+        )
+        evaluaciones.append(nfev)
+        return _separacion_final(estado)[0]
+
+    limites = (max(angulo_inicial - margen_angulo, 1e-3), min(angulo_inicial + margen_angulo, 90.0))
+    optimo = minimize_scalar(distancia_acercamiento, bounds=limites, method='bounded',
+                             options={'xatol': 1e-4})
+
+    _, _, tiempo, estado, nfev = _integrar_disparo(
+        altura_enemigo, distancia_enemigo, optimo.x, velocidad, delay, metodo
+    )
+    distancia, altura = _separacion_final(estado)
+    return float(optimo.x), tiempo, distancia, altura, sum(evaluaciones) + nfev, int(optimo.nit)
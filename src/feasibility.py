@@ -0,0 +1,92 @@
+"""
+Mapa de viabilidad sobre ángulo × velocidad
+
+Para una altura, distancia y delay dados, evalúa la distancia mínima de paso
+entre ambos misiles en toda una malla de ángulos y velocidades con una sola
+llamada vectorizada a calcular_acercamiento_minimo (el acercamiento en vacío
+es exacto, sin pasos de tiempo). Las celdas por debajo del umbral de
+intercepción forman la región viable (las que se acercan por debajo de la
+altura mínima de intercepción quedan en inf, como fallidas), y su extensión alrededor del disparo
+elegido indica el margen que tiene la solución.
+
+MapaViabilidad guarda los mapas calculados por (altura, distancia, delay) y
+por resolución, para refinarlos de grueso a fino sin repetir trabajo y para
+que cambiar solo el ángulo o la velocidad no recalcule nada.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from config import (MIN_ANGULO, MAX_ANGULO, MIN_VELOCIDAD, MAX_VELOCIDAD, UMBRAL_INTERCEPCION,
+                    RESOLUCIONES_MAPA_VIABILIDAD, TAMANO_CACHE_MAPA_VIABILIDAD)
+from physics import calcular_posicion_enemigo_lote
+from collision import calcular_acercamiento_minimo
+from optimizer import validar_altura_intercepcion
+
+def calcular_mapa_viabilidad(altura_enemigo, distancia_defensa, delay_lanzamiento, angulos, velocidades):
+    """
+    Distancia mínima de paso [velocidades, ángulos] en km sobre el vuelo
+    completo del enemigo. Como en monte_carlo.py, un acercamiento por debajo
+    de la altura mínima de intercepción no cuenta y la celda queda en inf.
+    """
+    distancia, tiempo = calcular_acercamiento_minimo(
+        altura_enemigo, distancia_defensa, np.asarray(angulos)[None, :], np.asarray(velocidades)[:, None],
+        delay_lanzamiento, 0.0, np.inf
+    )
+    alturas_intercepcion = calcular_posicion_enemigo_lote(altura_enemigo, np.nan_to_num(tiempo))
+    distancia = np.where(validar_altura_intercepcion(alturas_intercepcion), distancia, np.inf)
+    return distancia.astype(np.float32)
+
+class MapaViabilidad:
+    def __init__(self, resoluciones=RESOLUCIONES_MAPA_VIABILIDAD, tamano=TAMANO_CACHE_MAPA_VIABILIDAD,
+                 umbral=UMBRAL_INTERCEPCION):
+        """Constructor de la clase MapaViabilidad"""
+        self.resoluciones = tuple(sorted(resoluciones))
+        self.tamano = tamano
+        self.umbral = umbral
+        # (altura, distancia, delay) -> {resolución: mapa}
+        self.mapas = OrderedDict()
+
+    @staticmethod
+    def malla(resolucion):
+        """Ángulos y velocidades de una malla cuadrada de la resolución dada"""
+        return (np.linspace(MIN_ANGULO, MAX_ANGULO, resolucion),
+                np.linspace(MIN_VELOCIDAD, MAX_VELOCIDAD, resolucion))
+
+    def mejor_disponible(self, altura_enemigo, distancia_defensa, delay_lanzamiento):
+        """(resolución, mapa) más fino ya calculado para las entradas, o None"""
+        mapas = self.mapas.get((altura_enemigo, distancia_defensa, delay_lanzamiento))
+        if not mapas:
+            return None
+        self.mapas.move_to_end((altura_enemigo, distancia_defensa, delay_lanzamiento))
+        resolucion = max(mapas)
+        return resolucion, mapas[resolucion]
+
+    def calcular(self, altura_enemigo, distancia_defensa, delay_lanzamiento, resolucion):
+        """Mapa de la resolución dada, calculado solo si no está en la caché"""
+        clave = (altura_enemigo, distancia_defensa, delay_lanzamiento)
+        mapas = self.mapas.get(clave)
+        if mapas is None:
+            mapas = self.mapas[clave] = {}
+            while len(self.mapas) > self.tamano:
+                self.mapas.popitem(last=False)
+        self.mapas.move_to_end(clave)
+
+        if resolucion not in mapas:
+            angulos, velocidades = self.malla(resolucion)
+            mapas[resolucion] = calcular_mapa_viabilidad(
+                altura_enemigo, distancia_defensa, delay_lanzamiento, angulos, velocidades
+            )
+            # Los niveles más gruesos ya no se mostrarán
+            for anterior in [r for r in mapas if r < resolucion]:
+                del mapas[anterior]
+        return mapas[resolucion]
+
+    def pendientes(self, altura_enemigo, distancia_defensa, delay_lanzamiento):
+        """Resoluciones que aún faltan por calcular, de la más gruesa a la más fina"""
+        disponible = self.mejor_disponible(altura_enemigo, distancia_defensa, delay_lanzamiento)
+        minima = 0 if disponible is None else disponible[0]
+        return [resolucion for resolucion in self.resoluciones if resolucion > minima]
+
+    def fraccion_viable(self, mapa):
+        """Fracción de la malla por debajo del umbral de intercepción"""
+        return float(np.mean(mapa < self.umbral))
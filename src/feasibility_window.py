@@ -0,0 +1,116 @@
+"""
+Ventana del mapa de viabilidad
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from config import MIN_ANGULO, MAX_ANGULO, MIN_VELOCIDAD, MAX_VELOCIDAD, DISTANCIA_MAXIMA_MAPA
+from feasibility import MapaViabilidad
+
+# Color RGBA de la región viable sobre el mapa de distancias
+COLOR_VIABLE = (0.1, 0.8, 0.2, 0.55)
+
+class VentanaViabilidad:
+    def __init__(self, root, al_cerrar=None):
+        """
+        Constructor de la clase VentanaViabilidad
+
+        El mapa se refina de grueso a fino en llamadas sucesivas del bucle de
+        Tk, así que un cambio de entradas en medio del refinamiento descarta
+        los niveles pendientes en lugar de esperar a que terminen.
+        """
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("Mapa de Viabilidad")
+        self.ventana.geometry("800x650")
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+        self.al_cerrar = al_cerrar
+
+        self.mapas = MapaViabilidad()
+        self.clave = None
+        self.id_refinado = None
+
+        self.figura = Figure(figsize=(7, 5.5))
+        self.ejes = self.figura.add_subplot(111)
+        self.ejes.set_xlabel('Ángulo de lanzamiento (°)')
+        self.ejes.set_ylabel('Velocidad del misil (km/s)')
+        self.ejes.set_title('Distancia mínima de paso (km)')
+
+        extension = (MIN_ANGULO, MAX_ANGULO, MIN_VELOCIDAD, MAX_VELOCIDAD)
+        vacio = np.full((2, 2), np.nan)
+        self.imagen = self.ejes.imshow(vacio, origin='lower', extent=extension, aspect='auto',
+                                       cmap='viridis_r', vmin=0, vmax=DISTANCIA_MAXIMA_MAPA,
+                                       interpolation='nearest')
+        self.imagen_viable = self.ejes.imshow(np.zeros((2, 2, 4)), origin='lower', extent=extension,
+                                              aspect='auto', interpolation='nearest')
+        self.figura.colorbar(self.imagen, ax=self.ejes)
+        self.marcador, = self.ejes.plot([], [], 'w+', markersize=14, markeredgewidth=2.5,
+                                        label='Disparo actual')
+        self.ejes.legend(loc='upper right')
+
+        self.lienzo = FigureCanvasTkAgg(self.figura, master=self.ventana)
+        self.lienzo.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.etiqueta_info = ttk.Label(self.ventana, text="")
+        self.etiqueta_info.pack(pady=5)
+
+    def actualizar(self, altura_enemigo, distancia_defensa, delay_lanzamiento, angulo_misil, velocidad_misil):
+        """
+        Muestra el mapa de las entradas dadas con el disparo actual marcado.
+        Si solo cambió el disparo, solo se mueve el marcador.
+        """
+        self.marcador.set_data([angulo_misil], [velocidad_misil])
+
+        clave = (altura_enemigo, distancia_defensa, delay_lanzamiento)
+        if clave != self.clave:
+            self.clave = clave
+            self.cancelar_refinado()
+
+            # El nivel más grueso se calcula en el acto (menos de un milisegundo)
+            disponible = self.mapas.mejor_disponible(*clave)
+            if disponible is None:
+                self.refinar()
+            else:
+                self.mostrar(*disponible)
+                self.programar_refinado()
+
+        self.lienzo.draw_idle()
+
+    def programar_refinado(self):
+        """Calcula el siguiente nivel pendiente en la próxima vuelta del bucle de Tk"""
+        if self.mapas.pendientes(*self.clave):
+            self.id_refinado = self.ventana.after(1, self.refinar)
+
+    def refinar(self):
+        """Calcula y muestra el siguiente nivel de resolución"""
+        self.id_refinado = None
+        resolucion = self.mapas.pendientes(*self.clave)[0]
+        self.mostrar(resolucion, self.mapas.calcular(*self.clave, resolucion))
+        self.lienzo.draw_idle()
+        self.programar_refinado()
+
+    def mostrar(self, resolucion, mapa):
+        """Pinta un mapa de distancias y su región viable"""
+        self.imagen.set_data(mapa)
+        viable = np.zeros(mapa.shape + (4,), dtype=np.float32)
+        viable[mapa < self.mapas.umbral] = COLOR_VIABLE
+        self.imagen_viable.set_data(viable)
+
+        self.etiqueta_info.config(
+            text=f"Región viable: {self.mapas.fraccion_viable(mapa):.1%} de la malla "
+                 f"({resolucion}×{resolucion})"
+        )
+
+    def cancelar_refinado(self):
+        if self.id_refinado is not None:
+            self.ventana.after_cancel(self.id_refinado)
+            self.id_refinado = None
+
+    def cerrar(self):
+        """Cierra la ventana del mapa de viabilidad"""
+        self.cancelar_refinado()
+        self.ventana.destroy()
+        if self.al_cerrar is not None:
+            self.al_cerrar()
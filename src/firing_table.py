@@ -0,0 +1,183 @@
+"""
+Tabla de tiro precalculada para los parámetros óptimos de interceptación
+
+Resuelve (ángulo, velocidad, tiempo de intercepción) sobre una malla densa de
+altura × distancia × delay dentro de los rangos de config.py y la guarda como
+.npy para abrirla con memory-mapping. Las consultas se responden por
+interpolación multilineal, con un refinamiento opcional sobre las ecuaciones
+de intercepción sembrado con el valor interpolado.
+
+Uso:
+    python firing_table.py --alturas 31 --distancias 151 --delays 21
+"""
+
+import argparse
+import os
+import numpy as np
+from config import (MIN_ALTURA, MAX_ALTURA, MIN_DISTANCIA, MAX_DISTANCIA, MIN_DELAY, MAX_DELAY,
+                    MIN_VELOCIDAD, MAX_VELOCIDAD, MIN_ANGULO, MAX_ANGULO, UMBRAL_INTERCEPCION, RUTA_TABLA_TIRO)
+from physics import calcular_posicion_enemigo, calcular_posicion_misil, calcular_distancia
+from optimizer import (resolver_intercepcion_lote, resolver_tiempos_intercepcion,
+                       calcular_parametros_lanzamiento, calcular_tiempo_limite_intercepcion,
+                       validar_altura_intercepcion, crear_resultado)
+
+def resolver_ruta_tabla(ruta=RUTA_TABLA_TIRO):
+    """
+    Las rutas relativas se interpretan respecto al directorio del simulador
+    """
+    if os.path.isabs(ruta):
+        return ruta
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), ruta)
+
+def ruta_ejes(ruta):
+    """Archivo con los ejes de la malla que acompaña a la tabla"""
+    return os.path.splitext(ruta)[0] + "_ejes.npz"
+
+def construir_tabla_tiro(n_alturas, n_distancias, n_delays,
+                         min_velocidad=MIN_VELOCIDAD, max_velocidad=MAX_VELOCIDAD):
+    """
+    Calcula la tabla [alturas, distancias, delays, (ángulo, velocidad, tiempo)]
+    en una sola evaluación vectorizada. Las celdas sin solución quedan en NaN.
+    """
+    alturas = np.linspace(MIN_ALTURA, MAX_ALTURA, n_alturas)
+    distancias = np.linspace(MIN_DISTANCIA, MAX_DISTANCIA, n_distancias)
+    delays = np.linspace(MIN_DELAY, MAX_DELAY, n_delays)
+
+    # La intercepción más temprana siempre se logra a velocidad máxima
+    angulo, tiempo = resolver_intercepcion_lote(
+        alturas[:, None, None], distancias[None, :, None], max_velocidad, delays[None, None, :]
+    )
+    velocidad = np.where(np.isnan(tiempo), np.nan, max_velocidad)
+
+    tabla = np.stack([angulo, velocidad, tiempo], axis=-1).astype(np.float32)
+    ejes = {
+        "alturas": alturas,
+        "distancias": distancias,
+        "delays": delays,
+        "velocidades": np.array([min_velocidad, max_velocidad])
+    }
+    return tabla, ejes
+
+def guardar_tabla_tiro(tabla, ejes, ruta=RUTA_TABLA_TIRO):
+    """Guarda la tabla como .npy y sus ejes en un .npz junto a ella"""
+    ruta = resolver_ruta_tabla(ruta)
+    np.save(ruta, tabla)
+    np.savez(ruta_ejes(ruta), **ejes)
+    return ruta
+
+class TablaTiro:
+    def __init__(self, tabla, alturas, distancias, delays, velocidades):
+        """Constructor de la clase TablaTiro"""
+        self.tabla = tabla
+        self.ejes = (np.asarray(alturas), np.asarray(distancias), np.asarray(delays))
+        self.min_velocidad, self.max_velocidad = (float(v) for v in velocidades)
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_TABLA_TIRO):
+        """
+        Abre la tabla con memory-mapping; devuelve None si no existe
+        """
+        ruta = resolver_ruta_tabla(ruta)
+        if not (os.path.exists(ruta) and os.path.exists(ruta_ejes(ruta))):
+            return None
+
+        with np.load(ruta_ejes(ruta)) as ejes:
+            return cls(
+                np.load(ruta, mmap_mode='r'),
+                ejes["alturas"], ejes["distancias"], ejes["delays"], ejes["velocidades"]
+            )
+
+    def interpolar(self, altura, distancia, delay):
+        """
+        Interpolación multilineal de (ángulo, velocidad, tiempo).
+        Devuelve None fuera de la malla o si alguna esquina no tiene solución.
+        """
+        indices = []
+        pesos = []
+        for valor, eje in zip((altura, distancia, delay), self.ejes):
+            if not eje[0] <= valor <= eje[-1]:
+                return None
+            if len(eje) == 1:
+                indices.append(0)
+                pesos.append(0.0)
+                continue
+            # Los ejes son equiespaciados: la celda se obtiene directamente
+            posicion = (valor - eje[0]) / (eje[1] - eje[0])
+            indice = min(int(posicion), len(eje) - 2)
+            indices.append(indice)
+            pesos.append(posicion - indice)
+
+        i, j, k = indices
+        celda = np.asarray(self.tabla[i:i + 2, j:j + 2, k:k + 2], dtype=float)
+        if np.isnan(celda).any():
+            return None
+
+        # Reducir eje por eje con interpolación lineal
+        for peso in pesos:
+            if celda.shape[0] == 1:
+                celda = celda[0]
+            else:
+                celda = celda[0] * (1 - peso) + celda[1] * peso
+
+        angulo, velocidad, tiempo = celda
+        return float(angulo), float(velocidad), float(tiempo)
+
+    def refinar(self, altura, distancia, delay, velocidad, tiempo):
+        """
+        Resuelve las ecuaciones de intercepción para la velocidad interpolada y
+        toma la raíz factible más cercana al tiempo interpolado
+        """
+        tiempos = np.array(resolver_tiempos_intercepcion(altura, distancia, velocidad, delay))
+        factibles = tiempos[(tiempos > delay) & (tiempos <= calcular_tiempo_limite_intercepcion(altura))]
+        if not factibles.size:
+            return None
+
+        tiempo = float(factibles[np.argmin(np.abs(factibles - tiempo))])
+        angulo, _ = calcular_parametros_lanzamiento(altura, distancia, delay, tiempo)
+        if not 0 < angulo <= 90:
+            return None
+        return float(angulo), velocidad, tiempo
+
+    def consultar(self, altura, distancia, min_velocidad, max_velocidad, delay, refinar=True):
+        """
+        Parámetros óptimos con la forma del resultado del optimizador, o None si
+        la tabla no cubre la consulta o la solución no pasa el umbral de intercepción
+        """
+        if min_velocidad < self.min_velocidad or max_velocidad > self.max_velocidad:
+            return None
+
+        parametros = self.interpolar(altura, distancia, delay)
+        if parametros is not None and refinar:
+            parametros = self.refinar(altura, distancia, delay, parametros[1], parametros[2])
+        if parametros is None:
+            return None
+
+        angulo, velocidad, tiempo = parametros
+        # Las tablas generadas antes de limitar el ángulo pueden traer disparos rasantes
+        if not (min_velocidad <= velocidad <= max_velocidad and MIN_ANGULO <= angulo <= MAX_ANGULO):
+            return None
+
+        # Validar la solución interpolada con la física real
+        enemigo_y = calcular_posicion_enemigo(altura, tiempo)
+        misil_x, misil_y = calcular_posicion_misil(angulo, velocidad, tiempo, delay)
+        distancia_final = calcular_distancia(misil_x, misil_y, distancia, enemigo_y)
+        if distancia_final >= UMBRAL_INTERCEPCION or not validar_altura_intercepcion(enemigo_y):
+            return None
+
+        return crear_resultado(parametros, distancia_final, True, "Solución de la tabla de tiro")
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye la tabla de tiro precalculada")
+    parser.add_argument("--salida", default=RUTA_TABLA_TIRO, help="Archivo .npy de la tabla")
+    parser.add_argument("--alturas", type=int, default=31, help="Puntos de la malla de altura")
+    parser.add_argument("--distancias", type=int, default=151, help="Puntos de la malla de distancia")
+    parser.add_argument("--delays", type=int, default=21, help="Puntos de la malla de delay")
+    args = parser.parse_args()
+
+    tabla, ejes = construir_tabla_tiro(args.alturas, args.distancias, args.delays)
+    ruta = guardar_tabla_tiro(tabla, ejes, args.salida)
+    factibles = np.count_nonzero(~np.isnan(tabla[..., 0]))
+    print(f"Tabla de tiro guardada en {ruta}: {factibles}/{tabla[..., 0].size} celdas con solución")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Historial de lanzamientos persistente en SQLite
+
+Los lanzamientos se acumulan en memoria y se escriben por lotes, cada lote en
+una sola transacción, que además aplica el límite de retención. Las columnas
+por las que se filtra están indexadas, y las consultas devuelven solo la
+ventana pedida para que la tabla de la interfaz no materialice todo el
+historial.
+"""
+
+import os
+import sqlite3
+import time
+from config import RUTA_HISTORIAL, MAX_HISTORIAL_SIMULACIONES, TAMANO_LOTE_HISTORIAL
+
+COLUMNAS_LANZAMIENTO = (
+    "fecha", "altura", "distancia", "velocidad", "angulo", "delay",
+    "resultado", "tiempo", "altura_intercepcion"
+)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS lanzamientos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fecha REAL NOT NULL,
+    altura REAL NOT NULL,
+    distancia REAL NOT NULL,
+    velocidad REAL NOT NULL,
+    angulo REAL NOT NULL,
+    delay REAL NOT NULL,
+    resultado TEXT NOT NULL,
+    tiempo REAL NOT NULL,
+    altura_intercepcion REAL
+);
+CREATE INDEX IF NOT EXISTS idx_lanzamientos_resultado ON lanzamientos (resultado, altura_intercepcion);
+CREATE INDEX IF NOT EXISTS idx_lanzamientos_delay ON lanzamientos (delay);
+"""
+
+class HistorialLanzamientos:
+    def __init__(self, ruta=RUTA_HISTORIAL, max_registros=MAX_HISTORIAL_SIMULACIONES,
+                 tamano_lote=TAMANO_LOTE_HISTORIAL):
+        """
+        Constructor de la clase HistorialLanzamientos
+
+        Las rutas relativas se interpretan respecto al directorio del
+        simulador; ruta=':memory:' mantiene el historial solo durante la sesión.
+        """
+        if ruta != ":memory:" and not os.path.isabs(ruta):
+            ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), ruta)
+
+        self.max_registros = max_registros
+        self.tamano_lote = tamano_lote
+        self.pendientes = []
+        self.conexion = sqlite3.connect(ruta)
+        # Con WAL cada lote es un único apéndice al registro, sin sincronizar la base completa
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.executescript(ESQUEMA)
+
+    def agregar(self, altura, distancia, velocidad, angulo, delay, resultado, tiempo,
+                altura_intercepcion=None):
+        """
+        Añade un lanzamiento al lote pendiente; el lote se escribe al llenarse,
+        al consultar o al llamar a confirmar()
+        """
+        self.pendientes.append((
+            time.time(), float(altura), float(distancia), float(velocidad), float(angulo), float(delay),
+            resultado, float(tiempo), None if altura_intercepcion is None else float(altura_intercepcion)
+        ))
+        if len(self.pendientes) >= self.tamano_lote:
+            self.confirmar()
+
+    def confirmar(self):
+        """Escribe los lanzamientos pendientes y aplica la retención en una transacción"""
+        if not self.pendientes:
+            return
+
+        with self.conexion:
+            self.conexion.executemany(
+                f"INSERT INTO lanzamientos ({', '.join(COLUMNAS_LANZAMIENTO)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNAS_LANZAMIENTO))})",
+                self.pendientes
+            )
+            # Solo se borran los más antiguos, así que los ids conservados son
+            # consecutivos y el corte se obtiene por la clave primaria
+            if self.max_registros is not None:
+                self.conexion.execute(
+                    "DELETE FROM lanzamientos WHERE id <= (SELECT MAX(id) FROM lanzamientos) - ?",
+                    (self.max_registros,)
+                )
+        self.pendientes.clear()
+
+    @staticmethod
+    def _condiciones(resultado=None, min_altura_intercepcion=None, min_delay=None, max_delay=None):
+        """Cláusula WHERE y parámetros de un filtro"""
+        condiciones = []
+        parametros = []
+        if resultado is not None:
+            condiciones.append("resultado = ?")
+            parametros.append(resultado)
+        if min_altura_intercepcion is not None:
+            condiciones.append("altura_intercepcion > ?")
+            parametros.append(min_altura_intercepcion)
+        if min_delay is not None:
+            condiciones.append("delay > ?")
+            parametros.append(min_delay)
+        if max_delay is not None:
+            condiciones.append("delay < ?")
+            parametros.append(max_delay)
+
+        clausula = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        return clausula, parametros
+
+    def contar(self, **filtros):
+        """Número de lanzamientos que cumplen el filtro"""
+        self.confirmar()
+        clausula, parametros = self._condiciones(**filtros)
+        return self.conexion.execute(f"SELECT COUNT(*) FROM lanzamientos{clausula}", parametros).fetchone()[0]
+
+    def consultar(self, desde=0, limite=None, **filtros):
+        """
+        Lanzamientos que cumplen el filtro, del más reciente al más antiguo,
+        como tuplas (id, fecha, altura, distancia, velocidad, angulo, delay,
+        resultado, tiempo, altura_intercepcion). Solo se leen las filas de la
+        ventana [desde, desde + limite).
+
+        Filtros: resultado, min_altura_intercepcion, min_delay, max_delay; p. ej.
+        consultar(resultado='intercepcion', min_altura_intercepcion=1, min_delay=2).
+        """
+        self.confirmar()
+        clausula, parametros = self._condiciones(**filtros)
+        return self.conexion.execute(
+            f"SELECT id, {', '.join(COLUMNAS_LANZAMIENTO)} FROM lanzamientos{clausula} "
+            f"ORDER BY id DESC LIMIT ? OFFSET ?",
+            parametros + [-1 if limite is None else limite, desde]
+        ).fetchall()
+
+    def limpiar(self):
+        """Borra todo el historial"""
+        self.pendientes.clear()
+        with self.conexion:
+            self.conexion.execute("DELETE FROM lanzamientos")
+
+    def cerrar(self):
+        """Escribe lo pendiente y cierra la base de datos"""
+        self.confirmar()
+        self.conexion.close()
@@ -0,0 +1,154 @@
+"""
+Tabla virtualizada del historial de lanzamientos
+
+El Treeview solo contiene las filas visibles: la barra de desplazamiento y la
+rueda del ratón mueven una ventana sobre el historial en SQLite y cada
+desplazamiento consulta únicamente esa ventana.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from config import COLUMNAS_HISTORIAL, INTERVALO_CONFIRMACION_HISTORIAL
+from simulation_engine import RESULTADO_INTERCEPCION, RESULTADO_IMPACTO
+
+ANCHOS_COLUMNAS = (70, 70, 80, 90, 70, 60, 170)
+
+def formatear_resultado(resultado, tiempo, altura_intercepcion):
+    """Texto de la columna Resultado"""
+    if resultado == RESULTADO_INTERCEPCION:
+        return f"Interceptado a {tiempo:.1f}s y {altura_intercepcion:.2f} km"
+    if resultado == RESULTADO_IMPACTO:
+        return "Impacto en ciudad"
+    return "Fallido"
+
+class VistaHistorial:
+    def __init__(self, parent, historial, filas_visibles=15):
+        """Constructor de la clase VistaHistorial"""
+        self.historial = historial
+        self.filas_visibles = filas_visibles
+        self.desde = 0
+        self.total = 0
+        self.filtros = {}
+        self.id_refresco = None
+
+        self.frame = ttk.LabelFrame(parent, text="Historial de Lanzamientos")
+        self.frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=10, pady=5)
+
+        # Filtros
+        panel_filtros = ttk.Frame(self.frame)
+        panel_filtros.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 5))
+
+        self.solo_intercepciones = tk.BooleanVar(value=False)
+        ttk.Checkbutton(panel_filtros, text="Solo intercepciones",
+                        variable=self.solo_intercepciones).pack(side=tk.LEFT, padx=2)
+        ttk.Label(panel_filtros, text="Altura int. >").pack(side=tk.LEFT, padx=2)
+        self.entrada_altura = ttk.Entry(panel_filtros, width=5)
+        self.entrada_altura.pack(side=tk.LEFT, padx=2)
+        ttk.Label(panel_filtros, text="Delay >").pack(side=tk.LEFT, padx=2)
+        self.entrada_delay = ttk.Entry(panel_filtros, width=5)
+        self.entrada_delay.pack(side=tk.LEFT, padx=2)
+        ttk.Button(panel_filtros, text="Filtrar", command=self.aplicar_filtros).pack(side=tk.LEFT, padx=2)
+
+        # Tabla con solo las filas visibles
+        self.tabla = ttk.Treeview(self.frame, columns=COLUMNAS_HISTORIAL, show='headings',
+                                  height=filas_visibles)
+        for columna, ancho in zip(COLUMNAS_HISTORIAL, ANCHOS_COLUMNAS):
+            self.tabla.heading(columna, text=columna)
+            self.tabla.column(columna, width=ancho)
+
+        self.scrolly = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.desplazar)
+        scrollx = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.tabla.xview)
+        self.tabla.configure(xscrollcommand=scrollx.set)
+
+        self.tabla.bind('<MouseWheel>', lambda e: self.mover(-1 if e.delta > 0 else 1))
+        self.tabla.bind('<Button-4>', lambda e: self.mover(-1))
+        self.tabla.bind('<Button-5>', lambda e: self.mover(1))
+
+        self.tabla.grid(row=1, column=0, sticky='nsew')
+        self.scrolly.grid(row=1, column=1, sticky='ns')
+        scrollx.grid(row=2, column=0, sticky='ew')
+
+        self.etiqueta_total = ttk.Label(self.frame, text="")
+        self.etiqueta_total.grid(row=4, column=0, sticky=tk.W)
+        ttk.Button(self.frame, text="Limpiar Historial",
+                   command=self.limpiar).grid(row=3, column=0, pady=5)
+
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.frame.grid_rowconfigure(1, weight=1)
+
+        self.refrescar()
+
+    def aplicar_filtros(self):
+        """Lee los filtros de los controles y vuelve al inicio del historial"""
+        try:
+            altura = float(self.entrada_altura.get()) if self.entrada_altura.get() else None
+            delay = float(self.entrada_delay.get()) if self.entrada_delay.get() else None
+        except ValueError:
+            messagebox.showerror("Error", "Los filtros de altura y delay deben ser números")
+            return
+
+        self.filtros = {
+            "resultado": RESULTADO_INTERCEPCION if self.solo_intercepciones.get() or altura is not None else None,
+            "min_altura_intercepcion": altura,
+            "min_delay": delay
+        }
+        self.desde = 0
+        self.refrescar()
+
+    def refrescar(self):
+        """Vuelve a consultar la ventana visible"""
+        self.total = self.historial.contar(**self.filtros)
+        self.desde = max(0, min(self.desde, self.total - self.filas_visibles))
+        filas = self.historial.consultar(self.desde, self.filas_visibles, **self.filtros)
+
+        self.tabla.delete(*self.tabla.get_children())
+        for _, _, altura, distancia, velocidad, angulo, delay, resultado, tiempo, altura_intercepcion in filas:
+            self.tabla.insert('', tk.END, values=(
+                f"{tiempo:.1f}",
+                f"{altura:.1f}",
+                f"{distancia:.1f}",
+                f"{velocidad:.1f}",
+                f"{angulo:.1f}",
+                f"{delay:.1f}",
+                formatear_resultado(resultado, tiempo, altura_intercepcion)
+            ))
+
+        if self.total:
+            self.scrolly.set(self.desde / self.total, (self.desde + len(filas)) / self.total)
+        else:
+            self.scrolly.set(0, 1)
+        self.etiqueta_total.config(text=f"{self.total} lanzamientos")
+
+    def mover(self, filas):
+        """Desplaza la ventana visible un número de filas"""
+        self.desde += filas
+        self.refrescar()
+
+    def desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento ('moveto' o 'scroll')"""
+        if accion == 'moveto':
+            self.desde = int(round(float(cantidad) * self.total))
+            self.refrescar()
+        elif accion == 'scroll':
+            paso = self.filas_visibles if unidad == 'pages' else 1
+            self.mover(int(cantidad) * paso)
+
+    def programar_refresco(self):
+        """
+        Agrupa los lanzamientos que llegan seguidos: el lote se escribe y la
+        tabla se refresca una sola vez al cabo del intervalo de confirmación
+        """
+        if self.id_refresco is None:
+            self.id_refresco = self.frame.after(INTERVALO_CONFIRMACION_HISTORIAL, self._refresco_programado)
+
+    def _refresco_programado(self):
+        self.id_refresco = None
+        self.historial.confirmar()
+        self.desde = 0
+        self.refrescar()
+
+    def limpiar(self):
+        """Borra el historial completo"""
+        self.historial.limpiar()
+        self.desde = 0
+        self.refrescar()
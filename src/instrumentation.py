@@ -0,0 +1,116 @@
+"""
+Instrumentación de los caminos críticos de la interfaz
+
+Instrumentacion guarda las últimas muestras de cada métrica (duración de
+animar, tiempo de dibujo, intervalo real entre frames, tiempo y evaluaciones
+del optimizador, tasa de aciertos de la caché) y, si hay ruta de registro, las
+vuelca a un CSV rotativo (marca_tiempo,metrica,valor) para analizarlas después.
+
+Desactivada, medir() devuelve un contexto vacío compartido y registrar()
+retorna de inmediato, así que los puntos de medición pueden quedarse en los
+caminos críticos.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from logging.handlers import RotatingFileHandler
+import numpy as np
+from config import (INSTRUMENTACION_ACTIVA, MAX_MUESTRAS_METRICAS, RUTA_REGISTRO_METRICAS,
+                    TAMANO_REGISTRO_METRICAS)
+
+# Métricas registradas por el simulador
+METRICA_ANIMAR = "animar"
+METRICA_DIBUJO = "dibujo"
+METRICA_INTERVALO = "intervalo_frame"
+METRICA_OPTIMIZADOR = "optimizador"
+METRICA_NFEV = "optimizador_nfev"
+METRICA_CACHE = "cache_tasa_aciertos"
+METRICA_PASOS = "pasos_por_frame"
+
+_CONTEXTO_VACIO = nullcontext()
+
+class _Cronometro:
+    """Contexto que registra su duración en milisegundos"""
+    __slots__ = ("instrumentacion", "nombre", "inicio")
+
+    def __init__(self, instrumentacion, nombre):
+        self.instrumentacion = instrumentacion
+        self.nombre = nombre
+        self.inicio = None
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.instrumentacion.registrar(self.nombre, (time.perf_counter() - self.inicio) * 1000)
+        return False
+
+class Instrumentacion:
+    def __init__(self, activa=INSTRUMENTACION_ACTIVA, ruta_registro=RUTA_REGISTRO_METRICAS,
+                 max_muestras=MAX_MUESTRAS_METRICAS):
+        """
+        Constructor de la clase Instrumentacion
+
+        Las rutas relativas del registro se interpretan respecto al directorio
+        del simulador; ruta_registro=None desactiva el volcado a disco.
+        """
+        self.activa = activa
+        self.max_muestras = max_muestras
+        self.series = {}
+
+        self.registro = None
+        if ruta_registro is not None:
+            if not os.path.isabs(ruta_registro):
+                ruta_registro = os.path.join(os.path.dirname(os.path.abspath(__file__)), ruta_registro)
+            manejador = RotatingFileHandler(
+                ruta_registro, maxBytes=TAMANO_REGISTRO_METRICAS, backupCount=1, delay=True, encoding="utf-8"
+            )
+            manejador.setFormatter(logging.Formatter("%(created).3f,%(message)s"))
+            self.registro = logging.getLogger(f"{__name__}.{id(self)}")
+            self.registro.propagate = False
+            self.registro.setLevel(logging.INFO)
+            self.registro.addHandler(manejador)
+
+    def medir(self, nombre):
+        """Contexto que mide la duración del bloque (vacío si está desactivada)"""
+        if not self.activa:
+            return _CONTEXTO_VACIO
+        return _Cronometro(self, nombre)
+
+    def registrar(self, nombre, valor):
+        """Añade una muestra a la serie (es seguro llamarlo desde un hilo trabajador)"""
+        if not self.activa:
+            return
+
+        serie = self.series.get(nombre)
+        if serie is None:
+            serie = self.series.setdefault(nombre, deque(maxlen=self.max_muestras))
+        serie.append(valor)
+
+        if self.registro is not None:
+            self.registro.info("%s,%.6g", nombre, valor)
+
+    def resumen(self, nombre):
+        """(última, media, p95) de la serie, o None si no tiene muestras"""
+        serie = self.series.get(nombre)
+        if not serie:
+            return None
+
+        valores = np.fromiter(serie, dtype=float, count=len(serie))
+        return valores[-1], float(valores.mean()), float(np.percentile(valores, 95))
+
+    def limpiar(self):
+        """Descarta las muestras en memoria"""
+        self.series.clear()
+
+    def cerrar(self):
+        """Cierra el archivo de registro"""
+        if self.registro is not None:
+            for manejador in list(self.registro.handlers):
+                manejador.close()
+                self.registro.removeHandler(manejador)
+            self.registro = None
@@ -1,12 +1,36 @@
+import time
+INICIO = time.perf_counter()
+
+import argparse
 import tkinter as tk
-from missile_simulation import SimuladorMisiles
+from startup import MedidorArranque
 
 def main():
+    parser = argparse.ArgumentParser(description="Simulador de interceptación de misiles")
+    parser.add_argument("--medir-arranque", action="store_true",
+                        help="Mostrar el desglose de importaciones y del primer pintado")
+    args = parser.parse_args()
+
+    medidor = MedidorArranque(INICIO) if args.medir_arranque else None
+    if medidor is not None:
+        medidor.marcar("tkinter y argumentos")
+
+    from missile_simulation import SimuladorMisiles
+    if medidor is not None:
+        medidor.marcar("módulos del simulador")
+
     root = tk.Tk()
-    app = SimuladorMisiles(root)
+    app = SimuladorMisiles(root, medidor)
+
+    if medidor is not None:
+        medidor.marcar("simulador listo")
+        # La precarga termina poco después; se espera para incluirla en el informe
+        if app.hilo_precarga is not None:
+            app.hilo_precarga.join()
+        print(medidor.informe())
+
     root.mainloop()
 
 if __name__ == "__main__":
     main()
-    
 
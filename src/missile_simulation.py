@@ -4,26 +4,51 @@ Clase principal para la simulación de interceptación de misiles
 """
 
 import numpy as np
-import matplotlib
-from matplotlib.animation import FuncAnimation
 import tkinter as tk
 from tkinter import messagebox, ttk
 from config import (DEFAULT_ALTURA_ENEMIGA, DEFAULT_DISTANCIA_DEFENSA,
                    DEFAULT_VELOCIDAD_MISIL, DEFAULT_ANGULO_MISIL,
                    DEFAULT_DELAY_LANZAMIENTO, INCREMENTO_TIEMPO, INTERVALO_ANIMACION,
                    MIN_VELOCIDAD, MAX_VELOCIDAD,
-                   UMBRAL_INTERCEPCION, MIN_ALTURA, MAX_ALTURA, MIN_ANGULO, MAX_ANGULO)
-from physics import calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo, calcular_posicion_misil
-from optimizer import encontrar_parametros_optimos, validar_impacto_suelo, validar_altura_intercepcion
-from ui_components import crear_panel_control, crear_info_panel, crear_plot, mostrar_valores_optimos, crear_historial_panel
+                   UMBRAL_INTERCEPCION, MIN_ALTURA, MAX_ALTURA, MIN_ANGULO, MAX_ANGULO,
+                   RUTA_CACHE_OPTIMIZACION, USAR_BLIT, INTERVALO_OVERLAY_METRICAS,
+                   GRABAR_SIMULACIONES, PRECARGAR_MODULOS, MODULOS_PRECARGA, RETARDO_VISTA_PREVIA,
+                   FACTOR_REPRODUCCION)
+from physics import calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo
+from optimizer_cache import CacheOptimizacion
+from multistart import MemoriaSoluciones
+from firing_table import TablaTiro
+from history_store import HistorialLanzamientos
+from instrumentation import (Instrumentacion, METRICA_ANIMAR, METRICA_OPTIMIZADOR, METRICA_NFEV, METRICA_CACHE,
+                             METRICA_PASOS)
+from optimization_worker import TrabajadorOptimizacion
+from preview import CacheVistaPrevia
+from playback import ProgramadorReproduccion
+from scheduling import planificar_lanzamiento
+from monte_carlo import estimar_probabilidad_intercepcion
+from recording import guardar_grabacion
+from startup import precargar_en_segundo_plano
+from simulation_engine import (MotorSimulacion, RESULTADO_INTERCEPCION, RESULTADO_IMPACTO,
+                               RESULTADO_ALTURA_INSUFICIENTE, RESULTADO_EN_CURSO)
+from ui_components import (crear_panel_control, crear_info_panel, crear_plot, mostrar_valores_optimos,
+                           crear_historial_panel, mostrar_probabilidad_intercepcion, formatear_metricas,
+                           objetivo_seleccionado, metodo_seleccionado, formatear_planificacion,
+                           TEXTO_BOTON_CALCULAR, TEXTO_BOTON_PROBABILIDAD)
 
-# Configurar backend de matplotlib
-matplotlib.use("TkAgg")
+# matplotlib (gráfico y animación), scipy y las ventanas secundarias se
+# importan al usarse, para pintar la ventana principal cuanto antes
 
 class SimuladorMisiles:
-    def __init__(self, root):
-        """Constructor de la clase SimuladorMisiles"""
+    def __init__(self, root, medidor=None):
+        """
+        Constructor de la clase SimuladorMisiles
+
+        La ventana se pinta con los controles antes de crear el gráfico, que
+        es lo que carga matplotlib; medidor (MedidorArranque) recibe las
+        marcas de cada etapa.
+        """
         self.root = root
+        self.medidor = medidor
         self.root.title("Simulador de Interceptación de Misiles")
         self.root.geometry("1400x800")  # Aumentamos el ancho para el historial
         
@@ -49,6 +74,11 @@ class SimuladorMisiles:
         self.anim = None
         self.tiempo = 0
         self.incremento_tiempo = INCREMENTO_TIEMPO
+        self.resultado_simulacion = None
+        self.indice_frame = -1
+        self.simulacion_terminada = False
+        self.factor_reproduccion = FACTOR_REPRODUCCION
+        self.programador = None
         
         # Trayectorias
         self.enemigo_x = []
@@ -56,17 +86,91 @@ class SimuladorMisiles:
         self.misil_x = []
         self.misil_y = []
         
+        # Tabla de tiro precalculada, si está disponible
+        self.tabla_tiro = TablaTiro.cargar()
+        self.cache_optimizacion = CacheOptimizacion(ruta_disco=RUTA_CACHE_OPTIMIZACION)
+        self.memoria_soluciones = MemoriaSoluciones()
+        self.trabajador_optimizacion = TrabajadorOptimizacion(self.root)
+        self.trabajador_monte_carlo = TrabajadorOptimizacion(self.root)
+        self.instrumentacion = Instrumentacion()
+        self.historial = HistorialLanzamientos()
+        self.id_overlay_metricas = None
+        self.ventana_viabilidad = None
+        self.hilo_precarga = None
+        self.cache_vista_previa = CacheVistaPrevia()
+        self.id_vista_previa = None
+        self.clave_vista_previa = None
+        self.plan_lanzamiento = None
+        self.clave_planificacion = None
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
         # Calcular tiempo de vuelo del misil enemigo
         self.tiempo_vuelo_enemigo = calcular_tiempo_vuelo_enemigo(self.altura_enemigo)
         
-        # Crear componentes de UI
+        # Crear componentes de UI y pintarlos antes de cargar matplotlib
         crear_panel_control(self.frame_izquierdo, self)
         crear_info_panel(self.frame_izquierdo, self)
-        crear_plot(self.frame_izquierdo, self)
         self.tabla_historial = crear_historial_panel(self.frame_principal, self)
+        self.marcar_arranque("ventana y controles")
+        self.root.update()
+        self.marcar_arranque("primer pintado")
+        
+        self.crear_grafico()
+        self.marcar_arranque("gráfico (matplotlib)")
+        
+        # scipy se carga en segundo plano mientras el usuario ajusta los parámetros
+        if PRECARGAR_MODULOS:
+            self.hilo_precarga = precargar_en_segundo_plano(MODULOS_PRECARGA, self.medidor)
         
         # Inicializar elementos gráficos
         self.reiniciar_simulacion()
+        if self.instrumentacion.activa:
+            self.alternar_metricas()
+    
+    def marcar_arranque(self, etapa):
+        """Cierra una etapa del arranque si se está midiendo"""
+        if self.medidor is not None:
+            self.medidor.marcar(etapa)
+    
+    def crear_grafico(self):
+        """Importa matplotlib y crea el gráfico con su renderizador"""
+        import matplotlib
+        matplotlib.use("TkAgg")
+        from renderer import RenderizadorTrayectorias, MedidorFrames
+        
+        crear_plot(self.frame_izquierdo, self)
+        self.renderizador = RenderizadorTrayectorias(
+            self.linea_enemigo, self.linea_misil, self.punto_enemigo, self.punto_misil
+        )
+        self.medidor_frames = MedidorFrames(self.lienzo, self.instrumentacion, USAR_BLIT, self.root.after_idle)
+    
+    def cerrar(self):
+        """Guarda la caché del optimizador y cierra la ventana"""
+        self.trabajador_optimizacion.cancelar()
+        self.trabajador_monte_carlo.cancelar()
+        self.cache_optimizacion.cerrar()
+        self.instrumentacion.cerrar()
+        self.historial.cerrar()
+        self.root.destroy()
+    
+    def alternar_metricas(self):
+        """Activa o desactiva la instrumentación y su overlay en el panel de información"""
+        self.instrumentacion.activa = self.variable_metricas.get()
+        if self.instrumentacion.activa:
+            self.etiqueta_metricas.pack(anchor=tk.W, padx=5, pady=(0, 5))
+            if self.id_overlay_metricas is None:
+                self.actualizar_overlay_metricas()
+        else:
+            self.etiqueta_metricas.pack_forget()
+            self.instrumentacion.limpiar()
+    
+    def actualizar_overlay_metricas(self):
+        """Refresca el overlay periódicamente mientras la instrumentación esté activa"""
+        self.id_overlay_metricas = None
+        if not self.instrumentacion.activa:
+            return
+        self.etiqueta_metricas.config(text=formatear_metricas(self.instrumentacion))
+        self.id_overlay_metricas = self.root.after(INTERVALO_OVERLAY_METRICAS, self.actualizar_overlay_metricas)
     
     def actualizar_limites_plot(self):
         """Actualiza los límites del gráfico según los parámetros actuales"""
@@ -168,12 +272,14 @@ class SimuladorMisiles:
         self.simulacion_activa = False
         self.intercepcion = False
         self.impacto_enemigo = False
+        self.resultado_simulacion = None
+        self.indice_frame = -1
+        self.simulacion_terminada = False
+        self.programador = None
         
-        # Limpiar gráfico
-        self.linea_enemigo.set_data([], [])
-        self.linea_misil.set_data([], [])
-        self.punto_enemigo.set_data([], [])
-        self.punto_misil.set_data([], [])
+        # Limpiar gráfico y reservar los buffers para el vuelo completo
+        self.renderizador.limpiar()
+        self.renderizador.preparar(self.tiempo_vuelo_enemigo, self.incremento_tiempo)
         
         # Dibujar posiciones estáticas
         self.inicio_enemigo.set_data([self.distancia_defensa], [self.altura_enemigo])
@@ -182,178 +288,496 @@ class SimuladorMisiles:
         
         self.etiqueta_info.config(text="Simulación reiniciada")
         self.lienzo.draw_idle()
+        self.actualizar_mapa_viabilidad()
+        self.actualizar_edicion()
         
         # Configurar estado de los botones
         self.boton_iniciar.config(state=tk.NORMAL)
         self.boton_detener.config(state=tk.DISABLED)
     
+    def programar_vista_previa(self):
+        """
+        Agrupa las pulsaciones seguidas: la vista previa se actualiza cuando
+        se deja de teclear durante RETARDO_VISTA_PREVIA
+        """
+        if self.id_vista_previa is not None:
+            self.root.after_cancel(self.id_vista_previa)
+        self.id_vista_previa = self.root.after(RETARDO_VISTA_PREVIA, self.actualizar_edicion)
+    
+    def actualizar_edicion(self):
+        """Refresca lo que depende de los parámetros escritos"""
+        self.actualizar_vista_previa()
+        self.actualizar_planificacion()
+    
+    def leer_parametros_entradas(self):
+        """
+        Parámetros escritos en las entradas aunque aún no se hayan confirmado,
+        o None si alguno todavía no es válido
+        """
+        try:
+            altura = float(self.entrada_altura.get())
+            distancia = float(self.entrada_distancia.get())
+            velocidad = float(self.entrada_velocidad.get())
+            angulo = float(self.entrada_angulo.get())
+            delay = float(self.entrada_delay.get())
+        except ValueError:
+            return None
+        
+        if not (MIN_ALTURA <= altura <= MAX_ALTURA and distancia > 0 and MIN_VELOCIDAD <= velocidad <= MAX_VELOCIDAD
+                and MIN_ANGULO <= angulo <= MAX_ANGULO and delay >= 0):
+            return None
+        return altura, distancia, velocidad, angulo, delay
+    
+    def actualizar_vista_previa(self):
+        """Dibuja las trayectorias previstas para los parámetros escritos"""
+        self.id_vista_previa = None
+        if not self.variable_vista_previa.get() or self.simulacion_activa:
+            return
+        
+        # Un juego de parámetros ya dibujado no vuelve a redibujarse
+        parametros = self.leer_parametros_entradas()
+        if parametros is None or parametros == self.clave_vista_previa:
+            return
+        self.clave_vista_previa = parametros
+        
+        altura, distancia = parametros[:2]
+        vista = self.cache_vista_previa.obtener(*parametros)
+        self.prevision_enemigo.set_data(vista.enemigo_x, vista.enemigo_y)
+        self.prevision_misil.set_data(vista.misil_x, vista.misil_y)
+        self.prevision_acercamiento.set_data([vista.acercamiento_x], [vista.acercamiento_y])
+        self.ejes.set_xlim(-5, distancia + 5)
+        self.ejes.set_ylim(-0.5, altura + 2)
+        
+        self.etiqueta_info.config(
+            text=f"Vista previa: acercamiento mínimo de {vista.distancia_minima:.3f} km "
+                 f"a los {vista.tiempo_minimo:.2f} s"
+        )
+        self.lienzo.draw_idle()
+    
+    def alternar_vista_previa(self):
+        """Muestra u oculta la vista previa"""
+        self.clave_vista_previa = None
+        if self.variable_vista_previa.get():
+            self.actualizar_vista_previa()
+        else:
+            for artista in (self.prevision_enemigo, self.prevision_misil, self.prevision_acercamiento):
+                artista.set_data([], [])
+            self.lienzo.draw_idle()
+    
+    def actualizar_planificacion(self):
+        """Resuelve el plan de lanzamiento del objetivo elegido para los parámetros escritos"""
+        # La planificación usa scipy.optimize: mientras se precarga se
+        # reintenta más tarde en lugar de bloquear la interfaz esperándola
+        if self.hilo_precarga is not None and self.hilo_precarga.is_alive():
+            self.root.after(RETARDO_VISTA_PREVIA, self.actualizar_planificacion)
+            return
+        
+        parametros = self.leer_parametros_entradas()
+        if parametros is None:
+            return
+        altura, distancia = parametros[:2]
+        objetivo = objetivo_seleccionado(self.variable_objetivo)
+        if (altura, distancia, objetivo) == self.clave_planificacion:
+            return
+
+        # La clave solo se guarda con un plan calculado para ella, así que un
+        # fallo no deja un plan anterior asociado a los parámetros nuevos
+        self.plan_lanzamiento = None
+        self.clave_planificacion = None
+        try:
+            plan = planificar_lanzamiento(altura, distancia, MIN_VELOCIDAD, MAX_VELOCIDAD, objetivo)
+        except Exception as error:
+            self.etiqueta_planificacion.config(text=f"Error en la planificación: {str(error)}")
+            return
+        self.plan_lanzamiento = plan
+        self.clave_planificacion = (altura, distancia, objetivo)
+        self.etiqueta_planificacion.config(text=formatear_planificacion(plan))
+    
+    def aplicar_planificacion(self):
+        """Aplica el plan de lanzamiento: delay, ángulo y velocidad"""
+        if self.plan_lanzamiento is None or not self.plan_lanzamiento.success:
+            messagebox.showwarning("Planificación", "No hay un plan de lanzamiento viable para los parámetros actuales")
+            return
+        
+        # El plan se resolvió para la altura y distancia escritas, que se confirman con él
+        self.altura_enemigo, self.distancia_defensa = self.clave_planificacion[:2]
+        self.angulo_misil, self.velocidad_misil, _ = (float(valor) for valor in self.plan_lanzamiento.x)
+        self.delay_lanzamiento = self.plan_lanzamiento.delay
+        for entrada, valor in ((self.entrada_altura, self.altura_enemigo),
+                               (self.entrada_distancia, self.distancia_defensa),
+                               (self.entrada_angulo, self.angulo_misil),
+                               (self.entrada_velocidad, self.velocidad_misil),
+                               (self.entrada_delay, self.delay_lanzamiento)):
+            entrada.delete(0, tk.END)
+            entrada.insert(0, f"{valor:.1f}")
+        
+        self.tiempo_vuelo_enemigo = calcular_tiempo_vuelo_enemigo(self.altura_enemigo)
+        self.actualizar_limites_plot()
+        self.reiniciar_simulacion()
+        self.etiqueta_info.config(text=f"Plan aplicado: {formatear_planificacion(self.plan_lanzamiento)}")
+    
     def iniciar_simulacion(self):
         """Inicia la simulación de la trayectoria de los misiles"""
         if not self.simulacion_activa:
+            # Una simulación que ya terminó se vuelve a reproducir desde el inicio
+            if self.simulacion_terminada:
+                self.reiniciar_simulacion()
+            
+            # Calcular la simulación completa; la animación solo la reproduce
+            if self.resultado_simulacion is None:
+                self.resultado_simulacion = MotorSimulacion(
+                    self.altura_enemigo,
+                    self.distancia_defensa,
+                    self.velocidad_misil,
+                    self.angulo_misil,
+                    self.delay_lanzamiento,
+                    self.incremento_tiempo
+                ).ejecutar()
+                self.renderizador.cargar(self.resultado_simulacion)
+                self.programador = ProgramadorReproduccion(
+                    self.resultado_simulacion.tiempos,
+                    self.resultado_simulacion.tiempo_final,
+                    self.factor_reproduccion
+                )
+            
             self.simulacion_activa = True
+            self.programador.iniciar()
             self.boton_iniciar.config(state=tk.DISABLED)
             self.boton_detener.config(state=tk.NORMAL)
             
-            # Configurar animación
+            # Configurar animación (con blitting solo se redibujan las trayectorias)
+            from matplotlib.animation import FuncAnimation
+            self.medidor_frames.reiniciar()
             self.anim = FuncAnimation(
                 self.figura, 
                 self.animar, 
                 frames=None,
+                init_func=self.iniciar_frame,
                 interval=INTERVALO_ANIMACION, 
-                blit=False, 
+                blit=USAR_BLIT, 
                 repeat=False,
                 cache_frame_data=False  
             )
             self.lienzo.draw()
     
+    def cambiar_velocidad_reproduccion(self, factor):
+        """Cambia la velocidad de reproducción, también durante la animación"""
+        self.factor_reproduccion = factor
+        if self.programador is not None:
+            self.programador.cambiar_factor(factor)
+    
+    def iniciar_frame(self):
+        """Estado inicial de la animación (también al reanudarla)"""
+        if self.indice_frame < 0:
+            return self.renderizador.limpiar()
+        return self.renderizador.actualizar(self.indice_frame + 1)
+    
     def detener_simulacion(self):
         """Detiene la simulación en curso"""
         if self.simulacion_activa:
             self.simulacion_activa = False
+            self.programador.pausar()
             if self.anim and self.anim.event_source:
                 self.anim.event_source.stop()
+            self.medidor_frames.reiniciar()
+            
+            # Conservar el último frame en los redibujados completos
+            self.renderizador.finalizar()
+            self.lienzo.draw_idle()
             
             # Guardar resultado en el historial
             if self.intercepcion:
-                resultado = f"Interceptado a {self.tiempo:.1f}s y {self.enemigo_y[-1]:.2f} km"
+                self.guardar_en_historial(RESULTADO_INTERCEPCION, self.enemigo_y[-1])
             elif self.impacto_enemigo:
-                resultado = "Impacto en ciudad"
+                self.guardar_en_historial(RESULTADO_IMPACTO)
+            elif self.simulacion_terminada:
+                self.guardar_en_historial(self.resultado_simulacion.resultado)
             else:
-                resultado = "Fallido"
+                self.guardar_en_historial(RESULTADO_EN_CURSO)
             
-            self.guardar_en_historial(resultado)
+            if self.simulacion_terminada and GRABAR_SIMULACIONES:
+                self.grabar_simulacion()
             
             self.boton_iniciar.config(state=tk.NORMAL)
             self.boton_detener.config(state=tk.DISABLED)
     
-    def guardar_en_historial(self, resultado):
+    def guardar_en_historial(self, resultado, altura_intercepcion=None):
         """
         Guarda los datos del lanzamiento actual en el historial
         """
-        valores = (
-            f"{self.altura_enemigo:.1f}",
-            f"{self.distancia_defensa:.1f}",
-            f"{self.velocidad_misil:.1f}",
-            f"{self.angulo_misil:.1f}",
-            f"{self.delay_lanzamiento:.1f}",
-            resultado
+        self.historial.agregar(
+            self.altura_enemigo,
+            self.distancia_defensa,
+            self.velocidad_misil,
+            self.angulo_misil,
+            self.delay_lanzamiento,
+            resultado,
+            self.tiempo,
+            altura_intercepcion
         )
-        # Insertar al inicio de la tabla
-        self.tabla_historial.insert('', 0, values=valores)
+        # La escritura y el refresco de la tabla se agrupan
+        self.tabla_historial.programar_refresco()
     
-    def calcular_parametros_optimos(self):
-        """Calcula los parámetros óptimos para interceptar el misil enemigo"""
+    def grabar_simulacion(self):
+        """Guarda las trayectorias de la simulación terminada para reproducirlas"""
         try:
-            # Obtener resultado de la optimización usando el delay actual
-            resultado = encontrar_parametros_optimos(
+            guardar_grabacion(
+                self.resultado_simulacion,
                 self.altura_enemigo,
                 self.distancia_defensa,
+                self.velocidad_misil,
+                self.angulo_misil,
+                self.delay_lanzamiento,
+                self.incremento_tiempo
+            )
+        except OSError as error:
+            messagebox.showwarning("Grabación", f"No se pudo guardar la grabación: {str(error)}")
+    
+    def calcular_parametros_optimos(self):
+        """
+        Calcula los parámetros óptimos en segundo plano; si ya hay un cálculo
+        en curso, el botón lo cancela
+        """
+        if self.trabajador_optimizacion.en_curso:
+            self.trabajador_optimizacion.cancelar()
+            self.boton_calcular.config(text=TEXTO_BOTON_CALCULAR)
+            self.etiqueta_info.config(text="Cálculo de parámetros óptimos cancelado")
+            return
+        
+        # Guardar las entradas para descartar el resultado si cambian antes de que llegue
+        entradas = (self.altura_enemigo, self.distancia_defensa, self.delay_lanzamiento)
+        metodo = metodo_seleccionado(self.variable_metodo)
+        
+        self.boton_calcular.config(text="Cancelar")
+        self.etiqueta_info.config(text="Calculando parámetros óptimos...")
+        self.trabajador_optimizacion.lanzar(
+            self.resolver_parametros_optimos,
+            entradas + (metodo,),
+            al_terminar=lambda resultado: self.aplicar_parametros_optimos(resultado, entradas),
+            al_fallar=self.error_parametros_optimos,
+            al_progresar=lambda segundos: self.etiqueta_info.config(
+                text=f"Calculando parámetros óptimos... {segundos:.1f} s"
+            )
+        )
+    
+    def resolver_parametros_optimos(self, altura_enemigo, distancia_defensa, delay_lanzamiento,
+                                    metodo='analitico', cancelacion=None):
+        """
+        Obtiene los parámetros óptimos (se ejecuta en el hilo trabajador)
+
+        El multiarranque arranca también desde la solución más cercana de las
+        calculadas en esta sesión (memoria_soluciones).
+        """
+        # Consultar primero la tabla de tiro (precalculada con el método
+        # analítico) y optimizar solo si no sirve
+        resultado = None
+        if self.tabla_tiro is not None and metodo == 'analitico':
+            resultado = self.tabla_tiro.consultar(
+                altura_enemigo,
+                distancia_defensa,
                 MIN_VELOCIDAD,
                 MAX_VELOCIDAD,
-                self.delay_lanzamiento
+                delay_lanzamiento
             )
-            
-            if resultado.success and resultado.fun < UMBRAL_INTERCEPCION:
-                # Extraer los valores optimizados
-                angulo_opt, vel_opt, tiempo_opt = resultado.x
-                
-                # Actualizar los campos de entrada directamente
-                self.entrada_angulo.delete(0, tk.END)
-                self.entrada_angulo.insert(0, f"{angulo_opt:.1f}")
-                
-                self.entrada_velocidad.delete(0, tk.END)
-                self.entrada_velocidad.insert(0, f"{vel_opt:.1f}")
-                
-                # Actualizar los valores internos
-                self.angulo_misil = angulo_opt
-                self.velocidad_misil = vel_opt
-                
-                # Calcular altura de interceptación
-                altura_intercepcion = calcular_posicion_enemigo(self.altura_enemigo, tiempo_opt)
-                
-                # Mostrar resultados
-                mostrar_valores_optimos(resultado, tiempo_opt, altura_intercepcion)
-                
-                self.etiqueta_info.config(
-                    text=f"Parámetros óptimos calculados (delay={self.delay_lanzamiento:.1f}s)"
-                )
-                return True
-            else:
-                messagebox.showwarning(
-                    "Optimización", 
-                    "No se encontró una solución viable con los parámetros actuales"
+        
+        # Obtener resultado de la optimización usando el delay actual
+        if resultado is None:
+            with self.instrumentacion.medir(METRICA_OPTIMIZADOR):
+                resultado = self.cache_optimizacion.encontrar_parametros_optimos(
+                    altura_enemigo,
+                    distancia_defensa,
+                    MIN_VELOCIDAD,
+                    MAX_VELOCIDAD,
+                    delay_lanzamiento,
+                    metodo=metodo,
+                    memoria=self.memoria_soluciones,
+                    cancelacion=cancelacion
                 )
-                return False
-                
-        except Exception as e:
-            messagebox.showerror(
-                "Error", 
-                f"Error al calcular parámetros óptimos: {str(e)}"
+            self.instrumentacion.registrar(METRICA_NFEV, resultado.get("nfev", 0))
+            self.instrumentacion.registrar(METRICA_CACHE, self.cache_optimizacion.tasa_aciertos)
+        return resultado
+    
+    def aplicar_parametros_optimos(self, resultado, entradas):
+        """Aplica en la interfaz el resultado de la optimización"""
+        self.boton_calcular.config(text=TEXTO_BOTON_CALCULAR)
+        
+        # Descartar resultados calculados para otras entradas
+        if entradas != (self.altura_enemigo, self.distancia_defensa, self.delay_lanzamiento):
+            self.etiqueta_info.config(
+                text="Resultado descartado: los parámetros cambiaron durante el cálculo"
             )
             return False
+        
+        if resultado.success and resultado.fun < UMBRAL_INTERCEPCION:
+            # Extraer los valores optimizados
+            angulo_opt, vel_opt, tiempo_opt = resultado.x
+            
+            # Actualizar los campos de entrada directamente
+            self.entrada_angulo.delete(0, tk.END)
+            self.entrada_angulo.insert(0, f"{angulo_opt:.1f}")
+            
+            self.entrada_velocidad.delete(0, tk.END)
+            self.entrada_velocidad.insert(0, f"{vel_opt:.1f}")
+            
+            # Actualizar los valores internos
+            self.angulo_misil = angulo_opt
+            self.velocidad_misil = vel_opt
+            self.actualizar_mapa_viabilidad()
+            
+            # Calcular altura de interceptación
+            altura_intercepcion = calcular_posicion_enemigo(self.altura_enemigo, tiempo_opt)
+            
+            self.etiqueta_info.config(
+                text=f"Parámetros óptimos calculados (delay={self.delay_lanzamiento:.1f}s)"
+            )
+            
+            # Mostrar resultados
+            mostrar_valores_optimos(resultado, tiempo_opt, altura_intercepcion)
+            return True
+        else:
+            self.etiqueta_info.config(text="No se encontró una solución viable")
+            messagebox.showwarning(
+                "Optimización", 
+                "No se encontró una solución viable con los parámetros actuales"
+            )
+            return False
+    
+    def error_parametros_optimos(self, error):
+        """Informa de un error ocurrido en el hilo trabajador"""
+        self.boton_calcular.config(text=TEXTO_BOTON_CALCULAR)
+        self.etiqueta_info.config(text="Error al calcular parámetros óptimos")
+        messagebox.showerror(
+            "Error", 
+            f"Error al calcular parámetros óptimos: {str(error)}"
+        )
+    
+    def abrir_modo_salva(self):
+        """Abre la ventana del modo salva"""
+        from salvo_window import VentanaSalva
+        VentanaSalva(self.root)
+    
+    def abrir_mapa_viabilidad(self):
+        """Abre el mapa de viabilidad, o lo trae al frente si ya está abierto"""
+        if self.ventana_viabilidad is not None:
+            self.ventana_viabilidad.ventana.lift()
+            return
+        
+        def al_cerrar():
+            self.ventana_viabilidad = None
+        
+        from feasibility_window import VentanaViabilidad
+        self.ventana_viabilidad = VentanaViabilidad(self.root, al_cerrar=al_cerrar)
+        self.actualizar_mapa_viabilidad()
+    
+    def actualizar_mapa_viabilidad(self):
+        """Sigue en el mapa de viabilidad los cambios de las entradas"""
+        if self.ventana_viabilidad is not None:
+            self.ventana_viabilidad.actualizar(
+                self.altura_enemigo,
+                self.distancia_defensa,
+                self.delay_lanzamiento,
+                self.angulo_misil,
+                self.velocidad_misil
+            )
+    
+    def abrir_reproduccion(self):
+        """Abre la ventana de reproducción de simulaciones grabadas"""
+        from replay_window import VentanaReproduccion
+        VentanaReproduccion(self.root)
+    
+    def calcular_probabilidad_intercepcion(self):
+        """
+        Estima en segundo plano la probabilidad de intercepción del disparo
+        actual con dispersión; si ya hay un cálculo en curso, lo cancela
+        """
+        if self.trabajador_monte_carlo.en_curso:
+            self.trabajador_monte_carlo.cancelar()
+            self.boton_probabilidad.config(text=TEXTO_BOTON_PROBABILIDAD)
+            self.etiqueta_info.config(text="Análisis de Monte Carlo cancelado")
+            return
+        
+        def al_terminar(resultado):
+            self.boton_probabilidad.config(text=TEXTO_BOTON_PROBABILIDAD)
+            self.etiqueta_info.config(
+                text=f"Probabilidad de interceptación: {resultado.probabilidad:.1%}"
+            )
+            mostrar_probabilidad_intercepcion(resultado)
+        
+        def al_fallar(error):
+            self.boton_probabilidad.config(text=TEXTO_BOTON_PROBABILIDAD)
+            messagebox.showerror("Error", f"Error en el análisis de Monte Carlo: {str(error)}")
+        
+        self.boton_probabilidad.config(text="Cancelar")
+        self.etiqueta_info.config(text="Calculando probabilidad de interceptación...")
+        self.trabajador_monte_carlo.lanzar(
+            estimar_probabilidad_intercepcion,
+            (self.altura_enemigo, self.distancia_defensa, self.velocidad_misil,
+             self.angulo_misil, self.delay_lanzamiento),
+            al_terminar=al_terminar,
+            al_fallar=al_fallar
+        )
     
     def animar(self, frame):
         """Función para animar la simulación frame por frame"""
+        self.medidor_frames.iniciar_frame()
+        with self.instrumentacion.medir(METRICA_ANIMAR):
+            artistas = self.avanzar_frame()
+        self.medidor_frames.terminar_frame()
+        return artistas
+    
+    def avanzar_frame(self):
+        """Avanza un paso en la reproducción y devuelve los artistas a dibujar"""
         if not self.simulacion_activa:
-            return
-            
-        # Incrementar tiempo
-        self.tiempo += self.incremento_tiempo
+            return self.renderizador.artistas
         
-        # Calcular posición del misil enemigo (caída libre)
-        altura_enemigo = calcular_posicion_enemigo(self.altura_enemigo, self.tiempo)
+        # El paso a mostrar lo marca el reloj real; los intermedios no se dibujan
+        resultado = self.resultado_simulacion
+        ultimo = len(resultado.tiempos) - 1
+        indice = self.programador.indice()
+        if self.indice_frame < ultimo:
+            # El último paso se dibuja siempre antes de anunciar el impacto
+            indice = min(indice, ultimo)
+        if indice <= self.indice_frame:
+            return self.renderizador.artistas
+        self.instrumentacion.registrar(METRICA_PASOS, indice - self.indice_frame)
+        self.indice_frame = indice
         
-        # Verificar si el misil enemigo impactó el suelo
-        if validar_impacto_suelo(altura_enemigo) and not self.impacto_enemigo:
+        # El paso del impacto en el suelo no tiene posiciones que dibujar
+        if self.indice_frame >= len(resultado.tiempos):
+            self.tiempo = resultado.tiempo_final
             self.impacto_enemigo = True
+            self.simulacion_terminada = True
             self.etiqueta_info.config(text="¡El misil enemigo impactó en la ciudad!")
             self.detener_simulacion()
-            return
-                
-        self.enemigo_x.append(self.distancia_defensa)
-        self.enemigo_y.append(altura_enemigo)
+            return self.renderizador.artistas
         
-        # Calcular posición del misil antiaéreo
-        misil_x, misil_y = calcular_posicion_misil(
-            self.angulo_misil, 
-            self.velocidad_misil, 
-            self.tiempo,
-            self.delay_lanzamiento
-        )
-            
-        self.misil_x.append(misil_x)
-        self.misil_y.append(misil_y)
-        
-        # Verificar intercepción
-        if not self.intercepcion and not self.impacto_enemigo:
-            dx = self.misil_x[-1] - self.enemigo_x[-1]
-            dy = self.misil_y[-1] - self.enemigo_y[-1]
-            distancia = np.sqrt(dx**2 + dy**2)
-            
-            # Verificar umbral de intercepción y altura mínima
-            if distancia < UMBRAL_INTERCEPCION:
-                if validar_altura_intercepcion(self.enemigo_y[-1]):
-                    self.intercepcion = True
-                    self.etiqueta_info.config(
-                        text=f"¡Intercepción exitosa a {self.enemigo_y[-1]:.2f} km de altura y {self.tiempo:.2f} segundos!"
-                    )
-                else:
-                    self.etiqueta_info.config(
-                        text="Intercepción fallida: altura demasiado baja (< 0.1 km)"
-                    )
-                    self.detener_simulacion()
-        
-        # Actualizar datos del gráfico
-        self.linea_enemigo.set_data(self.enemigo_x, self.enemigo_y)
-        self.linea_misil.set_data(self.misil_x, self.misil_y)
-        self.punto_enemigo.set_data([self.enemigo_x[-1]], [self.enemigo_y[-1]])
-        self.punto_misil.set_data([self.misil_x[-1]], [self.misil_y[-1]])
-        
-        # Detener simulación si ambos misiles están en el suelo o si hay intercepción
-        if (self.impacto_enemigo and self.misil_y[-1] <= 0) or self.intercepcion:
-            if not self.intercepcion and self.impacto_enemigo:
-                self.etiqueta_info.config(text="Simulación terminada. La intercepción falló.")
+        fin = self.indice_frame + 1
+        self.tiempo = resultado.tiempos[self.indice_frame]
+        self.enemigo_x = resultado.enemigo_x[:fin]
+        self.enemigo_y = resultado.enemigo_y[:fin]
+        self.misil_x = resultado.misil_x[:fin]
+        self.misil_y = resultado.misil_y[:fin]
+        
+        # El último paso registrado contiene el evento de intercepción, si lo hubo
+        if fin == len(resultado.tiempos):
+            if resultado.resultado == RESULTADO_INTERCEPCION:
+                self.intercepcion = True
+                self.simulacion_terminada = True
+                self.etiqueta_info.config(
+                    text=f"¡Intercepción exitosa a {self.enemigo_y[-1]:.2f} km de altura y {self.tiempo:.2f} segundos!"
+                )
+            elif resultado.resultado == RESULTADO_ALTURA_INSUFICIENTE:
+                self.simulacion_terminada = True
+                self.etiqueta_info.config(
+                    text="Intercepción fallida: altura demasiado baja (< 0.1 km)"
+                )
+                self.detener_simulacion()
+        
+        # Actualizar datos del gráfico con vistas de los buffers
+        artistas = self.renderizador.actualizar(fin)
+        
+        # Detener simulación si hay intercepción
+        if self.intercepcion:
             self.detener_simulacion()
         
-        return (self.linea_enemigo, self.linea_misil, 
-                self.punto_enemigo, self.punto_misil)
\ No newline at end of file
+        return artistas
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Probabilidad de intercepción por Monte Carlo
+
+Perturba la velocidad, el ángulo y el delay realmente logrados y la altura del
+enemigo con dispersión normal, y evalúa el acercamiento mínimo exacto de cada
+muestra en arrays NumPy por bloques de tamaño acotado. La probabilidad se
+informa con su intervalo de confianza de Wilson. Los bloques usan semillas
+derivadas de una misma SeedSequence, así que el resultado no depende de
+cuántos procesos se empleen.
+
+Uso:
+    python monte_carlo.py 10 50 2.5 10.6 3 --muestras 5000000 --procesos 4
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+import numpy as np
+from config import (UMBRAL_INTERCEPCION, SIGMA_VELOCIDAD, SIGMA_ANGULO, SIGMA_DELAY, SIGMA_ALTURA,
+                    MUESTRAS_MONTE_CARLO, TAMANO_BLOQUE_MONTE_CARLO)
+from physics import calcular_posicion_enemigo_lote
+from optimizer import validar_altura_intercepcion, comprobar_cancelacion
+from collision import calcular_acercamiento_minimo
+
+@dataclass
+class ResultadoMonteCarlo:
+    """Estimación de la probabilidad de intercepción"""
+    probabilidad: float
+    intervalo: tuple
+    intercepciones: int
+    muestras: int
+    distancia_media: float
+    confianza: float
+
+def evaluar_bloque(altura, distancia, velocidad, angulo, delay, muestras, sigmas, semilla):
+    """
+    Evalúa un bloque de disparos perturbados.
+    Devuelve (intercepciones, suma de distancias mínimas finitas, muestras finitas).
+    """
+    generador = np.random.default_rng(semilla)
+    sigma_velocidad, sigma_angulo, sigma_delay, sigma_altura = sigmas
+
+    velocidades = np.abs(generador.normal(velocidad, sigma_velocidad, muestras))
+    angulos = generador.normal(angulo, sigma_angulo, muestras)
+    delays = np.maximum(generador.normal(delay, sigma_delay, muestras), 0)
+    alturas = np.maximum(generador.normal(altura, sigma_altura, muestras), 1e-6)
+
+    distancias, tiempos = calcular_acercamiento_minimo(
+        alturas, distancia, angulos, velocidades, delays, 0.0, np.inf
+    )
+    alturas_intercepcion = calcular_posicion_enemigo_lote(alturas, np.nan_to_num(tiempos))
+    exitos = (distancias < UMBRAL_INTERCEPCION) & validar_altura_intercepcion(alturas_intercepcion)
+
+    finitas = np.isfinite(distancias)
+    return int(np.count_nonzero(exitos)), float(distancias[finitas].sum()), int(np.count_nonzero(finitas))
+
+def intervalo_wilson(exitos, muestras, confianza=0.95):
+    """Intervalo de confianza de Wilson para una proporción"""
+    if muestras == 0:
+        return (0.0, 1.0)
+
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+    p = exitos / muestras
+    denominador = 1 + z**2 / muestras
+    centro = (p + z**2 / (2 * muestras)) / denominador
+    margen = z * np.sqrt(p * (1 - p) / muestras + z**2 / (4 * muestras**2)) / denominador
+    return (max(0.0, centro - margen), min(1.0, centro + margen))
+
+def estimar_probabilidad_intercepcion(altura, distancia, velocidad, angulo, delay,
+                                      muestras=MUESTRAS_MONTE_CARLO,
+                                      sigmas=(SIGMA_VELOCIDAD, SIGMA_ANGULO, SIGMA_DELAY, SIGMA_ALTURA),
+                                      tamano_bloque=TAMANO_BLOQUE_MONTE_CARLO, procesos=1,
+                                      semilla=None, confianza=0.95, cancelacion=None):
+    """
+    Estima P(intercepción) de un disparo con dispersión.
+
+    Las muestras se reparten en bloques de a lo sumo tamano_bloque para acotar
+    la memoria; con procesos > 1 los bloques se evalúan en un ProcessPoolExecutor.
+    cancelacion (threading.Event) se comprueba entre bloques y detiene el
+    cálculo con CalculoCancelado.
+    """
+    tamanos = [tamano_bloque] * (muestras // tamano_bloque)
+    if muestras % tamano_bloque:
+        tamanos.append(muestras % tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+
+    argumentos = [
+        (altura, distancia, velocidad, angulo, delay, tamano, sigmas, semilla_bloque)
+        for tamano, semilla_bloque in zip(tamanos, semillas)
+    ]
+
+    parciales = []
+    if procesos > 1 and len(argumentos) > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [ejecutor.submit(evaluar_bloque, *args) for args in argumentos]
+            for futuro in futuros:
+                if cancelacion is not None and cancelacion.is_set():
+                    ejecutor.shutdown(cancel_futures=True)
+                    comprobar_cancelacion(cancelacion)
+                parciales.append(futuro.result())
+    else:
+        for args in argumentos:
+            comprobar_cancelacion(cancelacion)
+            parciales.append(evaluar_bloque(*args))
+
+    intercepciones = sum(parcial[0] for parcial in parciales)
+    suma_distancias = sum(parcial[1] for parcial in parciales)
+    finitas = sum(parcial[2] for parcial in parciales)
+
+    return ResultadoMonteCarlo(
+        probabilidad=intercepciones / muestras if muestras else 0.0,
+        intervalo=intervalo_wilson(intercepciones, muestras, confianza),
+        intercepciones=intercepciones,
+        muestras=muestras,
+        distancia_media=suma_distancias / finitas if finitas else float('inf'),
+        confianza=confianza
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Probabilidad de intercepción por Monte Carlo")
+    parser.add_argument("altura", type=float, help="Altura del misil enemigo (km)")
+    parser.add_argument("distancia", type=float, help="Distancia horizontal (km)")
+    parser.add_argument("velocidad", type=float, help="Velocidad del misil (km/s)")
+    parser.add_argument("angulo", type=float, help="Ángulo de lanzamiento (°)")
+    parser.add_argument("delay", type=float, help="Delay de lanzamiento (s)")
+    parser.add_argument("--muestras", type=int, default=MUESTRAS_MONTE_CARLO)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE_MONTE_CARLO)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--sigma-velocidad", type=float, default=SIGMA_VELOCIDAD)
+    parser.add_argument("--sigma-angulo", type=float, default=SIGMA_ANGULO)
+    parser.add_argument("--sigma-delay", type=float, default=SIGMA_DELAY)
+    parser.add_argument("--sigma-altura", type=float, default=SIGMA_ALTURA)
+    args = parser.parse_args()
+
+    resultado = estimar_probabilidad_intercepcion(
+        args.altura, args.distancia, args.velocidad, args.angulo, args.delay,
+        muestras=args.muestras,
+        sigmas=(args.sigma_velocidad, args.sigma_angulo, args.sigma_delay, args.sigma_altura),
+        tamano_bloque=args.tamano_bloque,
+        procesos=args.procesos,
+        semilla=args.semilla
+    )
+    inferior, superior = resultado.intervalo
+    print(f"P(intercepción) = {resultado.probabilidad:.4f} "
+          f"[{inferior:.4f}, {superior:.4f}] al {resultado.confianza:.0%} "
+          f"({resultado.intercepciones}/{resultado.muestras} muestras, "
+          f"distancia mínima media {resultado.distancia_media:.3f} km)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Optimización multiarranque con arranques en caliente
+
+Un solo SLSQP desde un punto fijo puede quedarse en un mínimo local lejos de
+la intercepción. Aquí los arranques salen de un barrido grueso y vectorizado
+de ángulo × velocidad (el acercamiento mínimo exacto en vacío de cada celda,
+quedándose con la mejor celda de cada velocidad para repartirlos a lo largo
+del valle de soluciones), más, si se pasa una MemoriaSoluciones, la solución
+del escenario resuelto más cercano. Cada arranque se refina con SLSQP; desde
+la primera solución de cada cuenca factible se busca después la intercepción
+más temprana, y se informa la mejor junto con el número de cuencas.
+
+Con velocidad libre, las soluciones exactas forman una curva parametrizada
+por el tiempo de intercepción t (calcular_parametros_lanzamiento da el ángulo
+y la velocidad de cada t), así que dos soluciones están en la misma cuenca si
+la curva es factible en todo el tramo de t que las separa. Las soluciones
+aproximadas (dentro del umbral pero fuera de la curva) se unen además si el
+segmento entre ambas no se aleja más que el umbral.
+"""
+
+import threading
+import numpy as np
+from config import (MIN_ALTURA, MAX_ALTURA, MIN_DISTANCIA, MAX_DISTANCIA, MIN_DELAY, MAX_DELAY,
+                    MIN_ANGULO, MAX_ANGULO, UMBRAL_INTERCEPCION, ARRANQUES_MULTIARRANQUE, MALLA_MULTIARRANQUE,
+                    TAMANO_MEMORIA_ARRANQUES)
+from collision import calcular_acercamiento_minimo
+from physics import calcular_trayectorias_lote
+from optimizer import (_optimizar_slsqp, crear_resultado, calcular_parametros_lanzamiento,
+                       calcular_tiempo_limite_intercepcion, comprobar_cancelacion)
+
+# Muestras de la curva de soluciones entre dos soluciones consecutivas
+MUESTRAS_CUENCA = 64
+
+class MemoriaSoluciones:
+    def __init__(self, tamano=TAMANO_MEMORIA_ARRANQUES):
+        """
+        Constructor de la clase MemoriaSoluciones
+
+        Guarda las últimas soluciones factibles (ángulo, velocidad, tiempo)
+        con su escenario (altura, distancia, delay) normalizado a los rangos
+        de config.py, para buscar el más cercano con una sola operación.
+        """
+        self.tamano = tamano
+        self.escenarios = np.empty((0, 3))
+        self.soluciones = np.empty((0, 3))
+        self.escala = np.array([MAX_ALTURA - MIN_ALTURA, MAX_DISTANCIA - MIN_DISTANCIA,
+                                max(MAX_DELAY - MIN_DELAY, 1.0)])
+        self.cerrojo = threading.Lock()
+
+    def registrar(self, altura_enemigo, distancia_enemigo, delay, solucion):
+        """Añade una solución; las más antiguas se descartan al superar el tamaño"""
+        escenario = np.array([altura_enemigo, distancia_enemigo, delay]) / self.escala
+        with self.cerrojo:
+            self.escenarios = np.vstack([self.escenarios, escenario])[-self.tamano:]
+            self.soluciones = np.vstack([self.soluciones, np.asarray(solucion, dtype=float)])[-self.tamano:]
+
+    def mas_cercana(self, altura_enemigo, distancia_enemigo, delay):
+        """Solución del escenario guardado más cercano, o None si no hay ninguno"""
+        escenario = np.array([altura_enemigo, distancia_enemigo, delay]) / self.escala
+        with self.cerrojo:
+            if not len(self.escenarios):
+                return None
+            indice = np.argmin(np.sum((self.escenarios - escenario)**2, axis=1))
+            return self.soluciones[indice].copy()
+
+    def limpiar(self):
+        with self.cerrojo:
+            self.escenarios = np.empty((0, 3))
+            self.soluciones = np.empty((0, 3))
+
+def escanear_arranques(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay,
+                       n_arranques=ARRANQUES_MULTIARRANQUE, malla=MALLA_MULTIARRANQUE):
+    """
+    Puntos de arranque (ángulo, velocidad, tiempo) sobre una malla gruesa, del
+    más prometedor al menos. Solo se consideran acercamientos en vuelo y por
+    encima de la altura mínima.
+
+    Las soluciones exactas forman un único valle que cruza las velocidades,
+    así que los mínimos locales estrictos de la malla suelen ser uno solo. Se
+    toma en cambio la mejor celda de cada velocidad y, si sobran, se eligen
+    filas repartidas por igual entre la mínima y la máxima.
+    """
+    n_angulos, n_velocidades = malla
+    paso = (MAX_ANGULO - MIN_ANGULO) / n_angulos
+    angulos = np.linspace(MIN_ANGULO + paso / 2, MAX_ANGULO - paso / 2, n_angulos)
+    velocidades = np.linspace(min_velocidad, max_velocidad, n_velocidades)
+    tiempo_limite = calcular_tiempo_limite_intercepcion(altura_enemigo)
+
+    distancia, tiempo = calcular_acercamiento_minimo(
+        altura_enemigo, distancia_enemigo, angulos[None, :], velocidades[:, None], delay, delay, tiempo_limite
+    )
+
+    distancia = np.where(np.isfinite(distancia), distancia, np.inf)
+    filas = np.arange(n_velocidades)
+    columnas = np.argmin(distancia, axis=1)
+    validas = np.isfinite(distancia[filas, columnas])
+    filas, columnas = filas[validas], columnas[validas]
+    if len(filas) > n_arranques:
+        repartidas = np.unique(np.round(np.linspace(0, len(filas) - 1, n_arranques)).astype(int))
+        filas, columnas = filas[repartidas], columnas[repartidas]
+    orden = np.argsort(distancia[filas, columnas])
+
+    return [
+        (float(angulos[j]), float(velocidades[i]), float(tiempo[i, j]))
+        for i, j in zip(filas[orden], columnas[orden])
+    ]
+
+def tramo_factible(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay, t_inicio, t_fin):
+    """Si la curva de soluciones exactas es factible en todo [t_inicio, t_fin]"""
+    tiempos = np.linspace(t_inicio, t_fin, MUESTRAS_CUENCA)
+    angulo, velocidad = calcular_parametros_lanzamiento(altura_enemigo, distancia_enemigo, delay, tiempos)
+    tolerancia = 1e-6
+    return bool(np.all(
+        (angulo >= MIN_ANGULO - tolerancia) & (angulo <= MAX_ANGULO + tolerancia)
+        & (velocidad >= min_velocidad - tolerancia) & (velocidad <= max_velocidad + tolerancia)
+        & (tiempos <= calcular_tiempo_limite_intercepcion(altura_enemigo) + tolerancia)
+    ))
+
+def segmento_factible(altura_enemigo, distancia_enemigo, delay, solucion_a, solucion_b):
+    """Si la separación se mantiene bajo el umbral en el segmento entre dos soluciones"""
+    fracciones = np.linspace(0, 1, MUESTRAS_CUENCA)[:, None]
+    angulo, velocidad, tiempo = (solucion_a + fracciones * (solucion_b - solucion_a)).T
+    *_, distancia = calcular_trayectorias_lote(altura_enemigo, distancia_enemigo, angulo, velocidad, delay, tiempo)
+    return bool(np.all(distancia < UMBRAL_INTERCEPCION))
+
+def agrupar_cuencas(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay, soluciones):
+    """
+    Agrupa por cuenca factible las soluciones (ángulo, velocidad, tiempo),
+    uniendo las consecutivas en tiempo de intercepción. Cada grupo queda
+    ordenado por tiempo.
+    """
+    cuencas = []
+    for solucion in sorted((np.asarray(s, dtype=float) for s in soluciones), key=lambda x: x[2]):
+        anterior = cuencas[-1][-1] if cuencas else None
+        if anterior is not None and (
+                tramo_factible(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay,
+                               anterior[2], solucion[2])
+                or segmento_factible(altura_enemigo, distancia_enemigo, delay, anterior, solucion)):
+            cuencas[-1].append(solucion)
+        else:
+            cuencas.append([solucion])
+    return cuencas
+
+def optimizar_multiarranque(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay,
+                            n_arranques=ARRANQUES_MULTIARRANQUE, memoria=None, ejecutor=None, cancelacion=None):
+    """
+    Refina con SLSQP los arranques del barrido grueso (y el de la solución más
+    cercana de la memoria, si se pasa una) minimizando la distancia. Desde la
+    primera solución factible de cada cuenca se minimiza después el tiempo de
+    intercepción sin dejar de interceptar, y se devuelve la más temprana, como
+    en el método analítico; si ninguna es factible, la de menor distancia.
+
+    La memoria solo añade un arranque: el resultado sigue siendo la
+    intercepción más temprana encontrada, aunque con ella puede depender de
+    las llamadas anteriores (la interfaz guarda una por sesión y el barrido
+    una por bloque).
+
+    Con ejecutor (p. ej. un ProcessPoolExecutor) los arranques se resuelven en
+    paralelo; sin él, en serie, que para estos SLSQP de pocos milisegundos
+    suele ser más rápido que repartirlos entre hilos que compiten por el GIL.
+    cancelacion se comprueba en cada iteración de SLSQP y, con ejecutor, al
+    recoger cada arranque.
+    """
+    tiempo_limite = float(calcular_tiempo_limite_intercepcion(altura_enemigo))
+    arranques = escanear_arranques(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay,
+                                   n_arranques)
+    if memoria is not None:
+        previa = memoria.mas_cercana(altura_enemigo, distancia_enemigo, delay)
+        if previa is not None:
+            angulo, velocidad, tiempo = previa
+            arranques.insert(0, (float(angulo), float(np.clip(velocidad, min_velocidad, max_velocidad)),
+                                 float(np.clip(tiempo, delay + 1e-3, tiempo_limite))))
+
+    argumentos = (altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay)
+
+    def resolver(puntos, minimizar_tiempo=False):
+        if ejecutor is None:
+            return [_optimizar_slsqp(*argumentos, x0, minimizar_tiempo, cancelacion) for x0 in puntos]
+        futuros = [ejecutor.submit(_optimizar_slsqp, *argumentos, x0, minimizar_tiempo) for x0 in puntos]
+        resultados = []
+        for futuro in futuros:
+            if cancelacion is not None and cancelacion.is_set():
+                for pendiente in futuros:
+                    pendiente.cancel()
+                comprobar_cancelacion(cancelacion)
+            resultados.append(futuro.result())
+        return resultados
+
+    resultados = resolver(arranques)
+    factibles = [r for r in resultados if r.success and r.fun < UMBRAL_INTERCEPCION]
+    cuencas = agrupar_cuencas(*argumentos, [r.x for r in factibles])
+
+    # Llevar cada cuenca a su intercepción más temprana
+    refinados = resolver([cuenca[0] for cuenca in cuencas], minimizar_tiempo=True)
+    evaluaciones = sum(r.get("nfev", 0) for r in resultados + refinados)
+    refinados = [r for r in refinados if r.success and r.fun < UMBRAL_INTERCEPCION]
+
+    if refinados or factibles:
+        mejor = min(refinados or factibles, key=lambda r: r.x[2])
+        if memoria is not None:
+            memoria.registrar(altura_enemigo, distancia_enemigo, delay, mejor.x)
+    elif resultados:
+        mejor = min(resultados, key=lambda r: r.fun)
+    else:
+        return crear_resultado((np.nan, np.nan, np.nan), np.inf, False, "Sin arranques válidos",
+                               arranques=0, cuencas=0)
+
+    return crear_resultado(
+        mejor.x,
+        mejor.fun,
+        bool(factibles),
+        f"Multiarranque: {len(factibles)} de {len(resultados)} arranques factibles en {len(cuencas)} cuenca(s)",
+        nfev=evaluaciones,
+        arranques=len(resultados),
+        cuencas=len(cuencas)
+    )
@@ -0,0 +1,105 @@
+"""
+Ejecución de optimizaciones en segundo plano para la interfaz Tk
+
+El cálculo corre en un hilo trabajador y el resultado vuelve al hilo de Tk
+mediante una cola sondeada con root.after, de modo que la búsqueda nunca
+bloquea el bucle de eventos ni la animación. Cada tarea lleva un número de
+generación: al cancelar o lanzar otra tarea, los resultados anteriores que
+lleguen tarde se descartan. Además, cada tarea recibe un threading.Event
+(argumento cancelacion) que se activa al cancelarla o reemplazarla; la
+función lo comprueba entre etapas y lanza CalculoCancelado para que el hilo
+termine en lugar de seguir compitiendo por la CPU.
+"""
+
+import queue
+import threading
+import time
+from config import INTERVALO_SONDEO_OPTIMIZACION
+from optimizer import CalculoCancelado
+
+class TrabajadorOptimizacion:
+    def __init__(self, root, intervalo_sondeo=INTERVALO_SONDEO_OPTIMIZACION):
+        """Constructor de la clase TrabajadorOptimizacion"""
+        self.root = root
+        self.intervalo_sondeo = intervalo_sondeo
+        self.cola = queue.Queue()
+        self.generacion = 0
+        self.en_curso = False
+        self.inicio = None
+        self.callbacks = None
+        self.id_sondeo = None
+        self.cancelacion = None
+
+    def lanzar(self, funcion, argumentos, al_terminar, al_fallar=None, al_progresar=None):
+        """
+        Ejecuta funcion(*argumentos, cancelacion=evento) en un hilo trabajador,
+        cancelando antes la tarea anterior si sigue en marcha.
+
+        al_terminar(resultado) y al_fallar(excepcion) se llaman desde el hilo de
+        Tk; al_progresar(segundos) se llama en cada sondeo mientras la tarea sigue.
+        """
+        self.cancelar()
+        self.generacion += 1
+        self.en_curso = True
+        self.inicio = time.perf_counter()
+        self.callbacks = (al_terminar, al_fallar, al_progresar)
+        self.cancelacion = threading.Event()
+
+        hilo = threading.Thread(
+            target=self._ejecutar,
+            args=(self.generacion, funcion, argumentos, self.cancelacion),
+            daemon=True
+        )
+        hilo.start()
+
+        if self.id_sondeo is None:
+            self.id_sondeo = self.root.after(self.intervalo_sondeo, self._sondear)
+
+    def cancelar(self):
+        """
+        Detiene la tarea en curso en su siguiente comprobación; si aun así
+        termina, su resultado se ignorará cuando llegue
+        """
+        if self.cancelacion is not None:
+            self.cancelacion.set()
+            self.cancelacion = None
+        self.generacion += 1
+        self.en_curso = False
+        self.callbacks = None
+
+    def _ejecutar(self, generacion, funcion, argumentos, cancelacion):
+        """Cuerpo del hilo trabajador"""
+        try:
+            self.cola.put((generacion, funcion(*argumentos, cancelacion=cancelacion), None))
+        except CalculoCancelado:
+            pass
+        except Exception as e:
+            self.cola.put((generacion, None, e))
+
+    def _sondear(self):
+        """Recoge los resultados pendientes desde el hilo de Tk"""
+        self.id_sondeo = None
+
+        while True:
+            try:
+                generacion, resultado, error = self.cola.get_nowait()
+            except queue.Empty:
+                break
+
+            # Resultado de una tarea cancelada o reemplazada
+            if generacion != self.generacion or not self.en_curso:
+                continue
+
+            al_terminar, al_fallar, _ = self.callbacks
+            self.en_curso = False
+            self.callbacks = None
+            if error is None:
+                al_terminar(resultado)
+            elif al_fallar is not None:
+                al_fallar(error)
+
+        if self.en_curso:
+            al_progresar = self.callbacks[2]
+            if al_progresar is not None:
+                al_progresar(time.perf_counter() - self.inicio)
+            self.id_sondeo = self.root.after(self.intervalo_sondeo, self._sondear)
@@ -3,9 +3,10 @@ Optimización de parámetros para la interceptación de misiles
 """
 
 import numpy as np
-from scipy.optimize import minimize
-from physics import calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo, calcular_posicion_misil, calcular_distancia
-from config import GRAVEDAD
+from physics import (calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo, calcular_posicion_misil,
+                     calcular_distancia, calcular_posicion_enemigo_lote)
+from config import (GRAVEDAD, ALTURA_MINIMA_INTERCEPCION, UMBRAL_INTERCEPCION, TOLERANCIA_TIEMPO_MINIMO,
+                    MIN_ANGULO, MAX_ANGULO)
 
 def validar_punto_intercepcion(misil_x, misil_y):
     """
@@ -17,7 +18,7 @@ def validar_altura_intercepcion(altura):
     """
     Valida que la altura de intercepción sea mayor a 0.1km
     """
-    return altura >= 0.1
+    return altura >= ALTURA_MINIMA_INTERCEPCION
 
 def validar_impacto_suelo(altura):
     """
@@ -25,78 +26,330 @@ def validar_impacto_suelo(altura):
     """
     return altura <= 0
 
-def encontrar_parametros_optimos(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay):
+class CalculoCancelado(Exception):
+    """El evento de cancelación de un cálculo en segundo plano se activó"""
+
+def comprobar_cancelacion(cancelacion):
+    """
+    Lanza CalculoCancelado si cancelacion (threading.Event o None) está
+    activado; los cálculos largos la llaman entre etapas
+    """
+    if cancelacion is not None and cancelacion.is_set():
+        raise CalculoCancelado()
+
+class ResultadoOptimizacion(dict):
+    """
+    Diccionario con acceso por atributo, con la misma interfaz que el
+    OptimizeResult de scipy, para no importar scipy.optimize en los métodos
+    que no lo usan
+    """
+
+    def __getattr__(self, nombre):
+        try:
+            return self[nombre]
+        except KeyError as error:
+            raise AttributeError(nombre) from error
+
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+def crear_resultado(x, fun, success, message, **extra):
+    """
+    Construye un resultado con la misma forma que el OptimizeResult de scipy
+    (x, fun, success, message, nfev) para que la interfaz lo consuma igual
+    venga del método que venga
+    """
+    resultado = ResultadoOptimizacion(
+        x=np.asarray(x, dtype=float),
+        fun=float(fun),
+        success=bool(success),
+        message=message,
+        nfev=0
+    )
+    resultado.update(extra)
+    return resultado
+
+def calcular_tiempo_limite_intercepcion(altura_enemigo):
+    """
+    Tiempo en el que el misil enemigo desciende a la altura mínima de intercepción
+    """
+    return np.sqrt(2 * np.maximum(altura_enemigo - ALTURA_MINIMA_INTERCEPCION, 0) / GRAVEDAD)
+
+def resolver_tiempos_intercepcion(altura_enemigo, distancia_enemigo, velocidad, delay):
+    """
+    Resuelve los tiempos de intercepción para una velocidad de lanzamiento fija.
+
+    Ambos misiles comparten la misma gravedad, así que igualar sus posiciones
+    en el instante t deja una cuadrática en t:
+        v² (t - delay)² = D² + (h + g·delay²/2 - g·delay·t)²
+    Devuelve las dos raíces ordenadas (t_menor, t_mayor), NaN donde no hay
+    solución real. Acepta escalares o arrays (con broadcasting).
+    """
+    a = altura_enemigo + 0.5 * GRAVEDAD * delay**2
+    b = GRAVEDAD * delay
+    v2 = velocidad**2
+    
+    coef_a = b**2 - v2
+    coef_b = 2 * (v2 * delay - a * b)
+    coef_c = distancia_enemigo**2 + a**2 - v2 * delay**2
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        discriminante = coef_b**2 - 4 * coef_a * coef_c
+        raiz = np.sqrt(np.where(discriminante >= 0, discriminante, np.nan))
+        t1 = (-coef_b + raiz) / (2 * coef_a)
+        t2 = (-coef_b - raiz) / (2 * coef_a)
+    
+    return np.minimum(t1, t2), np.maximum(t1, t2)
+
+def calcular_parametros_lanzamiento(altura_enemigo, distancia_enemigo, delay, tiempo_intercepcion):
+    """
+    Ángulo (grados) y velocidad que llevan al misil antiaéreo a coincidir con el
+    enemigo en el tiempo de intercepción dado. Acepta escalares o arrays.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tiempo_efectivo = tiempo_intercepcion - delay
+        vx = distancia_enemigo / tiempo_efectivo
+        vy = (altura_enemigo + 0.5 * GRAVEDAD * delay**2 - GRAVEDAD * delay * tiempo_intercepcion) / tiempo_efectivo
+    
+    return np.degrees(np.arctan2(vy, vx)), np.hypot(vx, vy)
+
+def resolver_intercepcion_lote(altura_enemigo, distancia_enemigo, velocidad, delay):
+    """
+    Versión vectorizada de la rama de intercepción más temprana para una
+    velocidad dada. Todos los argumentos admiten broadcasting.
+
+    Devuelve (angulo, tiempo) con NaN en los escenarios sin solución factible.
+    """
+    tiempo_limite = calcular_tiempo_limite_intercepcion(altura_enemigo)
+    angulo_final = np.nan
+    tiempo_final = np.nan
+    
+    # Recorrer primero la raíz mayor para que la menor factible prevalezca
+    for tiempo in reversed(resolver_tiempos_intercepcion(altura_enemigo, distancia_enemigo, velocidad, delay)):
+        angulo, _ = calcular_parametros_lanzamiento(altura_enemigo, distancia_enemigo, delay, tiempo)
+        with np.errstate(invalid='ignore'):
+            factible = ((tiempo > delay) & (tiempo <= tiempo_limite)
+                        & (angulo >= MIN_ANGULO) & (angulo <= MAX_ANGULO))
+        angulo_final = np.where(factible, angulo, angulo_final)
+        tiempo_final = np.where(factible, tiempo, tiempo_final)
+    
+    return angulo_final, tiempo_final
+
+def resolver_intercepcion_analitica(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay):
+    """
+    Calcula todas las ramas de intercepción factibles (ángulo, velocidad, tiempo)
+    resolviendo directamente las ecuaciones de movimiento.
+
+    En la región factible (velocidad vertical positiva) la velocidad necesaria
+    decrece con el tiempo de intercepción, así que las soluciones a velocidad
+    máxima y mínima son los extremos de la familia: la intercepción más temprana
+    (y más alta) y la más tardía. Las ramas se devuelven ordenadas por tiempo.
+    """
+    tiempo_limite = calcular_tiempo_limite_intercepcion(altura_enemigo)
+    ramas = []
+    
+    for velocidad in sorted({max_velocidad, min_velocidad}, reverse=True):
+        for tiempo in resolver_tiempos_intercepcion(altura_enemigo, distancia_enemigo, velocidad, delay):
+            if not (delay < tiempo <= tiempo_limite):
+                continue
+            
+            angulo, _ = calcular_parametros_lanzamiento(
+                altura_enemigo, distancia_enemigo, delay, tiempo
+            )
+            if MIN_ANGULO <= angulo <= MAX_ANGULO:
+                ramas.append((float(angulo), float(velocidad), float(tiempo)))
+    
+    return sorted(ramas, key=lambda rama: rama[2])
+
+def encontrar_parametros_optimos(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay,
+                                 metodo='analitico', fisica='vacio', memoria=None, ejecutor=None,
+                                 cancelacion=None):
     """
     Calcula los parámetros óptimos (ángulo y velocidad) para interceptar el misil enemigo
     considerando un delay fijo de lanzamiento y asegurando intercepción en coordenadas positivas
+
+    metodo='analitico' resuelve las ecuaciones de intercepción de forma directa y
+    solo recurre a SLSQP si no encuentra ninguna rama factible; metodo='slsqp'
+    fuerza la búsqueda numérica y metodo='multiarranque' la repite desde varios
+    arranques (ver multistart.py), arrancando también desde la memoria de
+    soluciones si se pasa una y resolviendo los arranques en el ejecutor si
+    se pasa uno. fisica='arrastre' parte de la solución en vacío y la corrige
+    integrando las trayectorias con arrastre atmosférico.
+
+    cancelacion (threading.Event) detiene la búsqueda numérica con
+    CalculoCancelado en cuanto se activa.
+    """
+    if fisica not in ('vacio', 'arrastre'):
+        raise ValueError(f"Física desconocida: {fisica}")
+
+    resultado = None
+    if metodo == 'analitico':
+        ramas = resolver_intercepcion_analitica(
+            altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay
+        )
+        if ramas:
+            angulo, velocidad, tiempo = ramas[0]
+            misil_x, misil_y = calcular_posicion_misil(angulo, velocidad, tiempo, delay)
+            enemigo_y = calcular_posicion_enemigo(altura_enemigo, tiempo)
+            resultado = crear_resultado(
+                ramas[0],
+                calcular_distancia(misil_x, misil_y, distancia_enemigo, enemigo_y),
+                True,
+                "Solución analítica",
+                ramas=ramas
+            )
+    elif metodo == 'multiarranque':
+        from multistart import optimizar_multiarranque
+        resultado = optimizar_multiarranque(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay,
+                                            memoria=memoria, ejecutor=ejecutor, cancelacion=cancelacion)
+    elif metodo != 'slsqp':
+        raise ValueError(f"Método de optimización desconocido: {metodo}")
+    
+    if resultado is None:
+        resultado = _optimizar_slsqp(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay,
+                                     cancelacion=cancelacion)
+
+    if fisica == 'arrastre':
+        comprobar_cancelacion(cancelacion)
+        return _corregir_arrastre(altura_enemigo, distancia_enemigo, max_velocidad, delay, resultado)
+    return resultado
+
+def _corregir_arrastre(altura_enemigo, distancia_enemigo, max_velocidad, delay, resultado_vacio):
+    """
+    Ajusta el ángulo de la solución en vacío para la física con arrastre.
+
+    El arrastre solo frena al misil, así que se dispara a velocidad máxima y
+    se busca el ángulo de menor distancia de máximo acercamiento.
+    """
+    # drag depende de scipy.integrate; solo se carga si se pide esta física
+    from drag import refinar_intercepcion_arrastre
+    angulo, tiempo, distancia, altura, nfev, nit = refinar_intercepcion_arrastre(
+        altura_enemigo, distancia_enemigo, max_velocidad, delay, float(resultado_vacio.x[0])
+    )
+    exito = distancia < UMBRAL_INTERCEPCION and validar_altura_intercepcion(altura)
+    return crear_resultado(
+        (angulo, max_velocidad, tiempo),
+        distancia,
+        exito,
+        "Solución con arrastre" if exito else "Sin intercepción con arrastre",
+        nfev=nfev,
+        nit=nit
+    )
+
+def _optimizar_slsqp(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay, x0=None,
+                     minimizar_tiempo=False, cancelacion=None):
+    """
+    Búsqueda numérica con SLSQP sobre (ángulo, velocidad, tiempo de intercepción)
+
+    Minimiza el cuadrado de la distancia entre misiles con su jacobiano
+    analítico. La altura mínima de intercepción y que la trayectoria no pase
+    por alturas negativas se expresan como restricciones de desigualdad, de
+    modo que el objetivo es suave en todo el dominio.
+
+    Con minimizar_tiempo se minimiza en cambio el tiempo de intercepción,
+    exigiendo además que la distancia no supere TOLERANCIA_TIEMPO_MINIMO; se
+    usa para llevar a la intercepción más temprana una solución ya factible.
+    cancelacion se comprueba en cada iteración.
     """
     tiempo_vuelo_enemigo = calcular_tiempo_vuelo_enemigo(altura_enemigo)
+    tiempo_limite = calcular_tiempo_limite_intercepcion(altura_enemigo)
+    grados = np.pi / 180
     
-    def objetivo_funcion(params):
+    # Fracciones del vuelo del misil en las que se verifica la trayectoria
+    fracciones = np.linspace(0, 1, 10)[1:]
+    
+    def componentes(params):
         angulo, velocidad, tiempo_intercepcion = params
-        
-        # Validaciones básicas
-        if (tiempo_intercepcion <= delay or 
-            tiempo_intercepcion > tiempo_vuelo_enemigo or
-            velocidad < min_velocidad or 
-            velocidad > max_velocidad):
-            return float('inf')
-        
-        # Posición del misil enemigo en el tiempo de intercepción
-        enemigo_y = calcular_posicion_enemigo(altura_enemigo, tiempo_intercepcion)
-        
-        # Validar si el misil enemigo impactó el suelo
-        if validar_impacto_suelo(enemigo_y):
-            return float('inf')
-            
-        # Validar altura mínima de intercepción
-        if not validar_altura_intercepcion(enemigo_y):
-            return float('inf')
-            
-        # Posición del misil defensor considerando el delay
-        misil_x, misil_y = calcular_posicion_misil(
-            angulo, velocidad, tiempo_intercepcion, delay
-        )
-        
-        # Validar que el punto de intercepción esté en coordenadas positivas
-        if not validar_punto_intercepcion(misil_x, misil_y):
-            return float('inf')
-        
-        # Verificar que la trayectoria no pase por coordenadas negativas
-        # Calculamos algunos puntos intermedios para verificar
-        tiempos_intermedios = np.linspace(delay, tiempo_intercepcion, 10)
-        for t in tiempos_intermedios:
-            x_temp, y_temp = calcular_posicion_misil(angulo, velocidad, t, delay)
-            if not validar_punto_intercepcion(x_temp, y_temp):
-                return float('inf')
-        
-        # Calcular distancia entre misiles
-        distancia = np.sqrt(
-            (misil_x - distancia_enemigo)**2 + 
-            (misil_y - enemigo_y)**2
-        )
-        
-        # Penalizar soluciones cercanas a los límites del espacio positivo
-        if misil_x < 0.1 or misil_y < 0.1:
-            distancia += 100  # Penalización para evitar soluciones muy cercanas a 0
-        
-        return distancia
+        angulo_rad = angulo * grados
+        return np.cos(angulo_rad), np.sin(angulo_rad), velocidad, tiempo_intercepcion - delay
+    
+    def separacion(params):
+        coseno, seno, velocidad, tiempo_efectivo = componentes(params)
+        tiempo_intercepcion = params[2]
+        dx = velocidad * coseno * tiempo_efectivo - distancia_enemigo
+        dy = (velocidad * seno * tiempo_efectivo - 0.5 * GRAVEDAD * tiempo_efectivo**2
+              - calcular_posicion_enemigo_lote(altura_enemigo, tiempo_intercepcion))
+        return dx, dy
+    
+    def objetivo_funcion(params):
+        dx, dy = separacion(params)
+        return dx**2 + dy**2
+    
+    def objetivo_jacobiano(params):
+        coseno, seno, velocidad, tiempo_efectivo = componentes(params)
+        dx, dy = separacion(params)
+        return 2 * np.array([
+            grados * velocidad * tiempo_efectivo * (dy * coseno - dx * seno),
+            tiempo_efectivo * (dx * coseno + dy * seno),
+            dx * velocidad * coseno + dy * (velocidad * seno + GRAVEDAD * delay)
+        ])
+    
+    def objetivo_tiempo(params):
+        return params[2]
+    
+    def objetivo_tiempo_jacobiano(params):
+        return np.array([0.0, 0.0, 1.0])
+    
+    def restriccion_distancia(params):
+        return TOLERANCIA_TIEMPO_MINIMO**2 - objetivo_funcion(params)
+    
+    def restriccion_distancia_jacobiano(params):
+        return -objetivo_jacobiano(params)
+    
+    def restriccion_altura(params):
+        return altura_enemigo - 0.5 * GRAVEDAD * params[2]**2 - ALTURA_MINIMA_INTERCEPCION
+    
+    def restriccion_altura_jacobiano(params):
+        return np.array([0.0, 0.0, -GRAVEDAD * params[2]])
+    
+    def restriccion_trayectoria(params):
+        coseno, seno, velocidad, tiempo_efectivo = componentes(params)
+        tiempos = fracciones * tiempo_efectivo
+        return velocidad * seno * tiempos - 0.5 * GRAVEDAD * tiempos**2
+    
+    def restriccion_trayectoria_jacobiano(params):
+        coseno, seno, velocidad, tiempo_efectivo = componentes(params)
+        tiempos = fracciones * tiempo_efectivo
+        return np.column_stack([
+            grados * velocidad * coseno * tiempos,
+            seno * tiempos,
+            fracciones * (velocidad * seno - GRAVEDAD * tiempos)
+        ])
     
     # Valores iniciales y límites
-    x0 = [45.0, (min_velocidad + max_velocidad)/2, tiempo_vuelo_enemigo/2]
+    if x0 is None:
+        x0 = [45.0, (min_velocidad + max_velocidad)/2, (delay + tiempo_limite)/2]
     bounds = [
-        (0, 90),                    # ángulo
+        (MIN_ANGULO, MAX_ANGULO),   # ángulo
         (min_velocidad, max_velocidad),  # velocidad
-        (delay, tiempo_vuelo_enemigo)    # tiempo de intercepción
+        (delay + 1e-6, tiempo_vuelo_enemigo)    # tiempo de intercepción
     ]
+    restricciones = [
+        {'type': 'ineq', 'fun': restriccion_altura, 'jac': restriccion_altura_jacobiano},
+        {'type': 'ineq', 'fun': restriccion_trayectoria, 'jac': restriccion_trayectoria_jacobiano}
+    ]
+    if minimizar_tiempo:
+        restricciones.append(
+            {'type': 'ineq', 'fun': restriccion_distancia, 'jac': restriccion_distancia_jacobiano}
+        )
     
-    # Realizar optimización
+    # Realizar optimización (scipy.optimize solo se carga al usar este método)
+    from scipy.optimize import minimize
     resultado = minimize(
-        objetivo_funcion, 
+        objetivo_tiempo if minimizar_tiempo else objetivo_funcion, 
         x0,
         method='SLSQP',
+        jac=objetivo_tiempo_jacobiano if minimizar_tiempo else objetivo_jacobiano,
         bounds=bounds,
-        options={'ftol': 1e-6, 'maxiter': 100000}
+        constraints=restricciones,
+        options={'ftol': 1e-12, 'maxiter': 1000},
+        callback=lambda x: comprobar_cancelacion(cancelacion)
     )
     
+    # Reportar la distancia (no su cuadrado) para mantener el significado de fun
+    resultado.fun = float(np.sqrt(objetivo_funcion(resultado.x)))
+    if not restriccion_altura(resultado.x) >= -1e-9:
+        resultado.success = False
+    if minimizar_tiempo and resultado.fun > 2 * TOLERANCIA_TIEMPO_MINIMO:
+        resultado.success = False
     return resultado
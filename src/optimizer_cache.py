@@ -0,0 +1,116 @@
+"""
+Caché LRU de resultados de encontrar_parametros_optimos
+
+Las entradas se indexan por (altura, distancia, velocidad mínima, velocidad
+máxima, delay) cuantizados, de modo que las repeticiones de la interfaz no
+vuelven a optimizar. Solo se guardan los parámetros resueltos, no el
+OptimizeResult completo. Opcionalmente las entradas desalojadas se vuelcan a
+disco (shelve) y se recuperan en ejecuciones posteriores.
+"""
+
+import dbm.dumb
+import os
+import shelve
+import threading
+from collections import OrderedDict
+from config import TAMANO_CACHE_OPTIMIZACION, PASO_CUANTIZACION_CACHE
+from optimizer import encontrar_parametros_optimos, crear_resultado
+
+class CacheOptimizacion:
+    def __init__(self, tamano_maximo=TAMANO_CACHE_OPTIMIZACION, paso_cuantizacion=PASO_CUANTIZACION_CACHE,
+                 ruta_disco=None):
+        """Constructor de la clase CacheOptimizacion"""
+        self.tamano_maximo = tamano_maximo
+        self.paso_cuantizacion = paso_cuantizacion
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.candado = threading.Lock()
+
+        self.disco = None
+        if ruta_disco is not None:
+            if not os.path.isabs(ruta_disco):
+                ruta_disco = os.path.join(os.path.dirname(os.path.abspath(__file__)), ruta_disco)
+            # dbm.dumb funciona desde cualquier hilo (el cálculo corre en un trabajador)
+            self.disco = shelve.Shelf(dbm.dumb.open(ruta_disco, 'c'))
+
+    def clave(self, altura, distancia, min_velocidad, max_velocidad, delay, metodo='analitico', fisica='vacio'):
+        """Clave cuantizada de una consulta"""
+        valores = (altura, distancia, min_velocidad, max_velocidad, delay)
+        return tuple(round(float(valor) / self.paso_cuantizacion) for valor in valores) + (metodo, fisica)
+
+    @property
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def obtener(self, clave):
+        """Devuelve los parámetros guardados (ángulo, velocidad, tiempo, fun, success) o None"""
+        with self.candado:
+            return self._obtener(clave)
+
+    def _obtener(self, clave):
+        if clave in self.entradas:
+            self.entradas.move_to_end(clave)
+            self.aciertos += 1
+            return self.entradas[clave]
+
+        if self.disco is not None and repr(clave) in self.disco:
+            valor = self.disco[repr(clave)]
+            self.aciertos += 1
+            self.aciertos_disco += 1
+            self._guardar(clave, valor)
+            return valor
+
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor):
+        """Inserta una entrada y desaloja la menos usada si se supera el tamaño"""
+        with self.candado:
+            self._guardar(clave, valor)
+
+    def _guardar(self, clave, valor):
+        self.entradas[clave] = valor
+        self.entradas.move_to_end(clave)
+
+        while len(self.entradas) > self.tamano_maximo:
+            clave_antigua, valor_antiguo = self.entradas.popitem(last=False)
+            if self.disco is not None:
+                self.disco[repr(clave_antigua)] = valor_antiguo
+
+    def encontrar_parametros_optimos(self, altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad,
+                                     delay, metodo='analitico', fisica='vacio', memoria=None, cancelacion=None):
+        """
+        Igual que optimizer.encontrar_parametros_optimos, pero reutiliza los
+        resultados de consultas equivalentes. La memoria de soluciones y la
+        cancelación solo se usan al optimizar y no forman parte de la clave.
+        Un cálculo cancelado no se guarda.
+        """
+        clave = self.clave(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay, metodo, fisica)
+        valor = self.obtener(clave)
+
+        if valor is None:
+            resultado = encontrar_parametros_optimos(
+                altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad, delay, metodo=metodo, fisica=fisica,
+                memoria=memoria, cancelacion=cancelacion
+            )
+            angulo, velocidad, tiempo = (float(x) for x in resultado.x)
+            valor = (angulo, velocidad, tiempo, float(resultado.fun), bool(resultado.success))
+            self.guardar(clave, valor)
+            return resultado
+
+        angulo, velocidad, tiempo, fun, success = valor
+        return crear_resultado((angulo, velocidad, tiempo), fun, success, "Resultado en caché")
+
+    def cerrar(self):
+        """Vuelca las entradas en memoria a disco y cierra el almacenamiento"""
+        with self.candado:
+            if self.disco is None:
+                return
+
+            for clave, valor in self.entradas.items():
+                self.disco[repr(clave)] = valor
+            self.disco.close()
+            self.disco = None
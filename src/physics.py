@@ -1,50 +1,137 @@
+"""
+Física de los misiles en vacío
+
+Las funciones de posición y distancia eligen el camino según el tipo de sus
+argumentos: con números de Python (o escalares de NumPy, que heredan de float)
+usan math y devuelven float, sin crear objetos de NumPy en cada llamada; con
+arrays delegan en las versiones _lote, que admiten broadcasting.
+"""
+
+import math
 import numpy as np
 from config import GRAVEDAD
 
+# Tipos que toman el camino escalar (np.float64 hereda de float). Las
+# comprobaciones se escriben en línea porque una función auxiliar costaría
+# tanto como el propio cálculo.
+ESCALARES = (int, float)
+
+def calcular_componentes_velocidad(angulo, velocidad):
+    """
+    Componentes (vx, vy) de la velocidad de lanzamiento. Quien evalúa muchas
+    posiciones del mismo disparo (la simulación paso a paso) las calcula una
+    vez y usa calcular_posicion_misil_componentes
+    """
+    angulo_rad = math.radians(angulo)
+    return velocidad * math.cos(angulo_rad), velocidad * math.sin(angulo_rad)
+
 def calcular_tiempo_vuelo_enemigo(altura):
     """
     Calcula el tiempo de vuelo del misil enemigo hasta el suelo
     usando la ecuación de caída libre: h = 1/2 * g * t²
-    Despejando t 
+    Despejando t
     t = sqrt(2h/g)
     """
+    if isinstance(altura, ESCALARES):
+        return math.sqrt(2 * altura / GRAVEDAD) if altura >= 0 else math.nan
     return np.sqrt(2 * altura / GRAVEDAD)
 
+def calcular_posicion_enemigo_lote(altura_inicial, tiempos):
+    """
+    Versión vectorizada de calcular_posicion_enemigo.
+
+    altura_inicial y tiempos se combinan con broadcasting de NumPy, p. ej.
+    alturas de forma [escenarios, 1] con tiempos de forma [pasos] devuelven
+    un array [escenarios, pasos].
+    """
+    altura_inicial = np.asarray(altura_inicial, dtype=float)
+    tiempos = np.asarray(tiempos, dtype=float)
+
+    y = altura_inicial - 0.5 * GRAVEDAD * tiempos**2
+    return np.maximum(0, y)
+
+def calcular_posicion_misil_lote(angulo, velocidad, tiempos, delay):
+    """
+    Versión vectorizada de calcular_posicion_misil.
+
+    Todos los argumentos admiten broadcasting (parámetros [escenarios, 1] y
+    tiempos [pasos] → posiciones [escenarios, pasos]). Antes del delay el misil
+    permanece en el origen.
+    """
+    angulo_rad = np.radians(np.asarray(angulo, dtype=float))
+    velocidad = np.asarray(velocidad, dtype=float)
+    tiempos = np.asarray(tiempos, dtype=float)
+
+    # Tiempo desde el lanzamiento, nulo mientras el misil espera el delay
+    tiempo_efectivo = np.maximum(tiempos - delay, 0)
+
+    x = velocidad * np.cos(angulo_rad) * tiempo_efectivo
+    y = velocidad * np.sin(angulo_rad) * tiempo_efectivo - 0.5 * GRAVEDAD * tiempo_efectivo**2
+
+    return x, np.maximum(0, y)
+
+def calcular_trayectorias_lote(altura_enemigo, distancia_enemigo, angulo, velocidad, delay, tiempos):
+    """
+    Evalúa en una sola llamada las trayectorias de ambos misiles sobre una
+    malla de tiempos para un lote de escenarios.
+
+    Devuelve (enemigo_x, enemigo_y, misil_x, misil_y, distancia), todos con la
+    forma del broadcasting entre los parámetros y los tiempos.
+    """
+    enemigo_y = calcular_posicion_enemigo_lote(altura_enemigo, tiempos)
+    misil_x, misil_y = calcular_posicion_misil_lote(angulo, velocidad, tiempos, delay)
+
+    # Ajustar todas las salidas a la misma forma
+    distancia_enemigo = np.asarray(distancia_enemigo, dtype=float)
+    forma = np.broadcast_shapes(distancia_enemigo.shape, enemigo_y.shape, misil_x.shape)
+    enemigo_x = np.broadcast_to(distancia_enemigo, forma)
+    enemigo_y = np.broadcast_to(enemigo_y, forma)
+    misil_x = np.broadcast_to(misil_x, forma)
+    misil_y = np.broadcast_to(misil_y, forma)
+
+    distancia = calcular_distancia(misil_x, misil_y, enemigo_x, enemigo_y)
+    return enemigo_x, enemigo_y, misil_x, misil_y, distancia
+
 def calcular_posicion_enemigo(altura_inicial, tiempo):
     """
     Calcula la posición Y del misil enemigo en caída libre
-    
+
     y = h - 1/2 * g * t²  # Ecuación de caída libre
     """
-    y = altura_inicial - 0.5 * GRAVEDAD * (tiempo ** 2)
-    return max(0, y)  # No permitir posiciones negativas
+    if not (isinstance(altura_inicial, ESCALARES) and isinstance(tiempo, ESCALARES)):
+        return calcular_posicion_enemigo_lote(altura_inicial, tiempo)
+    
+    y = altura_inicial - 0.5 * GRAVEDAD * tiempo * tiempo
+    return 0.0 if y < 0 else float(y)
 
 def calcular_posicion_misil(angulo, velocidad, tiempo, delay):
     """
     Calcula la posición del misil antiaéreo según el movimiento parabólico
     """
-    if tiempo < delay:
-        return 0, 0
-        
-    # Asegurar que el ángulo sea float y convertir a radianes
-    tiempo_efectivo = tiempo - delay
-    angulo_rad = np.radians(float(angulo))
-    
-    # Asegurar que velocidad sea float
-    velocidad = float(velocidad)
-    
-    # Calcular componentes de velocidad
-    vx = velocidad * np.cos(angulo_rad)
-    vy = velocidad * np.sin(angulo_rad)
+    if not (isinstance(angulo, ESCALARES) and isinstance(velocidad, ESCALARES)
+            and isinstance(tiempo, ESCALARES) and isinstance(delay, ESCALARES)):
+        return calcular_posicion_misil_lote(angulo, velocidad, tiempo, delay)
     
-    # Calcular posición
-    x = vx * tiempo_efectivo
-    y = vy * tiempo_efectivo - 0.5 * GRAVEDAD * (tiempo_efectivo ** 2)
+    vx, vy = calcular_componentes_velocidad(angulo, velocidad)
+    return calcular_posicion_misil_componentes(vx, vy, tiempo, delay)
+
+def calcular_posicion_misil_componentes(vx, vy, tiempo, delay):
+    """
+    calcular_posicion_misil (camino escalar) a partir de las componentes de
+    la velocidad ya calculadas
+    """
+    tiempo_efectivo = tiempo - delay
+    if tiempo_efectivo < 0:
+        tiempo_efectivo = 0.0
     
-    return x, max(0, y)
+    y = vy * tiempo_efectivo - 0.5 * GRAVEDAD * tiempo_efectivo * tiempo_efectivo
+    return float(vx * tiempo_efectivo), 0.0 if y < 0 else float(y)
 
 def calcular_distancia(x1, y1, x2, y2):
     """
     Calcula la distancia euclidiana entre dos puntos
     """
-    return np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
\ No newline at end of file
+    if (isinstance(x1, ESCALARES) and isinstance(y1, ESCALARES)
+            and isinstance(x2, ESCALARES) and isinstance(y2, ESCALARES)):
+        return math.hypot(x2 - x1, y2 - y1)
+    return np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
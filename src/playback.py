@@ -0,0 +1,74 @@
+"""
+Reproducción de la simulación al ritmo del reloj real
+
+MotorSimulacion ya resuelve todos los pasos (y la detección de intercepción)
+con el incremento completo antes de animar, así que la animación solo tiene
+que decidir qué paso mostrar. ProgramadorReproduccion lo deduce del tiempo
+real transcurrido multiplicado por el factor de velocidad, en lugar de
+avanzar un paso por frame: si el dibujo se retrasa, el siguiente frame salta
+los pasos que no se llegaron a mostrar y el tiempo simulado no se frena.
+"""
+
+import math
+import time
+import numpy as np
+
+class ProgramadorReproduccion:
+    def __init__(self, tiempos, tiempo_final, factor, reloj=time.perf_counter):
+        """
+        Constructor de la clase ProgramadorReproduccion
+
+        tiempos son los instantes simulados de cada paso, tiempo_final el del
+        desenlace y factor los segundos simulados por segundo real
+        (math.inf para mostrar el resultado de inmediato).
+        """
+        self.tiempos = tiempos
+        self.tiempo_final = tiempo_final
+        self.factor = factor
+        self.reloj = reloj
+        self.tiempo_base = 0.0
+        self.inicio = None
+
+    @property
+    def en_marcha(self):
+        return self.inicio is not None
+
+    def tiempo_simulado(self):
+        """Instante simulado que corresponde al reloj real"""
+        if not self.en_marcha:
+            return self.tiempo_base
+        if math.isinf(self.factor):
+            return self.tiempo_final
+        return min(self.tiempo_base + (self.reloj() - self.inicio) * self.factor, self.tiempo_final)
+
+    def iniciar(self, tiempo_simulado=None):
+        """
+        Arranca la reproducción desde el instante simulado dado o, sin él,
+        la reanuda desde donde se pausó
+        """
+        if tiempo_simulado is not None:
+            self.tiempo_base = tiempo_simulado
+        self.inicio = self.reloj()
+
+    def pausar(self):
+        """Congela el tiempo simulado hasta la siguiente llamada a iniciar"""
+        self.tiempo_base = self.tiempo_simulado()
+        self.inicio = None
+
+    def cambiar_factor(self, factor):
+        """Cambia la velocidad sin saltos: el tiempo simulado sigue desde donde estaba"""
+        en_marcha = self.en_marcha
+        self.pausar()
+        self.factor = factor
+        if en_marcha:
+            self.iniciar()
+
+    def indice(self):
+        """
+        Último paso alcanzado por el tiempo simulado: -1 antes del primero y
+        len(tiempos) una vez alcanzado el desenlace tras el último paso
+        """
+        tiempo = self.tiempo_simulado()
+        if tiempo >= self.tiempo_final and (not len(self.tiempos) or self.tiempo_final > self.tiempos[-1]):
+            return len(self.tiempos)
+        return int(np.searchsorted(self.tiempos, tiempo, side='right')) - 1
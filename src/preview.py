@@ -0,0 +1,73 @@
+"""
+Vista previa de las trayectorias mientras se editan los parámetros
+
+Las trayectorias en vacío tienen forma cerrada, así que el recorrido completo
+de ambos misiles y el punto de máximo acercamiento se obtienen con una sola
+evaluación vectorizada, sin simular paso a paso. Las vistas previas se guardan
+por juego de parámetros para que las ediciones rápidas que vuelven a un valor
+ya visto no recalculen nada.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from config import GRAVEDAD, PUNTOS_VISTA_PREVIA, TAMANO_CACHE_VISTA_PREVIA
+from physics import calcular_tiempo_vuelo_enemigo, calcular_trayectorias_lote
+from collision import calcular_acercamiento_minimo
+
+@dataclass
+class VistaPrevia:
+    """
+    Trayectorias previstas hasta el impacto del enemigo y punto de máximo
+    acercamiento. El tramo del misil posterior a su caída queda en NaN.
+    """
+    enemigo_x: np.ndarray
+    enemigo_y: np.ndarray
+    misil_x: np.ndarray
+    misil_y: np.ndarray
+    distancia_minima: float
+    tiempo_minimo: float
+    acercamiento_x: float
+    acercamiento_y: float
+
+def calcular_vista_previa(altura_enemigo, distancia_defensa, velocidad_misil, angulo_misil,
+                          delay_lanzamiento, puntos=PUNTOS_VISTA_PREVIA):
+    """Evalúa la vista previa de un juego de parámetros"""
+    tiempos = np.linspace(0.0, calcular_tiempo_vuelo_enemigo(altura_enemigo), puntos)
+    enemigo_x, enemigo_y, misil_x, misil_y, _ = calcular_trayectorias_lote(
+        altura_enemigo, distancia_defensa, angulo_misil, velocidad_misil, delay_lanzamiento, tiempos
+    )
+
+    # Tras volver al suelo el misil no sigue avanzando
+    duracion_vuelo = 2 * velocidad_misil * np.sin(np.radians(angulo_misil)) / GRAVEDAD
+    en_vuelo = tiempos <= delay_lanzamiento + duracion_vuelo
+    misil_x = np.where(en_vuelo, misil_x, np.nan)
+    misil_y = np.where(en_vuelo, misil_y, np.nan)
+
+    distancia, tiempo = calcular_acercamiento_minimo(
+        altura_enemigo, distancia_defensa, angulo_misil, velocidad_misil, delay_lanzamiento, 0.0, np.inf
+    )
+    distancia, tiempo = float(distancia), float(tiempo)
+    # El punto señalado es el del enemigo, donde ocurriría la intercepción
+    acercamiento_y = altura_enemigo - 0.5 * GRAVEDAD * tiempo**2 if np.isfinite(tiempo) else np.nan
+
+    return VistaPrevia(enemigo_x, enemigo_y, misil_x, misil_y, distancia, tiempo,
+                       float(distancia_defensa), float(acercamiento_y))
+
+class CacheVistaPrevia:
+    def __init__(self, tamano=TAMANO_CACHE_VISTA_PREVIA):
+        """Constructor de la clase CacheVistaPrevia"""
+        self.tamano = tamano
+        self.vistas = OrderedDict()
+
+    def obtener(self, altura_enemigo, distancia_defensa, velocidad_misil, angulo_misil, delay_lanzamiento):
+        """Vista previa de los parámetros, calculada solo si no estaba guardada"""
+        clave = (altura_enemigo, distancia_defensa, velocidad_misil, angulo_misil, delay_lanzamiento)
+        vista = self.vistas.get(clave)
+        if vista is None:
+            vista = self.vistas[clave] = calcular_vista_previa(*clave)
+            if len(self.vistas) > self.tamano:
+                self.vistas.popitem(last=False)
+        else:
+            self.vistas.move_to_end(clave)
+        return vista
@@ -0,0 +1,168 @@
+"""
+Grabación de simulaciones para reproducirlas sin volver a simular
+
+Cada simulación se guarda en un archivo propio con una cabecera pequeña (los
+parámetros del lanzamiento y el desenlace, en JSON) seguida de las columnas
+tiempo, enemigo_x, enemigo_y, misil_x y misil_y como float32 contiguos. El
+archivo se escribe de una vez al terminar la simulación, y tras cada
+escritura se borran las más antiguas por encima de MAX_GRABACIONES.
+
+Al reproducir, las columnas se abren con memory-mapping: solo se leen de disco
+las páginas que se dibujan, y listar las grabaciones lee únicamente las
+cabeceras, así que se pueden revisar cientos de ellas sin cargarlas en memoria.
+"""
+
+import json
+import os
+import struct
+import time
+import numpy as np
+from config import DIRECTORIO_GRABACIONES, MAX_GRABACIONES
+
+MAGIA_GRABACION = b"SIMGRAB1"
+EXTENSION_GRABACION = ".grab"
+COLUMNAS_GRABACION = ("tiempos", "enemigo_x", "enemigo_y", "misil_x", "misil_y")
+ALINEACION_DATOS = 16  # bytes
+
+def resolver_directorio(directorio=DIRECTORIO_GRABACIONES):
+    """Los directorios relativos se interpretan respecto al directorio del simulador"""
+    if os.path.isabs(directorio):
+        return directorio
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), directorio)
+
+def guardar_grabacion(resultado, altura_enemigo, distancia_defensa, velocidad_misil, angulo_misil,
+                      delay_lanzamiento, incremento_tiempo, directorio=DIRECTORIO_GRABACIONES,
+                      max_grabaciones=MAX_GRABACIONES):
+    """
+    Escribe un ResultadoSimulacion con una sola escritura y devuelve la ruta
+    del archivo
+    """
+    directorio = resolver_directorio(directorio)
+    os.makedirs(directorio, exist_ok=True)
+
+    columnas = np.stack([getattr(resultado, columna) for columna in COLUMNAS_GRABACION]).astype(np.float32)
+    fecha = time.time()
+    cabecera = {
+        "fecha": fecha,
+        "altura": float(altura_enemigo),
+        "distancia": float(distancia_defensa),
+        "velocidad": float(velocidad_misil),
+        "angulo": float(angulo_misil),
+        "delay": float(delay_lanzamiento),
+        "incremento_tiempo": float(incremento_tiempo),
+        "resultado": resultado.resultado,
+        "tiempo_final": float(resultado.tiempo_final),
+        "tiempo_intercepcion": resultado.tiempo_intercepcion,
+        "altura_intercepcion": resultado.altura_intercepcion,
+        "pasos": columnas.shape[1]
+    }
+
+    # Magia, longitud de la cabecera y JSON rellenado hasta alinear las columnas
+    texto = json.dumps(cabecera).encode("utf-8")
+    prefijo = len(MAGIA_GRABACION) + 4
+    texto += b" " * (-(prefijo + len(texto)) % ALINEACION_DATOS)
+    contenido = MAGIA_GRABACION + struct.pack("<I", len(texto)) + texto + columnas.tobytes()
+
+    nombre = time.strftime("%Y%m%d_%H%M%S", time.localtime(fecha)) + f"_{int(fecha * 1e6) % 1000000:06d}"
+    ruta = os.path.join(directorio, nombre + EXTENSION_GRABACION)
+    with open(ruta, "wb") as archivo:
+        archivo.write(contenido)
+    podar_grabaciones(directorio, max_grabaciones)
+    return ruta
+
+def podar_grabaciones(directorio=DIRECTORIO_GRABACIONES, max_grabaciones=MAX_GRABACIONES):
+    """
+    Borra las grabaciones más antiguas hasta dejar max_grabaciones. Los
+    nombres empiezan por la fecha, así que se ordenan sin leer las cabeceras.
+    """
+    if max_grabaciones is None:
+        return
+
+    directorio = resolver_directorio(directorio)
+    nombres = sorted(nombre for nombre in os.listdir(directorio) if nombre.endswith(EXTENSION_GRABACION))
+    for nombre in nombres[:max(len(nombres) - max_grabaciones, 0)]:
+        try:
+            os.remove(os.path.join(directorio, nombre))
+        except OSError:
+            # Una grabación abierta en la ventana de reproducción se borra en la siguiente poda
+            continue
+
+def leer_cabecera(ruta):
+    """Devuelve (cabecera, desplazamiento de las columnas) leyendo solo el inicio del archivo"""
+    with open(ruta, "rb") as archivo:
+        prefijo = archivo.read(len(MAGIA_GRABACION) + 4)
+        if len(prefijo) < len(MAGIA_GRABACION) + 4 or not prefijo.startswith(MAGIA_GRABACION):
+            raise ValueError(f"{ruta} no es una grabación del simulador")
+        longitud, = struct.unpack("<I", prefijo[len(MAGIA_GRABACION):])
+        cabecera = json.loads(archivo.read(longitud))
+    return cabecera, len(prefijo) + longitud
+
+def listar_grabaciones(directorio=DIRECTORIO_GRABACIONES):
+    """
+    Lista (ruta, cabecera) de las grabaciones del directorio, de la más
+    reciente a la más antigua. Los archivos que no son grabaciones se ignoran.
+    """
+    directorio = resolver_directorio(directorio)
+    if not os.path.isdir(directorio):
+        return []
+
+    grabaciones = []
+    for nombre in os.listdir(directorio):
+        if not nombre.endswith(EXTENSION_GRABACION):
+            continue
+        ruta = os.path.join(directorio, nombre)
+        try:
+            cabecera, _ = leer_cabecera(ruta)
+        except (OSError, ValueError):
+            continue
+        grabaciones.append((ruta, cabecera))
+
+    grabaciones.sort(key=lambda grabacion: grabacion[1]["fecha"], reverse=True)
+    return grabaciones
+
+class Grabacion:
+    def __init__(self, ruta):
+        """
+        Constructor de la clase Grabacion
+
+        Abre las columnas con memory-mapping; nada se lee de disco hasta que
+        se accede a ellas.
+        """
+        self.ruta = ruta
+        self.cabecera, desplazamiento = leer_cabecera(ruta)
+        self.pasos = self.cabecera["pasos"]
+        self.incremento_tiempo = self.cabecera["incremento_tiempo"]
+        self.columnas = np.memmap(ruta, dtype=np.float32, mode="r", offset=desplazamiento,
+                                  shape=(len(COLUMNAS_GRABACION), self.pasos))
+
+    @property
+    def tiempos(self):
+        return self.columnas[0]
+
+    @property
+    def trayectorias(self):
+        """Filas enemigo_x, enemigo_y, misil_x, misil_y (vista, sin copiar)"""
+        return self.columnas[1:]
+
+    @property
+    def tiempo_final(self):
+        return self.cabecera["tiempo_final"]
+
+    def indice_en(self, tiempo):
+        """
+        Índice del último paso registrado en el instante dado, en O(1): los
+        pasos están espaciados por el incremento de tiempo (el paso i ocurre en
+        (i + 1)·incremento), salvo el último de una intercepción, que es el
+        instante exacto de máximo acercamiento y solo se ajusta con una lectura
+        """
+        if self.pasos == 0:
+            return -1
+
+        indice = min(int(np.floor(tiempo / self.incremento_tiempo + 1e-6)) - 1, self.pasos - 1)
+        if indice == self.pasos - 1 and self.tiempos[indice] > tiempo:
+            indice -= 1
+        return max(indice, -1)
+
+    def cerrar(self):
+        """Libera el memory-mapping"""
+        self.columnas = None
@@ -0,0 +1,192 @@
+"""
+Renderizado de las trayectorias para la animación
+
+Mantiene las trayectorias en buffers NumPy preasignados según el tiempo de
+vuelo del enemigo, y en cada frame pasa vistas de esos buffers a set_data en
+lugar de listas que crecen. Con blitting, FuncAnimation solo vuelve a dibujar
+estos artistas sobre el fondo cacheado, así que el coste por frame no depende
+de la figura completa. No importa Tk, de modo que también funciona con Agg.
+
+RenderizadorSalva aplica la misma idea a un número arbitrario de pistas, y
+MedidorFrames mide el ritmo y el dibujo de la animación del simulador.
+"""
+
+import time
+import numpy as np
+from matplotlib.collections import LineCollection
+from instrumentation import METRICA_DIBUJO, METRICA_INTERVALO
+
+# Colores (RGBA) de las pistas en el modo salva
+COLOR_AMENAZA = (0.85, 0.1, 0.1, 1.0)
+COLOR_INTERCEPTOR = (0.1, 0.2, 0.85, 1.0)
+
+class RenderizadorTrayectorias:
+    def __init__(self, linea_enemigo, linea_misil, punto_enemigo, punto_misil):
+        """Constructor de la clase RenderizadorTrayectorias"""
+        self.linea_enemigo = linea_enemigo
+        self.linea_misil = linea_misil
+        self.punto_enemigo = punto_enemigo
+        self.punto_misil = punto_misil
+
+        # Filas: enemigo_x, enemigo_y, misil_x, misil_y
+        self.buffer = np.empty((4, 0))
+        self.pasos = 0
+
+    @property
+    def artistas(self):
+        return (self.linea_enemigo, self.linea_misil,
+                self.punto_enemigo, self.punto_misil)
+
+    def preparar(self, tiempo_vuelo_enemigo, incremento_tiempo):
+        """
+        Reserva los buffers para un vuelo completo; solo se reasignan si el
+        nuevo vuelo necesita más pasos que el anterior
+        """
+        pasos = int(np.ceil(tiempo_vuelo_enemigo / incremento_tiempo)) + 2
+        if pasos > self.buffer.shape[1]:
+            self.buffer = np.empty((4, pasos))
+        self.pasos = 0
+
+    def cargar(self, resultado):
+        """Copia en los buffers las trayectorias de un ResultadoSimulacion"""
+        pasos = len(resultado.tiempos)
+        if pasos > self.buffer.shape[1]:
+            self.buffer = np.empty((4, pasos))
+
+        self.buffer[0, :pasos] = resultado.enemigo_x
+        self.buffer[1, :pasos] = resultado.enemigo_y
+        self.buffer[2, :pasos] = resultado.misil_x
+        self.buffer[3, :pasos] = resultado.misil_y
+        self.pasos = pasos
+
+    def usar_buffer(self, trayectorias):
+        """
+        Dibuja directamente desde un array [4, pasos] ya existente (p. ej. las
+        columnas con memory-mapping de una grabación) sin copiarlo
+        """
+        self.buffer = trayectorias
+        self.pasos = trayectorias.shape[1]
+
+    def limpiar(self):
+        """Vacía las trayectorias dibujadas"""
+        for artista in self.artistas:
+            artista.set_data([], [])
+        return self.artistas
+
+    def actualizar(self, fin):
+        """Dibuja los primeros `fin` pasos usando vistas de los buffers"""
+        enemigo_x, enemigo_y, misil_x, misil_y = self.buffer[:, :fin]
+        self.linea_enemigo.set_data(enemigo_x, enemigo_y)
+        self.linea_misil.set_data(misil_x, misil_y)
+        self.punto_enemigo.set_data(enemigo_x[-1:], enemigo_y[-1:])
+        self.punto_misil.set_data(misil_x[-1:], misil_y[-1:])
+        return self.artistas
+
+    def finalizar(self):
+        """
+        Devuelve los artistas al dibujado normal para que la última imagen se
+        conserve en los redibujados completos tras detener el blitting
+        """
+        for artista in self.artistas:
+            artista.set_animated(False)
+
+class RenderizadorSalva:
+    def __init__(self, ejes):
+        """
+        Constructor de la clase RenderizadorSalva
+
+        Todas las pistas se dibujan con una sola LineCollection y todas las
+        posiciones actuales con un solo scatter, sin un Line2D por objeto.
+        """
+        self.coleccion = LineCollection([], linewidths=1.5)
+        ejes.add_collection(self.coleccion)
+        self.cabezas = ejes.scatter([], [], s=16, zorder=3)
+
+        self.posiciones = np.empty((0, 0, 2))
+        self.fin = np.empty(0, dtype=int)
+        self.pistas = np.empty(0, dtype=int)
+        self.colores = np.empty((0, 4))
+
+    @property
+    def artistas(self):
+        return (self.coleccion, self.cabezas)
+
+    def cargar(self, posiciones, fin, n_amenazas):
+        """Carga las pistas de calcular_trayectorias_salva (amenazas primero)"""
+        self.posiciones = posiciones
+        self.fin = fin
+        self.pistas = np.arange(len(fin))
+
+        self.colores = np.where(self.pistas[:, None] < n_amenazas, COLOR_AMENAZA, COLOR_INTERCEPTOR)
+        self.coleccion.set_color(self.colores)
+        return self.limpiar()
+
+    def limpiar(self):
+        """Vacía todas las pistas"""
+        self.coleccion.set_segments([])
+        self.cabezas.set_offsets(np.empty((0, 2)))
+        return self.artistas
+
+    def actualizar(self, paso):
+        """Dibuja todas las pistas hasta el paso dado usando vistas de las posiciones"""
+        visibles = np.minimum(paso + 1, self.fin)
+        self.coleccion.set_segments(
+            [self.posiciones[pista, :fin] for pista, fin in zip(self.pistas, visibles)]
+        )
+
+        # Las pistas que aún no despegan no tienen cabeza visible
+        activas = visibles > 0
+        self.cabezas.set_offsets(self.posiciones[self.pistas[activas], visibles[activas] - 1])
+        self.cabezas.set_facecolor(self.colores[activas])
+        return self.artistas
+
+class MedidorFrames:
+    def __init__(self, lienzo, instrumentacion, blit, programar_en_reposo):
+        """
+        Constructor de la clase MedidorFrames
+
+        Mide el intervalo real entre frames y el tiempo de dibujo posterior a
+        cada uno con la API pública: la función de animación marca el inicio
+        y el final de cada frame, y el dibujo se mide desde ese final hasta el
+        draw_event del lienzo (redibujado completo) o, con blitting, que no
+        emite draw_event, hasta que el bucle de eventos queda libre tras
+        copiar los artistas (programar_en_reposo, p. ej. root.after_idle).
+        """
+        self.instrumentacion = instrumentacion
+        self.blit = blit
+        self.programar_en_reposo = programar_en_reposo
+        self.ultimo_frame = None
+        self.fin_frame = None
+        if not blit:
+            lienzo.mpl_connect('draw_event', self.al_dibujar)
+
+    def reiniciar(self):
+        """Olvida el frame anterior (al arrancar o reanudar la animación)"""
+        self.ultimo_frame = None
+        self.fin_frame = None
+
+    def iniciar_frame(self):
+        """Registra el intervalo desde el inicio del frame anterior"""
+        if not self.instrumentacion.activa:
+            return
+        ahora = time.perf_counter()
+        if self.ultimo_frame is not None:
+            self.instrumentacion.registrar(METRICA_INTERVALO, (ahora - self.ultimo_frame) * 1000)
+        self.ultimo_frame = ahora
+
+    def terminar_frame(self):
+        """Empieza a medir el dibujo que sigue a la función de animación"""
+        if not self.instrumentacion.activa:
+            return
+        self.fin_frame = time.perf_counter()
+        if self.blit:
+            self.programar_en_reposo(self.registrar_dibujo)
+
+    def al_dibujar(self, evento):
+        if self.fin_frame is not None:
+            self.registrar_dibujo()
+
+    def registrar_dibujo(self):
+        if self.fin_frame is not None:
+            self.instrumentacion.registrar(METRICA_DIBUJO, (time.perf_counter() - self.fin_frame) * 1000)
+            self.fin_frame = None
@@ -0,0 +1,169 @@
+"""
+Ventana de reproducción de simulaciones grabadas
+"""
+
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, messagebox
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from config import INTERVALO_ANIMACION
+from recording import Grabacion, listar_grabaciones
+from renderer import RenderizadorTrayectorias
+from history_view import formatear_resultado
+
+def describir_grabacion(cabecera):
+    """Texto de una grabación en la lista"""
+    fecha = datetime.fromtimestamp(cabecera["fecha"]).strftime("%d/%m %H:%M:%S")
+    resultado = formatear_resultado(cabecera["resultado"], cabecera["tiempo_final"],
+                                    cabecera["altura_intercepcion"])
+    return (f"{fecha}  H={cabecera['altura']:.1f} D={cabecera['distancia']:.1f} "
+            f"v={cabecera['velocidad']:.2f} θ={cabecera['angulo']:.1f}° "
+            f"delay={cabecera['delay']:.1f}  {resultado}")
+
+class VentanaReproduccion:
+    def __init__(self, root):
+        """Constructor de la clase VentanaReproduccion"""
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("Reproducción de Simulaciones")
+        self.ventana.geometry("1200x700")
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        self.grabaciones = []
+        self.grabacion = None
+        self.id_reproduccion = None
+
+        # Lista de grabaciones (solo se leen las cabeceras)
+        panel_lista = ttk.LabelFrame(self.ventana, text="Grabaciones")
+        panel_lista.pack(side=tk.LEFT, fill=tk.Y, padx=10, pady=5)
+
+        self.lista = tk.Listbox(panel_lista, width=60, exportselection=False)
+        scroll_lista = ttk.Scrollbar(panel_lista, orient=tk.VERTICAL, command=self.lista.yview)
+        self.lista.configure(yscrollcommand=scroll_lista.set)
+        self.lista.bind('<<ListboxSelect>>', self.seleccionar)
+        self.lista.grid(row=0, column=0, sticky='nsew')
+        scroll_lista.grid(row=0, column=1, sticky='ns')
+        ttk.Button(panel_lista, text="Actualizar", command=self.cargar_lista).grid(row=1, column=0, pady=5)
+        panel_lista.grid_rowconfigure(0, weight=1)
+
+        # Gráfico y controles de tiempo
+        panel_derecho = ttk.Frame(self.ventana)
+        panel_derecho.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.figura = Figure(figsize=(8, 5))
+        self.ejes = self.figura.add_subplot(111)
+        self.ejes.set_xlabel('Distancia Horizontal (km)')
+        self.ejes.set_ylabel('Altura (km)')
+        self.ejes.set_title('Reproducción')
+        self.ejes.grid(True)
+
+        linea_enemigo, = self.ejes.plot([], [], 'ro-', lw=2, label='Misil Enemigo')
+        linea_misil, = self.ejes.plot([], [], 'bo-', lw=2, label='Misil Antiaéreo')
+        punto_enemigo, = self.ejes.plot([], [], 'ro', markersize=10)
+        punto_misil, = self.ejes.plot([], [], 'bo', markersize=10)
+        self.ejes.legend(loc='upper left')
+        self.renderizador = RenderizadorTrayectorias(linea_enemigo, linea_misil, punto_enemigo, punto_misil)
+
+        self.lienzo = FigureCanvasTkAgg(self.figura, master=panel_derecho)
+        self.lienzo.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        panel_tiempo = ttk.Frame(panel_derecho)
+        panel_tiempo.pack(fill=tk.X, padx=10, pady=5)
+        self.boton_reproducir = ttk.Button(panel_tiempo, text="Reproducir", command=self.alternar_reproduccion)
+        self.boton_reproducir.pack(side=tk.LEFT, padx=5)
+        self.variable_tiempo = tk.DoubleVar(value=0.0)
+        self.deslizador = ttk.Scale(panel_tiempo, from_=0.0, to=1.0, variable=self.variable_tiempo,
+                                    command=lambda valor: self.mostrar_instante(float(valor)))
+        self.deslizador.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        self.etiqueta_info = ttk.Label(panel_derecho, text="Selecciona una grabación")
+        self.etiqueta_info.pack(pady=5)
+
+        self.cargar_lista()
+
+    def cargar_lista(self):
+        """Vuelve a leer las cabeceras de las grabaciones"""
+        self.grabaciones = listar_grabaciones()
+        self.lista.delete(0, tk.END)
+        for _, cabecera in self.grabaciones:
+            self.lista.insert(tk.END, describir_grabacion(cabecera))
+
+    def seleccionar(self, evento=None):
+        """Abre la grabación seleccionada con memory-mapping"""
+        seleccion = self.lista.curselection()
+        if not seleccion:
+            return
+
+        self.detener()
+        ruta, cabecera = self.grabaciones[seleccion[0]]
+        try:
+            grabacion = Grabacion(ruta)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Error", f"No se pudo abrir la grabación: {error}", parent=self.ventana)
+            return
+
+        if self.grabacion is not None:
+            self.grabacion.cerrar()
+        self.grabacion = grabacion
+        self.renderizador.usar_buffer(grabacion.trayectorias)
+
+        self.ejes.set_xlim(-5, cabecera["distancia"] + 5)
+        self.ejes.set_ylim(-0.5, cabecera["altura"] + 2)
+        self.deslizador.configure(to=max(grabacion.tiempo_final, grabacion.incremento_tiempo))
+        self.variable_tiempo.set(grabacion.tiempo_final)
+        self.mostrar_instante(grabacion.tiempo_final)
+
+    def mostrar_instante(self, tiempo):
+        """Dibuja la grabación hasta el instante dado sin recorrer los pasos previos"""
+        if self.grabacion is None:
+            return
+
+        indice = self.grabacion.indice_en(tiempo)
+        if indice < 0:
+            self.renderizador.limpiar()
+            self.etiqueta_info.config(text=f"t = {tiempo:.2f} s")
+        else:
+            self.renderizador.actualizar(indice + 1)
+            enemigo_x, enemigo_y, misil_x, misil_y = self.grabacion.trayectorias[:, indice]
+            self.etiqueta_info.config(
+                text=f"t = {self.grabacion.tiempos[indice]:.2f} s - enemigo ({enemigo_x:.2f}, {enemigo_y:.2f}) km, "
+                     f"misil ({misil_x:.2f}, {misil_y:.2f}) km"
+            )
+        self.lienzo.draw_idle()
+
+    def alternar_reproduccion(self):
+        """Reproduce desde el instante actual o pausa la reproducción"""
+        if self.id_reproduccion is not None:
+            self.detener()
+            return
+        if self.grabacion is None:
+            return
+
+        if self.variable_tiempo.get() >= self.grabacion.tiempo_final:
+            self.variable_tiempo.set(0.0)
+        self.boton_reproducir.config(text="Pausa")
+        self.avanzar()
+
+    def avanzar(self):
+        """Avanza el deslizador un intervalo de animación en tiempo real"""
+        tiempo = min(self.variable_tiempo.get() + INTERVALO_ANIMACION / 1000, self.grabacion.tiempo_final)
+        self.variable_tiempo.set(tiempo)
+        self.mostrar_instante(tiempo)
+        if tiempo >= self.grabacion.tiempo_final:
+            self.detener()
+        else:
+            self.id_reproduccion = self.ventana.after(INTERVALO_ANIMACION, self.avanzar)
+
+    def detener(self):
+        """Pausa la reproducción"""
+        if self.id_reproduccion is not None:
+            self.ventana.after_cancel(self.id_reproduccion)
+            self.id_reproduccion = None
+        self.boton_reproducir.config(text="Reproducir")
+
+    def cerrar(self):
+        """Cierra la ventana de reproducción"""
+        self.detener()
+        if self.grabacion is not None:
+            self.grabacion.cerrar()
+        self.ventana.destroy()
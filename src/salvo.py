@@ -0,0 +1,166 @@
+"""
+Modo salva: varios misiles enemigos contra varias baterías antiaéreas
+
+Cada amenaza cae desde su propia altura y posición horizontal, y cada batería
+dispone de un interceptor con su propio delay. La factibilidad y el coste de
+cada par amenaza-batería se calculan como una matriz N×M en una sola
+evaluación vectorizada de la solución analítica del optimizador, y la
+asignación se resuelve con scipy.optimize.linear_sum_assignment.
+
+Durante la reproducción, detectar_colisiones_salva recorre los pasos y busca
+los pares amenaza-interceptor en vuelo con DetectorColisiones, de modo que
+también se registran los impactos entre pistas no asignadas entre sí.
+"""
+
+from dataclasses import dataclass
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from config import (MIN_ALTURA, MAX_ALTURA, MIN_DISTANCIA, MAX_DISTANCIA, MIN_DELAY, MAX_DELAY,
+                    MAX_VELOCIDAD, INCREMENTO_TIEMPO)
+from physics import calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo_lote, calcular_posicion_misil_lote
+from optimizer import resolver_intercepcion_lote
+from collision import DetectorColisiones
+
+# Coste asignado a los pares sin solución
+COSTE_INFACTIBLE = 1e9
+
+@dataclass
+class EscenarioSalva:
+    """Amenazas (altura, posición x) y baterías (posición x, delay)"""
+    alturas: np.ndarray
+    posiciones_amenazas: np.ndarray
+    posiciones_baterias: np.ndarray
+    delays: np.ndarray
+
+@dataclass
+class PlanSalva:
+    """
+    Resultado de la asignación. asignaciones contiene pares (amenaza, batería)
+    factibles; las matrices N×M describen todos los pares.
+    """
+    asignaciones: list
+    angulos: np.ndarray
+    tiempos: np.ndarray
+    direcciones: np.ndarray
+    costes: np.ndarray
+    velocidad: float
+
+def generar_escenario_salva(n_amenazas, n_baterias, semilla=None):
+    """
+    Escenario aleatorio dentro de los rangos de config.py. Las baterías se
+    reparten sobre la primera mitad del rango de distancias.
+    """
+    generador = np.random.default_rng(semilla)
+    return EscenarioSalva(
+        alturas=generador.uniform(MIN_ALTURA, MAX_ALTURA, n_amenazas),
+        posiciones_amenazas=generador.uniform(MIN_DISTANCIA, MAX_DISTANCIA, n_amenazas),
+        posiciones_baterias=generador.uniform(0, MAX_DISTANCIA / 2, n_baterias),
+        delays=generador.uniform(MIN_DELAY, MAX_DELAY, n_baterias)
+    )
+
+def calcular_matriz_intercepcion(escenario, velocidad=MAX_VELOCIDAD):
+    """
+    Ángulo, tiempo de intercepción y dirección de disparo (+1/-1) de cada par
+    amenaza-batería como matrices N×M; NaN donde el par no es factible
+    """
+    separacion = escenario.posiciones_amenazas[:, None] - escenario.posiciones_baterias[None, :]
+    angulos, tiempos = resolver_intercepcion_lote(
+        escenario.alturas[:, None], np.abs(separacion), velocidad, escenario.delays[None, :]
+    )
+    direcciones = np.where(separacion >= 0, 1.0, -1.0)
+    return angulos, tiempos, direcciones
+
+def asignar_baterias(escenario, velocidad=MAX_VELOCIDAD):
+    """
+    Asigna como máximo una batería por amenaza minimizando el tiempo total de
+    intercepción (la intercepción más temprana es también la más alta)
+    """
+    angulos, tiempos, direcciones = calcular_matriz_intercepcion(escenario, velocidad)
+    costes = np.where(np.isnan(tiempos), COSTE_INFACTIBLE, tiempos)
+
+    filas, columnas = linear_sum_assignment(costes)
+    asignaciones = [
+        (int(i), int(j)) for i, j in zip(filas, columnas) if costes[i, j] < COSTE_INFACTIBLE
+    ]
+    return PlanSalva(asignaciones, angulos, tiempos, direcciones, costes, velocidad)
+
+def calcular_trayectorias_salva(escenario, plan, incremento_tiempo=INCREMENTO_TIEMPO):
+    """
+    Trayectorias de todas las pistas sobre una malla de tiempos común.
+
+    Devuelve (tiempos, posiciones, fin): posiciones tiene forma
+    [amenazas + baterías, pasos, 2] (primero las amenazas) y fin[k] es el
+    número de muestras válidas de la pista k. Una pista interceptada termina
+    en el punto exacto de la intercepción; un interceptor sin asignar no despega.
+    """
+    n_amenazas = len(escenario.alturas)
+    n_baterias = len(escenario.posiciones_baterias)
+    duracion = float(np.max(calcular_tiempo_vuelo_enemigo(escenario.alturas), initial=0))
+    tiempos = np.arange(0, duracion + incremento_tiempo, incremento_tiempo)
+
+    posiciones = np.zeros((n_amenazas + n_baterias, len(tiempos), 2))
+    posiciones[:n_amenazas, :, 0] = escenario.posiciones_amenazas[:, None]
+    posiciones[:n_amenazas, :, 1] = calcular_posicion_enemigo_lote(escenario.alturas[:, None], tiempos)
+    posiciones[n_amenazas:, :, 0] = escenario.posiciones_baterias[:, None]
+
+    # Las amenazas se dibujan hasta tocar el suelo; los interceptores, solo si despegan
+    fin = np.zeros(n_amenazas + n_baterias, dtype=int)
+    fin[:n_amenazas] = np.minimum(
+        np.searchsorted(tiempos, calcular_tiempo_vuelo_enemigo(escenario.alturas)) + 1, len(tiempos)
+    )
+
+    if plan.asignaciones:
+        amenazas, baterias = (np.array(indices) for indices in zip(*plan.asignaciones))
+        angulos = plan.angulos[amenazas, baterias]
+        tiempos_intercepcion = plan.tiempos[amenazas, baterias]
+        direcciones = plan.direcciones[amenazas, baterias]
+        delays = escenario.delays[baterias]
+
+        misil_x, misil_y = calcular_posicion_misil_lote(
+            angulos[:, None], plan.velocidad, tiempos, delays[:, None]
+        )
+        pistas = n_amenazas + baterias
+        posiciones[pistas, :, 0] += direcciones[:, None] * misil_x
+        posiciones[pistas, :, 1] = misil_y
+
+        # Cortar ambas pistas en el punto exacto de intercepción
+        ultimo = np.minimum(np.searchsorted(tiempos, tiempos_intercepcion), len(tiempos) - 1)
+        punto_x = escenario.posiciones_amenazas[amenazas]
+        punto_y = calcular_posicion_enemigo_lote(escenario.alturas[amenazas], tiempos_intercepcion)
+        for pista in (amenazas, pistas):
+            posiciones[pista, ultimo, 0] = punto_x
+            posiciones[pista, ultimo, 1] = punto_y
+            fin[pista] = ultimo + 1
+
+    return tiempos, posiciones, fin
+
+def detectar_colisiones_salva(posiciones, fin, n_amenazas, detector=None):
+    """
+    Recorre los pasos de calcular_trayectorias_salva y detecta en cada uno los
+    pares amenaza-interceptor en vuelo a menos del umbral. Cada pista solo
+    puede colisionar una vez.
+
+    Devuelve (colisiones, detector): colisiones es una lista de
+    (paso, amenaza, batería) y el registro del detector guarda el tiempo por paso.
+    """
+    detector = detector or DetectorColisiones()
+    activas = np.ones(len(fin), dtype=bool)
+
+    colisiones = []
+    for paso in range(posiciones.shape[1]):
+        en_vuelo = activas & (paso < fin)
+        # Un interceptor en tierra (antes del delay o sin asignar) no está en vuelo
+        en_vuelo[n_amenazas:] &= posiciones[n_amenazas:, paso, 1] > 0
+        amenazas = np.flatnonzero(en_vuelo[:n_amenazas])
+        interceptores = n_amenazas + np.flatnonzero(en_vuelo[n_amenazas:])
+        if len(amenazas) == 0 or len(interceptores) == 0:
+            continue
+
+        pares = detector.detectar(posiciones[amenazas, paso], posiciones[interceptores, paso])
+        for i, j in pares:
+            amenaza, interceptor = amenazas[i], interceptores[j]
+            if activas[amenaza] and activas[interceptor]:
+                activas[amenaza] = activas[interceptor] = False
+                colisiones.append((paso, int(amenaza), int(interceptor - n_amenazas)))
+
+    return colisiones, detector
@@ -0,0 +1,139 @@
+"""
+Ventana del modo salva
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from matplotlib.figure import Figure
+from matplotlib.animation import FuncAnimation
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from config import (SALVA_AMENAZAS, SALVA_BATERIAS, SALVA_MAX_PISTAS, MAX_DISTANCIA, MAX_ALTURA,
+                    INCREMENTO_TIEMPO, INTERVALO_ANIMACION, USAR_BLIT)
+from salvo import (generar_escenario_salva, asignar_baterias, calcular_trayectorias_salva,
+                   detectar_colisiones_salva)
+from renderer import RenderizadorSalva
+
+class VentanaSalva:
+    def __init__(self, root):
+        """Constructor de la clase VentanaSalva"""
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("Modo Salva")
+        self.ventana.geometry("1100x700")
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        self.anim = None
+        self.tiempos = []
+
+        # Controles
+        panel_controles = ttk.LabelFrame(self.ventana, text="Escenario")
+        panel_controles.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+
+        ttk.Label(panel_controles, text="Amenazas:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+        self.entrada_amenazas = ttk.Entry(panel_controles, width=8)
+        self.entrada_amenazas.insert(0, str(SALVA_AMENAZAS))
+        self.entrada_amenazas.grid(row=0, column=1, padx=5, pady=5)
+
+        ttk.Label(panel_controles, text="Baterías:").grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
+        self.entrada_baterias = ttk.Entry(panel_controles, width=8)
+        self.entrada_baterias.insert(0, str(SALVA_BATERIAS))
+        self.entrada_baterias.grid(row=0, column=3, padx=5, pady=5)
+
+        ttk.Label(panel_controles, text="Semilla:").grid(row=0, column=4, padx=5, pady=5, sticky=tk.W)
+        self.entrada_semilla = ttk.Entry(panel_controles, width=8)
+        self.entrada_semilla.grid(row=0, column=5, padx=5, pady=5)
+
+        ttk.Button(panel_controles, text="Generar y Asignar",
+                   command=self.generar).grid(row=0, column=6, padx=5, pady=5)
+        self.boton_iniciar = ttk.Button(panel_controles, text="Iniciar", command=self.iniciar)
+        self.boton_iniciar.grid(row=0, column=7, padx=5, pady=5)
+        self.boton_iniciar.config(state=tk.DISABLED)
+
+        self.etiqueta_info = ttk.Label(self.ventana, text="Genera un escenario para comenzar")
+        self.etiqueta_info.pack(side=tk.TOP, pady=5)
+
+        # Gráfico
+        self.figura = Figure(figsize=(10, 6))
+        self.ejes = self.figura.add_subplot(111)
+        self.ejes.set_xlabel('Distancia Horizontal (km)')
+        self.ejes.set_ylabel('Altura (km)')
+        self.ejes.set_title('Salva de Misiles')
+        self.ejes.grid(True)
+        self.ejes.set_xlim(-5, MAX_DISTANCIA + 5)
+        self.ejes.set_ylim(-0.5, MAX_ALTURA + 2)
+
+        self.renderizador = RenderizadorSalva(self.ejes)
+
+        self.lienzo = FigureCanvasTkAgg(self.figura, master=self.ventana)
+        self.lienzo.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.lienzo.draw_idle()
+
+    def detener(self):
+        """Detiene la animación en curso"""
+        if self.anim and self.anim.event_source:
+            self.anim.event_source.stop()
+        for artista in self.renderizador.artistas:
+            artista.set_animated(False)
+
+    def generar(self):
+        """Genera un escenario aleatorio, asigna baterías y calcula las pistas"""
+        try:
+            n_amenazas = int(self.entrada_amenazas.get())
+            n_baterias = int(self.entrada_baterias.get())
+            semilla = int(self.entrada_semilla.get()) if self.entrada_semilla.get() else None
+        except ValueError:
+            messagebox.showerror("Error", "Las amenazas, baterías y semilla deben ser enteros", parent=self.ventana)
+            return
+
+        if not (0 <= n_amenazas <= SALVA_MAX_PISTAS and 0 <= n_baterias <= SALVA_MAX_PISTAS):
+            messagebox.showerror("Error", f"Las amenazas y baterías deben estar entre 0 y {SALVA_MAX_PISTAS}",
+                                 parent=self.ventana)
+            return
+        if semilla is not None and semilla < 0:
+            messagebox.showerror("Error", "La semilla no puede ser negativa", parent=self.ventana)
+            return
+
+        self.detener()
+        escenario = generar_escenario_salva(n_amenazas, n_baterias, semilla)
+        plan = asignar_baterias(escenario)
+        self.tiempos, posiciones, fin = calcular_trayectorias_salva(escenario, plan, INCREMENTO_TIEMPO)
+        self.renderizador.cargar(posiciones, fin, n_amenazas)
+        colisiones, detector = detectar_colisiones_salva(posiciones, fin, n_amenazas)
+        estadisticas = detector.estadisticas()
+
+        self.etiqueta_info.config(
+            text=f"{len(plan.asignaciones)} de {n_amenazas} amenazas con interceptor asignado "
+                 f"({n_amenazas + n_baterias} pistas) - {len(colisiones)} intercepciones detectadas, "
+                 f"{estadisticas['tiempo_medio'] * 1000:.3f} ms/paso "
+                 f"(máx. {estadisticas['tiempo_maximo'] * 1000:.3f} ms)"
+        )
+        self.boton_iniciar.config(state=tk.NORMAL)
+        self.lienzo.draw_idle()
+
+    def iniciar(self):
+        """Reproduce las pistas calculadas"""
+        self.detener()
+        self.anim = FuncAnimation(
+            self.figura,
+            self.animar,
+            frames=len(self.tiempos),
+            init_func=self.renderizador.limpiar,
+            interval=INTERVALO_ANIMACION,
+            blit=USAR_BLIT,
+            repeat=False,
+            cache_frame_data=False
+        )
+        self.lienzo.draw()
+
+    def animar(self, paso):
+        """Dibuja un paso; en el último devuelve las pistas al dibujado normal"""
+        artistas = self.renderizador.actualizar(paso)
+        if paso == len(self.tiempos) - 1:
+            for artista in artistas:
+                artista.set_animated(False)
+            self.lienzo.draw_idle()
+        return artistas
+
+    def cerrar(self):
+        """Cierra la ventana del modo salva"""
+        self.detener()
+        self.ventana.destroy()
@@ -0,0 +1,166 @@
+"""
+Planificación del lanzamiento con el delay como incógnita
+
+En lugar de tomar el delay como dato, se elige dentro de MIN_DELAY..MAX_DELAY
+según un objetivo:
+    min_tiempo  intercepción más temprana
+    max_altura  intercepción más alta
+    max_delay   lanzamiento más tardío que todavía intercepta
+
+La altura del enemigo solo depende del tiempo (h - g·t²/2), así que la
+intercepción más alta es la más temprana y los dos primeros objetivos
+comparten solución. Para un delay d la intercepción más temprana es la de
+velocidad máxima (la velocidad necesaria decrece con t), y la más tardía
+posible ocurre en t_fin(d), el menor entre el tiempo límite de altura y el
+instante en que el ángulo necesario baja a MIN_ANGULO (tan θ = (h + g·d²/2 -
+g·d·t)/D decrece con t). Con eso:
+
+    max_delay:  raíz de v_necesaria(t_fin(d); d) - v_max
+    min_tiempo: raíz de ∂(v²)/∂d = 2·(v² - g·τ·vy)/τ, con τ = t - d, sobre la
+                intercepción más temprana (donde t(d) deja de bajar)
+
+Las raíces se acotan evaluando las formas cerradas sobre una malla de delays
+y se refinan con brentq, así que cada consulta cuesta menos de un milisegundo.
+"""
+
+import numpy as np
+from config import (GRAVEDAD, MIN_DELAY, MAX_DELAY, MIN_ANGULO, MUESTRAS_PLANIFICACION,
+                    TOLERANCIA_PLANIFICACION)
+from physics import calcular_posicion_enemigo, calcular_posicion_misil, calcular_distancia
+from optimizer import (crear_resultado, calcular_parametros_lanzamiento, calcular_tiempo_limite_intercepcion,
+                       resolver_intercepcion_lote)
+
+OBJETIVOS_PLANIFICACION = ("min_tiempo", "max_altura", "max_delay")
+
+def calcular_tiempo_fin(altura_enemigo, distancia_enemigo, delay):
+    """
+    Último tiempo de intercepción posible para el delay dado: el tiempo límite
+    de altura o, si llega antes, el instante en que habría que disparar a
+    MIN_ANGULO
+    """
+    # Sin delay el ángulo necesario no depende de t: o vale siempre (inf) o
+    # nunca (-inf). La división se hace con np.divide para que también un
+    # delay float de Python igual a 0 caiga en ese caso.
+    delay = np.asarray(delay, dtype=float)
+    numerador = np.broadcast_to(
+        altura_enemigo + 0.5 * GRAVEDAD * delay**2 - distancia_enemigo * np.tan(np.radians(MIN_ANGULO)),
+        delay.shape
+    )
+    tiempo_angulo = np.divide(numerador, GRAVEDAD * delay, where=delay > 0,
+                              out=np.where(numerador >= 0, np.inf, -np.inf))
+    return np.minimum(calcular_tiempo_limite_intercepcion(altura_enemigo), tiempo_angulo)
+
+def calcular_exceso_velocidad(altura_enemigo, distancia_enemigo, max_velocidad, delay):
+    """
+    Velocidad mínima necesaria para interceptar con el delay dado menos la
+    máxima disponible: hay intercepción si y solo si no es positiva
+    """
+    tiempo_fin = calcular_tiempo_fin(altura_enemigo, distancia_enemigo, delay)
+    _, velocidad = calcular_parametros_lanzamiento(altura_enemigo, distancia_enemigo, delay, tiempo_fin)
+    return np.where(tiempo_fin > delay, velocidad - max_velocidad, np.inf)
+
+def calcular_pendiente_tiempo(altura_enemigo, distancia_enemigo, max_velocidad, delay):
+    """
+    Signo de la variación del tiempo de intercepción más temprana con el delay
+    (∂(v²)/∂d a tiempo fijo) y ese tiempo. NaN donde no hay intercepción.
+    """
+    _, tiempo = resolver_intercepcion_lote(altura_enemigo, distancia_enemigo, max_velocidad, delay)
+    angulo, velocidad = calcular_parametros_lanzamiento(altura_enemigo, distancia_enemigo, delay, tiempo)
+    tiempo_efectivo = tiempo - delay
+    velocidad_vertical = velocidad * np.sin(np.radians(angulo))
+    return velocidad**2 - GRAVEDAD * tiempo_efectivo * velocidad_vertical, tiempo
+
+def _refinar(funcion, a, b):
+    """
+    brentq entre a (donde la función no es positiva) y b, devolviendo un punto
+    del lado de a para que la solución siga siendo factible
+    """
+    from scipy.optimize import brentq
+    raiz, informe = brentq(funcion, a, b, xtol=TOLERANCIA_PLANIFICACION, full_output=True)
+    if funcion(raiz) > 0:
+        raiz = a if abs(raiz - a) <= 2 * TOLERANCIA_PLANIFICACION else raiz - np.copysign(
+            2 * TOLERANCIA_PLANIFICACION, b - a)
+    return float(raiz), informe.function_calls
+
+def _delay_maximo(altura_enemigo, distancia_enemigo, max_velocidad, delays, factible):
+    """Último delay factible, refinando el borde de la malla con brentq"""
+    ultimo = int(np.flatnonzero(factible)[-1])
+    if ultimo == len(delays) - 1:
+        return float(delays[ultimo]), 0
+    return _refinar(
+        lambda d: float(calcular_exceso_velocidad(altura_enemigo, distancia_enemigo, max_velocidad, d)),
+        delays[ultimo], delays[ultimo + 1]
+    )
+
+def _delay_mas_temprano(altura_enemigo, distancia_enemigo, max_velocidad, delays, factible):
+    """Delay de la intercepción más temprana, refinando el mínimo de la malla con brentq"""
+    pendiente, tiempos = calcular_pendiente_tiempo(altura_enemigo, distancia_enemigo, max_velocidad, delays)
+    tiempos = np.where(factible, tiempos, np.inf)
+    i = int(np.argmin(tiempos))
+
+    # El mínimo está donde la pendiente pasa de negativa a positiva, o en el
+    # borde de la región factible si el tiempo sigue bajando hasta él
+    vecino = i + 1 if pendiente[i] < 0 else i - 1
+    if not 0 <= vecino < len(delays):
+        return float(delays[i]), 0
+    if not factible[vecino]:
+        return _refinar(
+            lambda d: float(calcular_exceso_velocidad(altura_enemigo, distancia_enemigo, max_velocidad, d)),
+            delays[i], delays[vecino]
+        )
+    if np.sign(pendiente[vecino]) == np.sign(pendiente[i]):
+        return float(delays[i]), 0
+
+    signo = np.sign(pendiente[i])
+    return _refinar(
+        lambda d: float(signo * calcular_pendiente_tiempo(altura_enemigo, distancia_enemigo, max_velocidad, d)[0]),
+        delays[i], delays[vecino]
+    )
+
+def planificar_lanzamiento(altura_enemigo, distancia_enemigo, min_velocidad, max_velocidad,
+                           objetivo="min_tiempo", min_delay=MIN_DELAY, max_delay=MAX_DELAY,
+                           muestras=MUESTRAS_PLANIFICACION):
+    """
+    Elige el delay, el ángulo y la velocidad según el objetivo. Devuelve un
+    resultado como el de encontrar_parametros_optimos con x = (ángulo,
+    velocidad, tiempo) y además el delay y la altura de intercepción.
+
+    Todas las soluciones se disparan a velocidad máxima, así que
+    min_velocidad solo se acepta por simetría con el optimizador.
+    """
+    if objetivo not in OBJETIVOS_PLANIFICACION:
+        raise ValueError(f"Objetivo de planificación desconocido: {objetivo}")
+
+    delays = np.linspace(min_delay, max_delay, muestras)
+    factible = calcular_exceso_velocidad(altura_enemigo, distancia_enemigo, max_velocidad, delays) <= 0
+    if not factible.any():
+        return crear_resultado((np.nan, np.nan, np.nan), np.inf, False,
+                               "Ningún delay permite interceptar", delay=np.nan, altura_intercepcion=np.nan,
+                               objetivo=objetivo)
+
+    if objetivo == "max_delay":
+        delay, evaluaciones = _delay_maximo(altura_enemigo, distancia_enemigo, max_velocidad, delays, factible)
+    else:
+        delay, evaluaciones = _delay_mas_temprano(altura_enemigo, distancia_enemigo, max_velocidad, delays,
+                                                  factible)
+
+    angulo, tiempo = (float(valor) for valor in
+                      resolver_intercepcion_lote(altura_enemigo, distancia_enemigo, max_velocidad, delay))
+    if np.isnan(tiempo):
+        # Justo en el borde la raíz puede caer en el tiempo límite por redondeo
+        tiempo = float(calcular_tiempo_fin(altura_enemigo, distancia_enemigo, delay))
+        angulo, _ = calcular_parametros_lanzamiento(altura_enemigo, distancia_enemigo, delay, tiempo)
+        angulo = float(angulo)
+
+    misil_x, misil_y = calcular_posicion_misil(angulo, max_velocidad, tiempo, delay)
+    altura_intercepcion = calcular_posicion_enemigo(altura_enemigo, tiempo)
+    return crear_resultado(
+        (angulo, max_velocidad, tiempo),
+        calcular_distancia(misil_x, misil_y, distancia_enemigo, altura_intercepcion),
+        True,
+        f"Planificación ({objetivo}): delay {delay:.2f} s",
+        nfev=evaluaciones,
+        delay=delay,
+        altura_intercepcion=float(altura_intercepcion),
+        objetivo=objetivo
+    )
@@ -0,0 +1,237 @@
+"""
+Núcleo de simulación sin interfaz gráfica
+
+Reproduce la lógica de paso de SimuladorMisiles.animar (incremento de tiempo,
+impacto en el suelo, umbral de intercepción y altura mínima) sin depender de
+Tk ni de matplotlib, de modo que una simulación completa se puede ejecutar en
+milisegundos y la interfaz solo tiene que reproducir su resultado.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from config import INCREMENTO_TIEMPO, UMBRAL_INTERCEPCION, DETECCION_CONTINUA
+from physics import (calcular_tiempo_vuelo_enemigo, calcular_posicion_enemigo, calcular_componentes_velocidad,
+                     calcular_posicion_misil_componentes, calcular_posicion_enemigo_lote,
+                     calcular_posicion_misil_lote, calcular_distancia)
+from optimizer import validar_impacto_suelo, validar_altura_intercepcion
+from collision import calcular_acercamiento_minimo
+
+# Posibles desenlaces de una simulación
+RESULTADO_INTERCEPCION = "intercepcion"
+RESULTADO_IMPACTO = "impacto"
+RESULTADO_ALTURA_INSUFICIENTE = "altura_insuficiente"
+RESULTADO_EN_CURSO = "en_curso"
+
+@dataclass
+class ResultadoSimulacion:
+    """
+    Resultado completo de una simulación.
+
+    Las trayectorias contienen un punto por paso dibujado. Cuando el enemigo
+    impacta el suelo, el paso del impacto no se registra (igual que en la
+    animación) y tiempo_final corresponde a ese paso. Con detección continua,
+    el último punto de una intercepción es el instante exacto de máximo
+    acercamiento y no una muestra del paso.
+    """
+    resultado: str
+    tiempos: np.ndarray
+    enemigo_x: np.ndarray
+    enemigo_y: np.ndarray
+    misil_x: np.ndarray
+    misil_y: np.ndarray
+    tiempo_final: float
+    tiempo_intercepcion: Optional[float] = None
+    altura_intercepcion: Optional[float] = None
+
+    @property
+    def intercepcion(self):
+        return self.resultado == RESULTADO_INTERCEPCION
+
+    @property
+    def impacto_enemigo(self):
+        return self.resultado == RESULTADO_IMPACTO
+
+class MotorSimulacion:
+    def __init__(self, altura_enemigo, distancia_defensa, velocidad_misil, angulo_misil, delay_lanzamiento,
+                 incremento_tiempo=INCREMENTO_TIEMPO, umbral_intercepcion=UMBRAL_INTERCEPCION,
+                 deteccion_continua=DETECCION_CONTINUA):
+        """
+        Constructor de la clase MotorSimulacion
+
+        Con deteccion_continua la intercepción se busca de forma exacta dentro
+        de cada paso (acercamiento mínimo entre muestras) en lugar de solo en
+        las muestras, así que el veredicto no depende del incremento de tiempo.
+        """
+        self.altura_enemigo = altura_enemigo
+        self.distancia_defensa = distancia_defensa
+        self.velocidad_misil = velocidad_misil
+        self.angulo_misil = angulo_misil
+        self.delay_lanzamiento = delay_lanzamiento
+        self.incremento_tiempo = incremento_tiempo
+        self.umbral_intercepcion = umbral_intercepcion
+        self.deteccion_continua = deteccion_continua
+
+        self.tiempo_vuelo_enemigo = calcular_tiempo_vuelo_enemigo(altura_enemigo)
+        # El modo paso a paso evalúa el mismo disparo en cada paso
+        self.velocidad_x, self.velocidad_y = calcular_componentes_velocidad(angulo_misil, velocidad_misil)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vuelve el modo paso a paso a su estado inicial"""
+        self.tiempo = 0
+        self.resultado = RESULTADO_EN_CURSO
+        self.tiempos = []
+        self.enemigo_x = []
+        self.enemigo_y = []
+        self.misil_x = []
+        self.misil_y = []
+
+    def registrar_posicion(self, tiempo):
+        """Añade a las trayectorias las posiciones en el instante dado"""
+        misil_x, misil_y = calcular_posicion_misil_componentes(
+            self.velocidad_x,
+            self.velocidad_y,
+            tiempo,
+            self.delay_lanzamiento
+        )
+        self.tiempos.append(tiempo)
+        self.enemigo_x.append(self.distancia_defensa)
+        self.enemigo_y.append(calcular_posicion_enemigo(self.altura_enemigo, tiempo))
+        self.misil_x.append(misil_x)
+        self.misil_y.append(misil_y)
+
+    def evaluar_intercepcion(self, altura_enemigo):
+        """Fija el desenlace de una intercepción según la altura alcanzada"""
+        if validar_altura_intercepcion(altura_enemigo):
+            self.resultado = RESULTADO_INTERCEPCION
+        else:
+            self.resultado = RESULTADO_ALTURA_INSUFICIENTE
+
+    def tiempo_maximo_acercamiento(self, tiempo_inicio):
+        """
+        Instante exacto de máximo acercamiento a partir de tiempo_inicio.
+
+        La separación en vuelo es la distancia a una recta, así que una vez
+        dentro del umbral su mínimo no depende del paso en que se detectó.
+        """
+        _, tiempo_minimo = calcular_acercamiento_minimo(
+            self.altura_enemigo, self.distancia_defensa, self.angulo_misil,
+            self.velocidad_misil, self.delay_lanzamiento, tiempo_inicio, np.inf
+        )
+        return float(tiempo_minimo)
+
+    def paso(self):
+        """
+        Avanza un incremento de tiempo con la misma lógica que la animación.
+        Devuelve True mientras la simulación siga en curso.
+        """
+        if self.resultado != RESULTADO_EN_CURSO:
+            return False
+
+        tiempo_anterior = self.tiempo
+        self.tiempo += self.incremento_tiempo
+
+        # Acercamiento mínimo exacto dentro del paso
+        if self.deteccion_continua:
+            distancia, _ = calcular_acercamiento_minimo(
+                self.altura_enemigo, self.distancia_defensa, self.angulo_misil,
+                self.velocidad_misil, self.delay_lanzamiento, tiempo_anterior, self.tiempo
+            )
+            if distancia < self.umbral_intercepcion:
+                self.tiempo = self.tiempo_maximo_acercamiento(tiempo_anterior)
+                self.registrar_posicion(self.tiempo)
+                self.evaluar_intercepcion(self.enemigo_y[-1])
+                return False
+
+        altura_enemigo = calcular_posicion_enemigo(self.altura_enemigo, self.tiempo)
+        if validar_impacto_suelo(altura_enemigo):
+            self.resultado = RESULTADO_IMPACTO
+            return False
+
+        self.registrar_posicion(self.tiempo)
+
+        if not self.deteccion_continua:
+            distancia = calcular_distancia(
+                self.misil_x[-1], self.misil_y[-1], self.distancia_defensa, altura_enemigo
+            )
+            if distancia < self.umbral_intercepcion:
+                self.evaluar_intercepcion(altura_enemigo)
+                return False
+
+        return True
+
+    def obtener_resultado(self):
+        """Construye el resultado a partir del estado del modo paso a paso"""
+        resultado = ResultadoSimulacion(
+            resultado=self.resultado,
+            tiempos=np.array(self.tiempos, dtype=float),
+            enemigo_x=np.array(self.enemigo_x, dtype=float),
+            enemigo_y=np.array(self.enemigo_y, dtype=float),
+            misil_x=np.array(self.misil_x, dtype=float),
+            misil_y=np.array(self.misil_y, dtype=float),
+            tiempo_final=float(self.tiempo)
+        )
+        if self.resultado == RESULTADO_INTERCEPCION:
+            resultado.tiempo_intercepcion = float(self.tiempo)
+            resultado.altura_intercepcion = float(self.enemigo_y[-1])
+        return resultado
+
+    def ejecutar(self):
+        """
+        Ejecuta la simulación hasta su desenlace en una sola pasada vectorizada.
+
+        Evalúa todos los pasos hasta el impacto del enemigo de una vez y busca
+        el primer evento, con los mismos tiempos acumulados que el modo paso a paso.
+        """
+        pasos = int(np.ceil(self.tiempo_vuelo_enemigo / self.incremento_tiempo)) + 2
+        tiempos = np.cumsum(np.full(pasos, self.incremento_tiempo))
+
+        enemigo_y = calcular_posicion_enemigo_lote(self.altura_enemigo, tiempos)
+        misil_x, misil_y = calcular_posicion_misil_lote(
+            self.angulo_misil, self.velocidad_misil, tiempos, self.delay_lanzamiento
+        )
+
+        # Primer paso con el enemigo en el suelo
+        indice_impacto = int(np.argmax(enemigo_y <= 0))
+
+        if self.deteccion_continua:
+            # Acercamiento mínimo en cada intervalo hasta el del impacto, inclusive
+            inicios = np.concatenate(([0.0], tiempos[:indice_impacto]))
+            distancia, _ = calcular_acercamiento_minimo(
+                self.altura_enemigo, self.distancia_defensa, self.angulo_misil,
+                self.velocidad_misil, self.delay_lanzamiento, inicios, tiempos[:indice_impacto + 1]
+            )
+        else:
+            distancia = calcular_distancia(misil_x, misil_y, self.distancia_defensa, enemigo_y)[:indice_impacto]
+        cercanos = np.flatnonzero(distancia < self.umbral_intercepcion)
+
+        if cercanos.size and self.deteccion_continua:
+            # Las muestras previas más el punto exacto de máximo acercamiento
+            fin = int(cercanos[0])
+            tiempos = np.append(tiempos[:fin], self.tiempo_maximo_acercamiento(inicios[fin]))
+            enemigo_y = np.append(enemigo_y[:fin], calcular_posicion_enemigo_lote(self.altura_enemigo, tiempos[-1]))
+            misil_final = calcular_posicion_misil_lote(
+                self.angulo_misil, self.velocidad_misil, tiempos[-1], self.delay_lanzamiento
+            )
+            misil_x = np.append(misil_x[:fin], misil_final[0])
+            misil_y = np.append(misil_y[:fin], misil_final[1])
+            fin += 1
+            self.evaluar_intercepcion(enemigo_y[-1])
+            self.tiempo = tiempos[-1]
+        elif cercanos.size:
+            fin = int(cercanos[0]) + 1
+            self.evaluar_intercepcion(enemigo_y[fin - 1])
+            self.tiempo = tiempos[fin - 1]
+        else:
+            fin = indice_impacto
+            self.resultado = RESULTADO_IMPACTO
+            self.tiempo = tiempos[indice_impacto]
+
+        self.tiempos = tiempos[:fin]
+        self.enemigo_y = enemigo_y[:fin]
+        self.enemigo_x = np.full(fin, float(self.distancia_defensa))
+        self.misil_x = misil_x[:fin]
+        self.misil_y = misil_y[:fin]
+
+        return self.obtener_resultado()
@@ -0,0 +1,75 @@
+"""
+Arranque de la aplicación
+
+La ventana se pinta con los controles antes de importar matplotlib, y los
+módulos de scipy se precargan en un hilo en segundo plano una vez pintada, así
+que la primera optimización no paga su importación. MedidorArranque registra
+el desglose del arranque para la opción --medir-arranque de main.py; para el
+detalle módulo a módulo, python -X importtime main.py.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# Paquetes pesados cuya carga se atribuye a cada etapa
+PAQUETES_SEGUIDOS = ("numpy", "matplotlib", "PIL", "scipy")
+
+def paquetes_cargados():
+    """Paquetes seguidos que ya están importados"""
+    return {paquete for paquete in PAQUETES_SEGUIDOS if paquete in sys.modules}
+
+class MedidorArranque:
+    def __init__(self, inicio=None):
+        """
+        Constructor de la clase MedidorArranque
+
+        inicio es el perf_counter desde el que se miden las etapas (por
+        defecto, el momento de crear el medidor).
+        """
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.ultima_marca = self.inicio
+        self.cargados = paquetes_cargados()
+        # (etapa, ms desde el inicio, duración en ms, paquetes cargados en la etapa)
+        self.etapas = []
+        self.cerrojo = threading.Lock()
+
+    def marcar(self, etapa, duracion=None):
+        """
+        Cierra una etapa. Sin duración, la etapa abarca desde la marca
+        anterior; las etapas en segundo plano indican la suya.
+        """
+        ahora = time.perf_counter()
+        with self.cerrojo:
+            cargados = paquetes_cargados()
+            if duracion is None:
+                duracion = (ahora - self.ultima_marca) * 1000
+                self.ultima_marca = ahora
+            self.etapas.append((etapa, (ahora - self.inicio) * 1000, duracion, sorted(cargados - self.cargados)))
+            self.cargados |= cargados
+
+    def informe(self):
+        """Texto con el desglose del arranque"""
+        lineas = ["Arranque (ms desde el inicio de main.py):"]
+        for etapa, instante, duracion, paquetes in self.etapas:
+            carga = f"  carga {', '.join(paquetes)}" if paquetes else ""
+            lineas.append(f"  {etapa:<38} {instante:>8.1f} ({duracion:>7.1f}){carga}")
+        return "\n".join(lineas)
+
+def precargar_en_segundo_plano(modulos, medidor=None):
+    """
+    Importa los módulos en un hilo daemon y devuelve el hilo. Si otro hilo
+    pide uno de ellos mientras tanto, el bloqueo de importación de Python hace
+    que espere a esta misma carga en lugar de repetirla.
+    """
+    def precargar():
+        inicio = time.perf_counter()
+        for modulo in modulos:
+            importlib.import_module(modulo)
+        if medidor is not None:
+            medidor.marcar("precarga en segundo plano", (time.perf_counter() - inicio) * 1000)
+
+    hilo = threading.Thread(target=precargar, name="precarga_modulos", daemon=True)
+    hilo.start()
+    return hilo
@@ -0,0 +1,261 @@
+"""
+Barrido paralelo de escenarios sobre la envolvente de control de config.py
+
+Construye una malla de altura × distancia × delay, resuelve cada escenario en
+un ProcessPoolExecutor y escribe los resultados en CSV a medida que terminan.
+Si el archivo de salida ya existe, los escenarios registrados se omiten, de
+modo que un barrido interrumpido se puede reanudar con los mismos argumentos.
+La malla y los argumentos se guardan junto al CSV (<salida>.json) y el
+barrido se niega a reanudar si no coinciden.
+
+Uso:
+    python sweep.py --alturas 16 --distancias 60 --delays 11 --modo simulacion
+    python sweep.py --fisica arrastre
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+import numpy as np
+from config import (MIN_ALTURA, MAX_ALTURA, MIN_DISTANCIA, MAX_DISTANCIA,
+                    MIN_DELAY, MAX_DELAY, MIN_VELOCIDAD, MAX_VELOCIDAD, UMBRAL_INTERCEPCION)
+from optimizer import encontrar_parametros_optimos
+from simulation_engine import MotorSimulacion
+
+COLUMNAS_SWEEP = [
+    "indice", "altura", "distancia", "delay", "exito", "angulo", "velocidad",
+    "tiempo_intercepcion", "distancia_minima", "nfev", "njev", "resultado_simulacion", "tiempo_final"
+]
+
+def resolver_ruta(ruta):
+    """Las rutas relativas se interpretan respecto al directorio del simulador"""
+    if os.path.isabs(ruta):
+        return ruta
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), ruta)
+
+def construir_malla(n_alturas, n_distancias, n_delays):
+    """
+    Genera la lista de escenarios (indice, altura, distancia, delay) sobre los
+    rangos de config.py. El índice es estable para unos mismos tamaños de malla.
+    """
+    alturas = np.linspace(MIN_ALTURA, MAX_ALTURA, n_alturas)
+    distancias = np.linspace(MIN_DISTANCIA, MAX_DISTANCIA, n_distancias)
+    delays = np.linspace(MIN_DELAY, MAX_DELAY, n_delays)
+
+    return [
+        (indice, float(altura), float(distancia), float(delay))
+        for indice, (altura, distancia, delay) in enumerate(itertools.product(alturas, distancias, delays))
+    ]
+
+def evaluar_escenario(altura, distancia, delay, modo="optimizador", metodo="analitico", fisica="vacio",
+                      memoria=None, ejecutor=None):
+    """
+    Resuelve un escenario y devuelve su fila de resultados (sin el índice).
+    En modo 'simulacion' además simula el disparo con los parámetros encontrados
+    usando la misma física que el optimizador.
+    """
+    resultado = encontrar_parametros_optimos(
+        altura, distancia, MIN_VELOCIDAD, MAX_VELOCIDAD, delay, metodo=metodo, fisica=fisica,
+        memoria=memoria, ejecutor=ejecutor
+    )
+    exito = bool(resultado.success and resultado.fun < UMBRAL_INTERCEPCION)
+    angulo, velocidad, tiempo = resultado.x
+
+    fila = {
+        "altura": altura,
+        "distancia": distancia,
+        "delay": delay,
+        "exito": int(exito),
+        "angulo": float(angulo),
+        "velocidad": float(velocidad),
+        "tiempo_intercepcion": float(tiempo),
+        "distancia_minima": float(resultado.fun),
+        "nfev": resultado.get("nfev", 0),
+        "njev": resultado.get("njev", 0),
+        "resultado_simulacion": "",
+        "tiempo_final": ""
+    }
+
+    if modo == "simulacion":
+        if fisica == "arrastre":
+            # drag depende de scipy.integrate; solo se carga si se pide esta física
+            from drag import simular_arrastre
+            simulacion = simular_arrastre(altura, distancia, angulo, velocidad, delay)
+        else:
+            simulacion = MotorSimulacion(altura, distancia, velocidad, angulo, delay).ejecutar()
+        fila["resultado_simulacion"] = simulacion.resultado
+        fila["tiempo_final"] = simulacion.tiempo_final
+
+    return fila
+
+def evaluar_bloque(escenarios, modo, metodo, fisica="vacio", procesos_arranques=1):
+    """
+    Evalúa un bloque de escenarios en un proceso trabajador
+
+    Con el multiarranque cada escenario arranca también desde la solución del
+    más cercano ya resuelto en el bloque (sus vecinos en la malla) y, con
+    procesos_arranques > 1, los arranques se reparten en un pool propio.
+    """
+    memoria = ejecutor = None
+    if metodo == "multiarranque":
+        from multistart import MemoriaSoluciones
+        memoria = MemoriaSoluciones()
+        if procesos_arranques > 1:
+            ejecutor = ProcessPoolExecutor(max_workers=procesos_arranques)
+
+    filas = []
+    try:
+        for indice, altura, distancia, delay in escenarios:
+            fila = evaluar_escenario(altura, distancia, delay, modo, metodo, fisica, memoria, ejecutor)
+            fila["indice"] = indice
+            filas.append(fila)
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown()
+    return filas
+
+def clave_escenario(altura, distancia, delay):
+    """Clave de un escenario, comparable entre lo escrito en el CSV y la malla"""
+    return tuple(round(float(valor), 9) for valor in (altura, distancia, delay))
+
+def ruta_descripcion(ruta):
+    """Archivo con la malla y los argumentos de un CSV de barrido"""
+    return ruta + ".json"
+
+def describir_barrido(escenarios, modo, metodo, fisica):
+    """
+    Malla (valores de cada eje) y argumentos que determinan el contenido del
+    CSV: un barrido solo se reanuda con la misma descripción
+    """
+    ejes = zip(*(escenario[1:] for escenario in escenarios))
+    return {
+        "columnas": COLUMNAS_SWEEP,
+        "malla": [sorted({round(valor, 9) for valor in eje}) for eje in ejes],
+        "modo": modo,
+        "metodo": metodo,
+        "fisica": fisica
+    }
+
+def leer_escenarios_completados(ruta):
+    """
+    Escenarios (altura, distancia, delay) ya registrados en un CSV de salida
+    previo (para reanudar)
+    """
+    if not os.path.exists(ruta):
+        return set()
+
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return {
+            clave_escenario(fila["altura"], fila["distancia"], fila["delay"])
+            for fila in csv.DictReader(archivo) if fila.get("altura")
+        }
+
+def comprobar_reanudacion(ruta, descripcion):
+    """
+    Comprueba que un CSV existente se generó con la misma descripción.
+    Devuelve True si hay que empezar un archivo nuevo (no existe o está vacío).
+    """
+    if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+        return True
+
+    ruta_json = ruta_descripcion(ruta)
+    if not os.path.exists(ruta_json):
+        raise ValueError(f"{ruta} no tiene descripción ({ruta_json}); no se puede comprobar que "
+                         f"corresponda a este barrido. Usa otro archivo de salida")
+    with open(ruta_json, encoding="utf-8") as archivo:
+        anterior = json.load(archivo)
+    diferencias = [campo for campo in descripcion if anterior.get(campo) != descripcion[campo]]
+    if diferencias:
+        raise ValueError(f"{ruta} se generó con otra malla o argumentos ({', '.join(diferencias)}); "
+                         f"usa otro archivo de salida")
+    return False
+
+def ejecutar_barrido(escenarios, ruta_salida, modo="optimizador", metodo="analitico",
+                     procesos=None, tamano_bloque=256, fisica="vacio"):
+    """
+    Ejecuta el barrido en paralelo y escribe cada bloque en cuanto termina.
+
+    Solo se mantienen en vuelo unos pocos bloques por proceso, así que la
+    memoria no crece con el tamaño de la malla. Con el multiarranque, si hay
+    menos bloques que procesos, los que sobran resuelven los arranques de
+    cada bloque en paralelo. Devuelve el número de
+    escenarios evaluados en esta ejecución. Lanza ValueError si el CSV existe
+    pero se generó con otra malla o argumentos.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    descripcion = describir_barrido(escenarios, modo, metodo, fisica)
+    nuevo_archivo = comprobar_reanudacion(ruta_salida, descripcion)
+    if nuevo_archivo:
+        with open(ruta_descripcion(ruta_salida), "w", encoding="utf-8") as archivo:
+            json.dump(descripcion, archivo, indent=2)
+
+    completados = set() if nuevo_archivo else leer_escenarios_completados(ruta_salida)
+    pendientes = [escenario for escenario in escenarios if clave_escenario(*escenario[1:]) not in completados]
+    completados = len(escenarios) - len(pendientes)
+    n_bloques = -(-len(pendientes) // tamano_bloque)
+    bloques = (pendientes[i:i + tamano_bloque] for i in range(0, len(pendientes), tamano_bloque))
+    procesos_arranques = max(1, procesos // n_bloques) if metodo == "multiarranque" and n_bloques else 1
+
+    evaluados = 0
+    inicio = time.perf_counter()
+
+    with open(ruta_salida, "w" if nuevo_archivo else "a", newline="", encoding="utf-8") as archivo, \
+            ProcessPoolExecutor(max_workers=max(1, min(procesos, n_bloques))) as ejecutor:
+        escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS_SWEEP)
+        if nuevo_archivo:
+            escritor.writeheader()
+
+        def registrar(futuros):
+            nonlocal evaluados
+            for futuro in futuros:
+                filas = futuro.result()
+                escritor.writerows(filas)
+                evaluados += len(filas)
+            archivo.flush()
+            print(f"{completados + evaluados}/{len(escenarios)} escenarios "
+                  f"({time.perf_counter() - inicio:.1f} s)")
+
+        # Esperar a que termine algún bloque antes de enviar más trabajo
+        en_vuelo = set()
+        for bloque in bloques:
+            if len(en_vuelo) >= 2 * procesos:
+                terminados, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                registrar(terminados)
+            en_vuelo.add(ejecutor.submit(evaluar_bloque, bloque, modo, metodo, fisica, procesos_arranques))
+
+        for futuro in as_completed(en_vuelo):
+            registrar([futuro])
+
+    return evaluados
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido paralelo de escenarios de interceptación")
+    parser.add_argument("--salida", default="sweep_resultados.csv", help="Archivo CSV de resultados")
+    parser.add_argument("--alturas", type=int, default=16, help="Puntos de la malla de altura")
+    parser.add_argument("--distancias", type=int, default=60, help="Puntos de la malla de distancia")
+    parser.add_argument("--delays", type=int, default=11, help="Puntos de la malla de delay")
+    parser.add_argument("--modo", choices=["optimizador", "simulacion"], default="optimizador")
+    parser.add_argument("--metodo", choices=["analitico", "slsqp", "multiarranque"], default="analitico")
+    parser.add_argument("--fisica", choices=["vacio", "arrastre"], default="vacio")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos trabajadores (todos los núcleos por defecto)")
+    parser.add_argument("--tamano-bloque", type=int, default=256, help="Escenarios por tarea enviada")
+    args = parser.parse_args()
+
+    escenarios = construir_malla(args.alturas, args.distancias, args.delays)
+    ruta_salida = resolver_ruta(args.salida)
+    try:
+        evaluados = ejecutar_barrido(
+            escenarios, ruta_salida, args.modo, args.metodo, args.procesos, args.tamano_bloque, args.fisica
+        )
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Barrido completado: {evaluados} escenarios nuevos en {ruta_salida}")
+
+if __name__ == "__main__":
+    main()
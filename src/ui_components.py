@@ -4,9 +4,28 @@ Componentes de la interfaz de usuario para la simulación de misiles
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from config import (COLUMNAS_HISTORIAL, MAX_HISTORIAL_SIMULACIONES)
+from config import (INTERVALO_ANIMACION, VISTA_PREVIA_ACTIVA, OBJETIVO_PLANIFICACION, FACTORES_REPRODUCCION,
+                    FACTOR_REPRODUCCION, METODO_OPTIMIZACION)
+from history_view import VistaHistorial
+from instrumentation import (METRICA_ANIMAR, METRICA_DIBUJO, METRICA_INTERVALO, METRICA_OPTIMIZADOR,
+                             METRICA_NFEV, METRICA_CACHE, METRICA_PASOS)
+
+TEXTO_BOTON_CALCULAR = "Calcular Interceptación Óptima"
+TEXTO_BOTON_PROBABILIDAD = "Probabilidad de Interceptación"
+
+# Objetivos de la planificación (scheduling.py) tal como se muestran en el selector
+TEXTOS_OBJETIVOS = {
+    "min_tiempo": "Intercepción más temprana",
+    "max_altura": "Intercepción más alta",
+    "max_delay": "Lanzamiento más tardío"
+}
+
+# Métodos de encontrar_parametros_optimos tal como se muestran en el selector
+TEXTOS_METODOS = {
+    "analitico": "Analítico",
+    "slsqp": "SLSQP",
+    "multiarranque": "Multiarranque"
+}
 
 def validar_entrada_numerica(P):
     """
@@ -20,6 +39,10 @@ def validar_entrada_numerica(P):
     except ValueError:
         return False
 
+def formatear_factor(factor):
+    """Texto de un factor de velocidad de reproducción"""
+    return "Instantánea" if factor == float("inf") else f"{factor:g}×"
+
 def crear_panel_control(parent, simulacion):
     """
     Crea el panel de control con los ajustes de la simulación
@@ -38,6 +61,7 @@ def crear_panel_control(parent, simulacion):
     entrada_altura.grid(row=0, column=1, padx=5, pady=5)
     entrada_altura.bind('<Return>', lambda e: simulacion.actualizar_altura(entrada_altura.get()))
     entrada_altura.bind('<FocusOut>', lambda e: simulacion.actualizar_altura(entrada_altura.get()))
+    entrada_altura.bind('<KeyRelease>', lambda e: simulacion.programar_vista_previa())
     
     # Controles para la distancia de defensa
     ttk.Label(panel_controles, text="Distancia horizontal (km):").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
@@ -46,6 +70,7 @@ def crear_panel_control(parent, simulacion):
     entrada_distancia.grid(row=1, column=1, padx=5, pady=5)
     entrada_distancia.bind('<Return>', lambda e: simulacion.actualizar_distancia(entrada_distancia.get()))
     entrada_distancia.bind('<FocusOut>', lambda e: simulacion.actualizar_distancia(entrada_distancia.get()))
+    entrada_distancia.bind('<KeyRelease>', lambda e: simulacion.programar_vista_previa())
     
     # Controles para la velocidad del misil
     ttk.Label(panel_controles, text="Velocidad del misil (km/s):").grid(row=0, column=3, padx=5, pady=5, sticky=tk.W)
@@ -54,6 +79,7 @@ def crear_panel_control(parent, simulacion):
     entrada_velocidad.grid(row=0, column=4, padx=5, pady=5)
     entrada_velocidad.bind('<Return>', lambda e: simulacion.actualizar_velocidad(entrada_velocidad.get()))
     entrada_velocidad.bind('<FocusOut>', lambda e: simulacion.actualizar_velocidad(entrada_velocidad.get()))
+    entrada_velocidad.bind('<KeyRelease>', lambda e: simulacion.programar_vista_previa())
     
     # Controles para el ángulo del misil
     ttk.Label(panel_controles, text="Ángulo de lanzamiento (°):").grid(row=1, column=3, padx=5, pady=5, sticky=tk.W)
@@ -62,6 +88,7 @@ def crear_panel_control(parent, simulacion):
     entrada_angulo.grid(row=1, column=4, padx=5, pady=5)
     entrada_angulo.bind('<Return>', lambda e: simulacion.actualizar_angulo(entrada_angulo.get()))
     entrada_angulo.bind('<FocusOut>', lambda e: simulacion.actualizar_angulo(entrada_angulo.get()))
+    entrada_angulo.bind('<KeyRelease>', lambda e: simulacion.programar_vista_previa())
     
     # Controles para el delay de lanzamiento
     ttk.Label(panel_controles, text="Delay de lanzamiento (s):").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
@@ -70,6 +97,16 @@ def crear_panel_control(parent, simulacion):
     entrada_delay.grid(row=2, column=1, padx=5, pady=5)
     entrada_delay.bind('<Return>', lambda e: simulacion.actualizar_delay(entrada_delay.get()))
     entrada_delay.bind('<FocusOut>', lambda e: simulacion.actualizar_delay(entrada_delay.get()))
+    entrada_delay.bind('<KeyRelease>', lambda e: simulacion.programar_vista_previa())
+    
+    # Velocidad de reproducción (segundos simulados por segundo real)
+    ttk.Label(panel_controles, text="Velocidad de reproducción:").grid(row=2, column=3, padx=5, pady=5, sticky=tk.W)
+    selector_reproduccion = ttk.Combobox(panel_controles, values=[formatear_factor(f) for f in FACTORES_REPRODUCCION],
+                                         state="readonly", width=10)
+    selector_reproduccion.current(FACTORES_REPRODUCCION.index(FACTOR_REPRODUCCION))
+    selector_reproduccion.grid(row=2, column=4, padx=5, pady=5)
+    selector_reproduccion.bind('<<ComboboxSelected>>', lambda e: simulacion.cambiar_velocidad_reproduccion(
+        FACTORES_REPRODUCCION[selector_reproduccion.current()]))
     
     # Guardar referencias a las entradas
     simulacion.entrada_angulo = entrada_angulo
@@ -82,9 +119,16 @@ def crear_panel_control(parent, simulacion):
     panel_botones = ttk.Frame(panel_controles)
     panel_botones.grid(row=3, column=0, columnspan=6, pady=10)
     
-    boton_calcular = ttk.Button(panel_botones, text="Calcular Interceptación Óptima", 
+    boton_calcular = ttk.Button(panel_botones, text=TEXTO_BOTON_CALCULAR, 
                                 command=simulacion.calcular_parametros_optimos)
     boton_calcular.pack(side=tk.LEFT, padx=5)
+    variable_metodo = tk.StringVar(value=TEXTOS_METODOS[METODO_OPTIMIZACION])
+    ttk.Combobox(panel_botones, textvariable=variable_metodo, values=list(TEXTOS_METODOS.values()),
+                 state="readonly", width=14).pack(side=tk.LEFT, padx=(0, 5))
+    
+    boton_probabilidad = ttk.Button(panel_botones, text=TEXTO_BOTON_PROBABILIDAD, 
+                                    command=simulacion.calcular_probabilidad_intercepcion)
+    boton_probabilidad.pack(side=tk.LEFT, padx=5)
     
     boton_iniciar = ttk.Button(panel_botones, text="Iniciar Simulación", 
                             command=simulacion.iniciar_simulacion)
@@ -99,8 +143,22 @@ def crear_panel_control(parent, simulacion):
                             command=simulacion.reiniciar_simulacion)
     boton_reiniciar.pack(side=tk.LEFT, padx=5)
     
+    boton_salva = ttk.Button(panel_botones, text="Modo Salva", 
+                             command=simulacion.abrir_modo_salva)
+    boton_salva.pack(side=tk.LEFT, padx=5)
+    
+    boton_viabilidad = ttk.Button(panel_botones, text="Mapa de Viabilidad", 
+                                  command=simulacion.abrir_mapa_viabilidad)
+    boton_viabilidad.pack(side=tk.LEFT, padx=5)
+    
+    boton_reproduccion = ttk.Button(panel_botones, text="Grabaciones", 
+                                    command=simulacion.abrir_reproduccion)
+    boton_reproduccion.pack(side=tk.LEFT, padx=5)
+    
     # Guardar referencias a los botones
     simulacion.boton_calcular = boton_calcular
+    simulacion.variable_metodo = variable_metodo
+    simulacion.boton_probabilidad = boton_probabilidad
     simulacion.boton_iniciar = boton_iniciar
     simulacion.boton_detener = boton_detener
     simulacion.boton_reiniciar = boton_reiniciar
@@ -117,14 +175,88 @@ def crear_info_panel(parent, simulacion):
     etiqueta_info = ttk.Label(panel_info, text="Presiona 'Iniciar Simulación' para comenzar")
     etiqueta_info.pack(pady=5)
     
+    # Vista previa de las trayectorias mientras se editan los parámetros
+    variable_vista_previa = tk.BooleanVar(value=VISTA_PREVIA_ACTIVA)
+    ttk.Checkbutton(panel_info, text="Vista previa", variable=variable_vista_previa,
+                    command=simulacion.alternar_vista_previa).pack(anchor=tk.E, padx=5)
+    
+    # Overlay opcional de métricas de rendimiento
+    variable_metricas = tk.BooleanVar(value=simulacion.instrumentacion.activa)
+    ttk.Checkbutton(panel_info, text="Métricas de rendimiento", variable=variable_metricas,
+                    command=simulacion.alternar_metricas).pack(anchor=tk.E, padx=5)
+    etiqueta_metricas = ttk.Label(panel_info, text="", font="TkFixedFont", justify=tk.LEFT)
+    
+    # Planificación del lanzamiento, recalculada con cada cambio de parámetros
+    panel_planificacion = ttk.Frame(panel_info)
+    panel_planificacion.pack(fill=tk.X, padx=5, pady=(0, 5))
+    ttk.Label(panel_planificacion, text="Planificar:").pack(side=tk.LEFT)
+    variable_objetivo = tk.StringVar(value=TEXTOS_OBJETIVOS[OBJETIVO_PLANIFICACION])
+    selector_objetivo = ttk.Combobox(panel_planificacion, textvariable=variable_objetivo,
+                                     values=list(TEXTOS_OBJETIVOS.values()), state="readonly", width=24)
+    selector_objetivo.pack(side=tk.LEFT, padx=5)
+    selector_objetivo.bind('<<ComboboxSelected>>', lambda e: simulacion.actualizar_planificacion())
+    ttk.Button(panel_planificacion, text="Aplicar plan",
+               command=simulacion.aplicar_planificacion).pack(side=tk.LEFT, padx=5)
+    etiqueta_planificacion = ttk.Label(panel_planificacion, text="")
+    etiqueta_planificacion.pack(side=tk.LEFT, padx=5)
+    
     simulacion.etiqueta_info = etiqueta_info  # Guardar referencia
+    simulacion.variable_metricas = variable_metricas
+    simulacion.variable_vista_previa = variable_vista_previa
+    simulacion.etiqueta_metricas = etiqueta_metricas
+    simulacion.variable_objetivo = variable_objetivo
+    simulacion.etiqueta_planificacion = etiqueta_planificacion
     
     return panel_info
 
+def metodo_seleccionado(variable_metodo):
+    """Método de optimización correspondiente al texto del selector"""
+    return next(metodo for metodo, texto in TEXTOS_METODOS.items() if texto == variable_metodo.get())
+
+def objetivo_seleccionado(variable_objetivo):
+    """Objetivo de planificación correspondiente al texto del selector"""
+    return next(objetivo for objetivo, texto in TEXTOS_OBJETIVOS.items() if texto == variable_objetivo.get())
+
+def formatear_planificacion(plan):
+    """Resumen de una línea del plan de lanzamiento"""
+    if not plan.success:
+        return "Ningún delay permite interceptar"
+    angulo, velocidad, tiempo = plan.x
+    return (f"delay {plan.delay:.2f} s, {angulo:.1f}° a {velocidad:.1f} km/s: "
+            f"intercepción a los {tiempo:.1f} s y {plan.altura_intercepcion:.2f} km")
+
+def formatear_metricas(instrumentacion):
+    """
+    Texto del overlay de métricas: última muestra / media / p95 de cada serie
+    """
+    def serie(nombre, unidad="ms", formato=".2f"):
+        resumen = instrumentacion.resumen(nombre)
+        if resumen is None:
+            return "-"
+        ultima, media, p95 = resumen
+        return f"{ultima:{formato}} / {media:{formato}} / {p95:{formato}} {unidad}"
+    
+    cache = instrumentacion.resumen(METRICA_CACHE)
+    return "\n".join([
+        "última / media / p95",
+        f"animar:      {serie(METRICA_ANIMAR)}",
+        f"dibujo:      {serie(METRICA_DIBUJO)}",
+        f"intervalo:   {serie(METRICA_INTERVALO, formato='.1f')} (objetivo {INTERVALO_ANIMACION} ms)",
+        f"pasos/frame: {serie(METRICA_PASOS, 'pasos', '.1f')}",
+        f"optimizador: {serie(METRICA_OPTIMIZADOR)}, {serie(METRICA_NFEV, 'nfev', '.0f')}",
+        f"caché:       {'-' if cache is None else f'{cache[0]:.0%} de aciertos'}"
+    ])
+
 def crear_plot(parent, simulacion):
     """
     Crea el gráfico de simulación
+
+    matplotlib se importa aquí para que la ventana y los controles se puedan
+    mostrar antes de cargarlo.
     """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    
     # Crear figura y subplots
     figura = Figure(figsize=(10, 6))
     ejes = figura.add_subplot(111)
@@ -147,6 +279,11 @@ def crear_plot(parent, simulacion):
     defensa_posicion, = ejes.plot([], [], 'gs', markersize=10, label='Posición Defensa')
     ciudad_posicion, = ejes.plot([], [], 'r^', markersize=10, label='Ciudad')
     
+    # Vista previa: trayectorias previstas y punto de máximo acercamiento
+    prevision_enemigo, = ejes.plot([], [], 'r--', lw=1, alpha=0.5)
+    prevision_misil, = ejes.plot([], [], 'b--', lw=1, alpha=0.5)
+    prevision_acercamiento, = ejes.plot([], [], 'k*', markersize=12, label='Máximo acercamiento previsto')
+    
     # Añadir leyenda en la parte superior izquierda
     ejes.legend(loc='upper left')
     
@@ -166,6 +303,9 @@ def crear_plot(parent, simulacion):
     simulacion.inicio_enemigo = inicio_enemigo
     simulacion.defensa_posicion = defensa_posicion
     simulacion.ciudad_posicion = ciudad_posicion
+    simulacion.prevision_enemigo = prevision_enemigo
+    simulacion.prevision_misil = prevision_misil
+    simulacion.prevision_acercamiento = prevision_acercamiento
     
     # Actualizar límites iniciales
     ejes.set_xlim(-5, simulacion.distancia_defensa + 5)
@@ -176,52 +316,9 @@ def crear_plot(parent, simulacion):
 
 def crear_historial_panel(parent, simulacion):
     """
-    Crea el panel de historial de lanzamientos
-    """
-    # Frame contenedor para el historial
-    frame_historial = ttk.LabelFrame(parent, text="Historial de Lanzamientos")
-    frame_historial.pack(side=tk.RIGHT, fill=tk.BOTH, padx=10, pady=5)
-
-    # Crear Treeview
-    columnas = ("Altura", "Distancia", "Velocidad", "Ángulo", "Delay", "Resultado")
-    tabla = ttk.Treeview(frame_historial, columns=columnas, show='headings', height=15)
-
-    # Configurar columnas
-    anchos = {
-        "Altura": 70,
-        "Distancia": 70,
-        "Velocidad": 70,
-        "Ángulo": 70,
-        "Delay": 70,
-        "Resultado": 120
-    }
-
-    for col in columnas:
-        tabla.heading(col, text=col)
-        tabla.column(col, width=anchos[col])
-
-    # Scrollbars
-    scrolly = ttk.Scrollbar(frame_historial, orient=tk.VERTICAL, command=tabla.yview)
-    scrollx = ttk.Scrollbar(frame_historial, orient=tk.HORIZONTAL, command=tabla.xview)
-    tabla.configure(yscrollcommand=scrolly.set, xscrollcommand=scrollx.set)
-
-    # Layout
-    tabla.grid(row=0, column=0, sticky='nsew')
-    scrolly.grid(row=0, column=1, sticky='ns')
-    scrollx.grid(row=1, column=0, sticky='ew')
-
-    # Botón para limpiar historial
-    btn_limpiar = ttk.Button(
-        frame_historial,
-        text="Limpiar Historial",
-        command=lambda: tabla.delete(*tabla.get_children())
-    )
-    btn_limpiar.grid(row=2, column=0, pady=5)
-
-    frame_historial.grid_columnconfigure(0, weight=1)
-    frame_historial.grid_rowconfigure(0, weight=1)
-
-    return tabla
+    Crea el panel de historial de lanzamientos sobre el historial en SQLite
+    """
+    return VistaHistorial(parent, simulacion.historial)
 
 def mostrar_valores_optimos(resultado, tiempo, altura):
     """
@@ -236,4 +333,22 @@ def mostrar_valores_optimos(resultado, tiempo, altura):
         f"Tiempo estimado de interceptación: {tiempo_optimo:.1f} s\n"
         f"Altura de interceptación: {altura:.1f} km\n")
     
-    messagebox.showinfo("Resultados de la Optimización", mensaje)
\ No newline at end of file
+    # Evaluaciones de la búsqueda numérica (las soluciones analíticas no evalúan)
+    if resultado.get('nfev'):
+        mensaje += f"Evaluaciones: {resultado.nfev} objetivo, {resultado.get('njev', 0)} jacobiano\n"
+    
+    messagebox.showinfo("Resultados de la Optimización", mensaje)
+
+def mostrar_probabilidad_intercepcion(resultado):
+    """
+    Muestra el resultado del análisis de Monte Carlo en un cuadro de diálogo
+    """
+    inferior, superior = resultado.intervalo
+    
+    mensaje = (
+        f"Probabilidad de interceptación: {resultado.probabilidad:.1%}\n"
+        f"Intervalo al {resultado.confianza:.0%}: [{inferior:.1%}, {superior:.1%}]\n\n"
+        f"Intercepciones: {resultado.intercepciones} de {resultado.muestras} disparos\n"
+        f"Distancia mínima media: {resultado.distancia_media:.3f} km\n")
+    
+    messagebox.showinfo("Análisis de Monte Carlo", mensaje)
\ No newline at end of file
@@ -0,0 +1,36 @@
+import pytest
+from config import MIN_VELOCIDAD, MAX_VELOCIDAD, MIN_ANGULO, MAX_ANGULO, UMBRAL_INTERCEPCION
+from optimizer import encontrar_parametros_optimos
+from simulation_engine import MotorSimulacion, RESULTADO_INTERCEPCION
+
+ESCENARIOS = [
+    (5.0, 5.0, 0.0),
+    (7.0, 1.0, 0.5),
+    (10.0, 50.0, 2.0),
+    (12.3, 30.0, 9.5),
+    (20.0, 100.0, 0.0),
+    (20.0, 140.0, 1.0),
+]
+
+@pytest.mark.parametrize("altura, distancia, delay", ESCENARIOS)
+def test_solucion_analitica_intercepta_en_simulacion(altura, distancia, delay):
+    resultado = encontrar_parametros_optimos(altura, distancia, MIN_VELOCIDAD, MAX_VELOCIDAD, delay,
+                                             metodo='analitico')
+    assert resultado.success and resultado.fun < 1e-6
+    angulo, velocidad, tiempo = resultado.x
+    assert MIN_ANGULO <= angulo <= MAX_ANGULO
+    assert MIN_VELOCIDAD <= velocidad <= MAX_VELOCIDAD
+
+    simulacion = MotorSimulacion(altura, distancia, velocidad, angulo, delay).ejecutar()
+    assert simulacion.resultado == RESULTADO_INTERCEPCION
+    assert simulacion.tiempo_intercepcion == pytest.approx(tiempo, abs=1e-3)
+
+def test_largo_alcance_bajo_el_angulo_minimo():
+    # A velocidad máxima haría falta disparar a ~3.65°, por debajo de MIN_ANGULO
+    resultado = encontrar_parametros_optimos(5.182, 72.71, MIN_VELOCIDAD, MAX_VELOCIDAD, 1.827,
+                                             metodo='analitico')
+    angulo, velocidad, _ = resultado.x
+    assert MIN_ANGULO <= angulo <= MAX_ANGULO
+    assert resultado.fun >= UMBRAL_INTERCEPCION
+    simulacion = MotorSimulacion(5.182, 72.71, velocidad, angulo, 1.827).ejecutar()
+    assert simulacion.resultado != RESULTADO_INTERCEPCION
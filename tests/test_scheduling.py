@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+from config import MIN_ANGULO
+from scheduling import planificar_lanzamiento, calcular_tiempo_fin
+
+def test_tiempo_fin_delay_cero_escalar():
+    assert np.isfinite(calcular_tiempo_fin(10.0, 5.0, 0.0))
+    assert calcular_tiempo_fin(10.0, 5.0, 0.0) == calcular_tiempo_fin(10.0, 5.0, np.array([0.0]))[0]
+
+@pytest.mark.parametrize("altura, distancia", [(5.0, 57.0), (10.44, 114.238)])
+def test_max_delay_con_solo_el_primer_delay_factible(altura, distancia):
+    resultado = planificar_lanzamiento(altura, distancia, 0.6, 2.5, "max_delay")
+    assert resultado.success
+    assert 0.0 <= resultado.delay < 1.0
+    assert resultado.fun < 1e-6
+    assert resultado.x[0] >= MIN_ANGULO
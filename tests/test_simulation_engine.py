@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from simulation_engine import MotorSimulacion
+
+# (altura, distancia, velocidad, ángulo, delay): intercepción, fallo e intercepción a baja altura
+DISPAROS = [
+    (5.0, 5.0, 2.5, 45.0, 0.0),
+    (10.0, 50.0, 1.0, 30.0, 2.0),
+    (0.5, 2.0, 0.217, 14.036, 0.0),
+]
+
+@pytest.mark.parametrize("deteccion_continua", [True, False])
+@pytest.mark.parametrize("disparo", DISPAROS)
+def test_paso_y_ejecutar_coinciden(disparo, deteccion_continua):
+    motor = MotorSimulacion(*disparo, deteccion_continua=deteccion_continua)
+    while motor.paso():
+        pass
+    por_pasos = motor.obtener_resultado()
+    vectorizado = MotorSimulacion(*disparo, deteccion_continua=deteccion_continua).ejecutar()
+
+    assert por_pasos.resultado == vectorizado.resultado
+    assert por_pasos.tiempo_final == pytest.approx(vectorizado.tiempo_final, abs=1e-9)
+    for campo in ("tiempos", "enemigo_x", "enemigo_y", "misil_x", "misil_y"):
+        np.testing.assert_allclose(getattr(por_pasos, campo), getattr(vectorizado, campo), atol=1e-9)